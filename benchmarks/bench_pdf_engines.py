@@ -0,0 +1,125 @@
+"""Compare the pdfplumber and PyMuPDF PDF engines: speed and output parity.
+
+For every PDF in a directory (or a generated corpus of text and ruled-table
+pages when no directory is given) both engines convert the file, and the
+report lists pages/s per engine, the number of tables each found, and a
+word-level similarity ratio between the two Markdown outputs.
+
+Usage::
+
+    python -m benchmarks.bench_pdf_engines                 # generated corpus
+    python -m benchmarks.bench_pdf_engines ~/papers --limit 50
+"""
+
+import argparse
+import difflib
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+from src.parsers.pdf_parser import PDFParser
+
+_WORDS = re.compile(r"[^\s|]+")
+
+
+def build_corpus(directory: Path, n_docs: int = 6, pages: int = 20) -> list[Path]:
+    """Write PDFs mixing prose pages with pages holding a ruled table."""
+    prose = (
+        "Throughput of document conversion depends on the layout engine. "
+        "Each page is parsed, its text extracted and cleaned of ligatures. "
+    ) * 12
+    paths = []
+    for d in range(n_docs):
+        doc = fitz.open()
+        for p in range(pages):
+            page = doc.new_page()
+            page.insert_textbox(fitz.Rect(50, 50, 545, 400), f"Section {d}.{p}. {prose}", fontsize=10)
+            if p % 3 == 0:
+                _draw_table(page, top=420, rows=8, cols=4, label=f"{d}-{p}")
+        path = directory / f"doc{d:02d}.pdf"
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+
+def _draw_table(page, top: float, rows: int, cols: int, label: str) -> None:
+    left, width, height = 50, 120, 18
+    for r in range(rows + 1):
+        y = top + r * height
+        page.draw_line((left, y), (left + cols * width, y))
+    for c in range(cols + 1):
+        x = left + c * width
+        page.draw_line((x, top), (x, top + rows * height))
+    for r in range(rows):
+        for c in range(cols):
+            text = f"h{c}" if r == 0 else f"{label} r{r}c{c}"
+            page.insert_text((left + c * width + 4, top + r * height + 13), text, fontsize=9)
+
+
+def _count_tables(markdown: str) -> int:
+    return sum(1 for line in markdown.splitlines() if line.startswith("| ---"))
+
+
+def similarity(a: str, b: str) -> float:
+    wa, wb = _WORDS.findall(a), _WORDS.findall(b)
+    return difflib.SequenceMatcher(None, wa, wb, autojunk=False).ratio()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("corpus", nargs="?", help="Directory of PDFs (default: generated)")
+    ap.add_argument("--limit", type=int, default=0, help="Only the first N PDFs")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            paths = sorted(Path(args.corpus).expanduser().rglob("*.pdf"))
+        else:
+            paths = build_corpus(Path(tmp))
+        if args.limit:
+            paths = paths[: args.limit]
+
+        engines = {name: PDFParser(engine=name) for name in PDFParser.ENGINES}
+        totals = {name: 0.0 for name in engines}
+        n_pages = 0
+        ratios = []
+        print(f"{'file':30s} {'pages':>5s} {'plumber p/s':>11s} {'mupdf p/s':>9s} {'tables':>7s} {'parity':>6s}")
+        for path in paths:
+            with fitz.open(path) as doc:
+                pages = doc.page_count
+            outputs, times = {}, {}
+            for name, parser in engines.items():
+                start = time.perf_counter()
+                try:
+                    outputs[name] = parser.parse(path)
+                except Exception as exc:  # noqa: BLE001 - report and move on
+                    print(f"{path.name:30s} {name} failed: {exc}")
+                    break
+                times[name] = time.perf_counter() - start
+            else:
+                n_pages += pages
+                for name in engines:
+                    totals[name] += times[name]
+                ratio = similarity(outputs["pdfplumber"], outputs["pymupdf"])
+                ratios.append(ratio)
+                tables = "/".join(str(_count_tables(outputs[n])) for n in engines)
+                print(
+                    f"{path.name[:30]:30s} {pages:5d} {pages / times['pdfplumber']:11.1f} "
+                    f"{pages / times['pymupdf']:9.1f} {tables:>7s} {ratio:6.3f}"
+                )
+
+        if not ratios:
+            return
+        plumber, mupdf = totals["pdfplumber"], totals["pymupdf"]
+        print(f"\n{len(ratios)} files, {n_pages} pages")
+        print(f"  pdfplumber : {n_pages / plumber:8.1f} pages/s")
+        print(f"  pymupdf    : {n_pages / mupdf:8.1f} pages/s  ({plumber / mupdf:.1f}x)")
+        print(f"  parity     : mean {sum(ratios) / len(ratios):.3f}, min {min(ratios):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark Markdown table rendering on large tables.
+
+Compares ``MarkdownFormatter.make_table`` with the previous per-cell
+implementation (kept here for reference) on a wide, tall table.
+
+Usage::
+
+    python -m benchmarks.bench_tables            # 100k rows x 50 columns
+    python -m benchmarks.bench_tables --rows 10000 --cols 20
+"""
+
+import argparse
+import time
+
+from src.utils.markdown_formatter import MarkdownFormatter
+
+
+def legacy_make_table(headers: list[str], rows: list[list[str]]) -> str:
+    """The pre-unification renderer: per-cell closure, per-row padding copy."""
+    if not headers:
+        return ""
+
+    def escape(cell: str) -> str:
+        return str(cell).replace("|", "\\|").strip()
+
+    header_line = "| " + " | ".join(escape(h) for h in headers) + " |"
+    sep_line = "| " + " | ".join("---" for _ in headers) + " |"
+
+    body_lines: list[str] = []
+    for row in rows:
+        padded = list(row) + [""] * (len(headers) - len(row))
+        padded = padded[: len(headers)]
+        body_lines.append("| " + " | ".join(escape(c) for c in padded) + " |")
+
+    return "\n".join([header_line, sep_line, *body_lines])
+
+
+def build_table(
+    n_rows: int, n_cols: int, pipe_every: int = 0
+) -> tuple[list[str], list[list[str]]]:
+    """Build a table; every *pipe_every*-th row has cells containing ``|``."""
+    headers = [f"col_{c}" for c in range(n_cols)]
+    rows = []
+    for r in range(n_rows):
+        piped = pipe_every and r % pipe_every == 0
+        row = [
+            f" a|b {r} " if piped and c % 7 == 0 else f"value {r}-{c}"
+            for c in range(n_cols)
+        ]
+        if r % 11 == 0:
+            row = row[: n_cols // 2]  # ragged rows exercise padding
+        rows.append(row)
+    return headers, rows
+
+
+def timed(fn, *args) -> tuple[float, str]:
+    start = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - start, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--cols", type=int, default=50)
+    args = ap.parse_args()
+
+    cells = args.rows * args.cols
+    print(f"Table: {args.rows:,} rows x {args.cols} cols ({cells:,} cells)")
+
+    for label, pipe_every in (("no pipes", 0), ("pipes in 1/20 rows", 20), ("pipes in every row", 1)):
+        headers, rows = build_table(args.rows, args.cols, pipe_every)
+        t_legacy, legacy = timed(legacy_make_table, headers, rows)
+        t_new, new = timed(MarkdownFormatter.make_table, headers, rows)
+        assert new == legacy, "renderers disagree"
+
+        print(f"\n{label}:")
+        print(f"  legacy make_table : {t_legacy:7.3f} s  ({cells / t_legacy / 1e6:5.2f} Mcells/s)")
+        print(f"  make_table        : {t_new:7.3f} s  ({cells / t_new / 1e6:5.2f} Mcells/s)")
+        print(f"  speed-up          : {t_legacy / t_new:7.2f}x")
+
+    t_aligned, _ = timed(MarkdownFormatter.make_table, headers, rows[:1000], True)
+    print(f"\naligned, 1k rows    : {t_aligned:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
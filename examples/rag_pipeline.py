@@ -1,40 +1,9 @@
 """Example: integrate the converter into a simple RAG preprocessing pipeline."""
 
-import re
 from pathlib import Path
 
 from src import UniversalMarkdownConverter
-
-
-def chunk_markdown(text: str, max_chars: int = 1000) -> list[str]:
-    """Split Markdown into chunks on section boundaries.
-
-    Splits on ``## `` headings first, then falls back to paragraph breaks.
-    Each chunk is at most *max_chars* characters.
-    """
-    sections = re.split(r"(?=^## )", text, flags=re.MULTILINE)
-    chunks: list[str] = []
-
-    for section in sections:
-        section = section.strip()
-        if not section:
-            continue
-        if len(section) <= max_chars:
-            chunks.append(section)
-        else:
-            # Split long sections by paragraph
-            paragraphs = section.split("\n\n")
-            current = ""
-            for para in paragraphs:
-                if current and len(current) + len(para) + 2 > max_chars:
-                    chunks.append(current.strip())
-                    current = para
-                else:
-                    current = f"{current}\n\n{para}" if current else para
-            if current.strip():
-                chunks.append(current.strip())
-
-    return chunks
+from src.chunking import ChunkFeed, read_documents
 
 
 def main() -> None:
@@ -46,28 +15,36 @@ def main() -> None:
         print("Create a ./documents directory with files to convert.")
         return
 
-    results = converter.batch_convert(source_dir, "./md_output", recursive=True)
+    # Stream every document into one JSONL corpus instead of a tree of .md
+    # files, so the chunking step below reads a single file sequentially.
+    corpus = Path("./md_output/corpus.jsonl")
+    results = converter.batch_convert(
+        source_dir, corpus, recursive=True, output_format="jsonl"
+    )
     print(f"Converted {sum(1 for v in results.values() if isinstance(v, str))} files")
 
-    # 2. Chunk each Markdown file for embedding
-    all_chunks: list[dict] = []
-    for md_path in Path("./md_output").rglob("*.md"):
-        text = md_path.read_text(encoding="utf-8")
-        chunks = chunk_markdown(text, max_chars=800)
-        for i, chunk in enumerate(chunks):
-            all_chunks.append({
-                "source": md_path.name,
-                "chunk_index": i,
-                "text": chunk,
-            })
-
-    print(f"Generated {len(all_chunks)} chunks ready for embedding")
-
-    # 3. At this point you'd send all_chunks to your embedding model
-    #    and store in a vector database.
-    for chunk in all_chunks[:3]:
-        print(f"\n--- {chunk['source']} chunk {chunk['chunk_index']} ---")
-        print(chunk["text"][:200] + "...")
+    # 2. Chunk each converted document for embedding.  Chunk IDs come from
+    #    the heading path and the chunk's text, and the manifest remembers
+    #    the last run's IDs, so a re-run only yields the chunks that changed.
+    feed = ChunkFeed(Path("./md_output/chunks.json"), max_chars=800)
+    events: list[dict] = []
+    for source, markdown in read_documents(corpus):
+        events.extend(feed.update(source, markdown))
+    events.extend(feed.finish())
+    feed.save()
+
+    print(
+        f"{feed.counts['add']} new, {feed.counts['modify']} modified, "
+        f"{feed.counts['remove']} removed, {feed.counts['unchanged']} unchanged chunks"
+    )
+
+    # 3. At this point you'd embed the text of "add" and "modify" events,
+    #    upsert them by id, and delete the ids of "remove" events and the
+    #    "replaces" ids of "modify" events from your vector database.
+    for event in events[:3]:
+        print(f"\n--- {event['op']} {event['id']} ({' > '.join(event['headings'])}) ---")
+        if "text" in event:
+            print(event["text"][:200] + "...")
 
 
 if __name__ == "__main__":
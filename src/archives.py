@@ -0,0 +1,145 @@
+"""Reading documents out of zip and tar archives without extracting them.
+
+:class:`ArchiveReader` walks an archive's members in order, keeps the ones
+a parser supports (see :class:`~src.utils.file_detector.FileDetector`) and
+hands each over as an :class:`ArchiveMember` holding its bytes, ready to be
+converted from a stream.  Tar archives are read sequentially, so a
+``.tar.gz`` is decompressed once however many members it has.  Archives
+inside archives are opened in memory up to ``max_depth`` levels.
+
+Every byte decompressed from one top-level archive, nested ones included,
+counts towards ``max_bytes``.  The count is taken while reading rather than
+from the sizes the archive declares, so a zip bomb stops at the cap.
+"""
+
+import io
+import logging
+import tarfile
+import zipfile
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, NamedTuple
+
+from .utils.file_detector import FileDetector
+
+logger = logging.getLogger(__name__)
+
+#: File name endings treated as archives.
+ARCHIVE_SUFFIXES: tuple[str, ...] = (
+    ".zip", ".tar", ".tgz", ".tar.gz", ".tbz2", ".tar.bz2", ".txz", ".tar.xz",
+)
+
+
+class ArchiveLimitError(ValueError):
+    """An archive decompresses to more bytes than allowed."""
+
+
+class ArchiveMember(NamedTuple):
+    """A supported document inside an archive.
+
+    *path* is the archive's path joined with the member's name (e.g.
+    ``in/bundle.zip/reports/q1.pdf``), which batch output mirrors.
+    """
+
+    path: Path
+    data: bytes
+
+
+def is_archive(path: str | Path) -> bool:
+    """Whether *path* names an archive, by its suffix."""
+    return Path(path).name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def item_path(item: str | Path | ArchiveMember) -> Path:
+    """The path of a batch item: a file, or a member's archive path."""
+    return item.path if isinstance(item, ArchiveMember) else Path(item)
+
+
+def _member_path(name: str) -> Path | None:
+    """*name* as a relative path with ``..``, ``.`` and roots dropped."""
+    parts = [p for p in name.replace("\\", "/").split("/") if p not in ("", ".", "..")]
+    return Path(*parts) if parts else None
+
+
+class ArchiveReader:
+    """Iterate the supported documents in zip and tar archives.
+
+    Args:
+        max_depth: Archive nesting levels opened; ``1`` ignores archives
+                   inside archives.
+        max_bytes: Decompressed bytes allowed per top-level archive.
+        chunk_size: Read size while decompressing a member.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 2,
+        max_bytes: int = 2 << 30,
+        chunk_size: int = 1 << 20,
+    ) -> None:
+        if max_depth < 1:
+            raise ValueError("max_depth must be at least 1")
+        self.max_depth = max_depth
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+
+    def members(self, path: str | Path) -> Iterator[ArchiveMember]:
+        """Yield the supported members of the archive at *path*, in archive order.
+
+        Raises:
+            ArchiveLimitError: Once more than :attr:`max_bytes` have been
+                               decompressed.
+            zipfile.BadZipFile, tarfile.TarError: If an archive is corrupt.
+        """
+        path = Path(path)
+        budget = [self.max_bytes]  # remaining bytes, shared with nested archives
+        with open(path, "rb") as fh:
+            yield from self._walk(fh, path, 1, budget)
+
+    def _walk(
+        self, fh: BinaryIO, path: Path, depth: int, budget: list[int]
+    ) -> Iterator[ArchiveMember]:
+        if path.name.lower().endswith(".zip"):
+            entries = self._zip_entries(fh)
+        else:
+            entries = self._tar_entries(fh)
+        for name, open_member in entries:
+            member = _member_path(name)
+            if member is None:
+                continue
+            target = path / member
+            if is_archive(member):
+                if depth >= self.max_depth:
+                    logger.warning("Skipping %s: archives nested deeper than %d", target, depth)
+                    continue
+                data = self._read(open_member(), target, budget)
+                yield from self._walk(io.BytesIO(data), target, depth + 1, budget)
+            elif FileDetector.detect(member) is not None:
+                yield ArchiveMember(target, self._read(open_member(), target, budget))
+
+    @staticmethod
+    def _zip_entries(fh: BinaryIO) -> Iterator[tuple[str, Callable[[], BinaryIO]]]:
+        with zipfile.ZipFile(fh) as zf:
+            for info in zf.infolist():
+                if not info.is_dir():
+                    yield info.filename, partial(zf.open, info)
+
+    @staticmethod
+    def _tar_entries(fh: BinaryIO) -> Iterator[tuple[str, Callable[[], BinaryIO]]]:
+        # Stream mode: members must be read before moving to the next one.
+        with tarfile.open(fileobj=fh, mode="r|*") as tf:
+            for info in tf:
+                if info.isfile():
+                    yield info.name, partial(tf.extractfile, info)
+
+    def _read(self, stream: BinaryIO, target: Path, budget: list[int]) -> bytes:
+        chunks = []
+        with stream:
+            while chunk := stream.read(self.chunk_size):
+                budget[0] -= len(chunk)
+                if budget[0] < 0:
+                    raise ArchiveLimitError(
+                        f"{target}: archive decompresses to more than {self.max_bytes} bytes"
+                    )
+                chunks.append(chunk)
+        return b"".join(chunks)
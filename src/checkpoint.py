@@ -0,0 +1,108 @@
+"""Checkpoint journal that makes batch runs resumable.
+
+While a batch runs, every finished file is appended to the journal as
+one JSON line holding its path relative to the input directory and its
+outcome (output location or error).  Lines are buffered and flushed, with
+an ``fsync``, at most every *flush_interval* seconds, so the cost per file
+is a small in-memory write.  A crash loses at most the last interval's
+entries; those files are simply converted again on resume.  That is
+harmless when each file's output is rewritten in place, but a sink that
+appends (a JSONL corpus) would gain duplicate records, so batches journal
+those with ``flush_interval=0``: every entry is flushed as it is recorded.
+
+A resumed run loads the journal, skips every file it lists and reports
+the recorded outcomes alongside the new ones, with earlier failures
+replayed as :class:`PriorFailure`.
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class PriorFailure(RuntimeError):
+    """A failure recorded by an earlier run and replayed from the journal."""
+
+
+def default_journal_path(output: str | Path) -> Path:
+    """Journal location for a batch writing to *output*: ``<output>.journal``."""
+    output = Path(output)
+    return output.with_name(output.name + ".journal")
+
+
+class CheckpointJournal:
+    """Append-only log of finished files.
+
+    Args:
+        path: Journal file.
+        resume: Load existing entries into :attr:`completed` and append to
+                the file; otherwise any existing journal is replaced.
+        flush_interval: Seconds between flushes of buffered entries.
+    """
+
+    def __init__(self, path: str | Path, resume: bool = False, flush_interval: float = 1.0) -> None:
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        #: Outcome per relative POSIX path recorded by earlier runs.
+        self.completed: dict[str, str | PriorFailure] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if resume and self.path.exists():
+            self._load()
+            self._fh = self.path.open("ab")
+        else:
+            self._fh = self.path.open("wb")
+        self._last_flush = time.monotonic()
+
+    def record(self, relative_path: str | Path, outcome: str | Exception) -> None:
+        """Log the outcome of one file."""
+        entry = {"path": Path(relative_path).as_posix()}
+        if isinstance(outcome, Exception):
+            entry["error"] = f"{type(outcome).__name__}: {outcome}"
+        else:
+            entry["location"] = outcome
+        self._fh.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self.flush()
+            self._last_flush = now
+
+    def flush(self) -> None:
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self.flush()
+            self._fh.close()
+
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _load(self) -> None:
+        data = self.path.read_bytes()
+        # A crash can leave a partial last line; drop it so appended
+        # entries start on a line of their own.
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with self.path.open("r+b") as fh:
+                fh.truncate(end)
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning("Skipping corrupt journal line in %s", self.path)
+                continue
+            if "error" in entry:
+                self.completed[entry["path"]] = PriorFailure(entry["error"])
+            else:
+                self.completed[entry["path"]] = entry["location"]
+        logger.info("Resuming: %d file(s) already processed", len(self.completed))
@@ -0,0 +1,296 @@
+"""Chunking converted Markdown with stable chunk IDs, and chunk-level deltas.
+
+Chunks are cut along the document's headings first.  A section longer than
+*max_chars* is split between paragraphs, and a chunk ends after a
+paragraph whose hash has its low bits clear (once the chunk has at least
+*min_chars*).  Boundaries therefore depend on content rather than on
+position: editing one paragraph changes its own chunk and, at most, the
+next one or two, while every other chunk of the document keeps its exact
+text.
+
+A chunk's ID combines a hash of its source and heading path with a hash of
+its text (``<path hash>-<text hash>``), so an unchanged chunk keeps its ID
+across runs wherever it moves.  The metadata header is not chunked, so the
+``Converted`` timestamp does not change any ID.
+
+:class:`ChunkFeed` compares each document's chunks with a manifest saved by
+the previous run and emits only the changes: ``add``, ``modify`` (a new
+chunk replacing a changed one under the same heading path) and ``remove``.
+The embedding side then re-embeds in proportion to what changed.
+"""
+
+import hashlib
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+from .utils.digest import text_digest
+from .utils.output_sink import atomic_write_text
+
+_HEADING = re.compile(r" {0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_FENCE = re.compile(r" {0,3}(`{3,}|~{3,})")
+
+# A paragraph ends a chunk when these bits of its hash are all zero, i.e.
+# after one paragraph in four on average.
+_BOUNDARY_MASK = 3
+
+
+class Chunk(NamedTuple):
+    """One chunk of a converted document."""
+
+    id: str
+    source: str
+    headings: tuple[str, ...]
+    text: str
+
+
+def chunk_id(source: str, headings: tuple[str, ...], text: str) -> str:
+    """ID of a chunk: ``<source and heading path hash>-<text hash>``."""
+    where = hashlib.blake2b(
+        "\x1f".join((source, *headings)).encode("utf-8"), digest_size=4
+    ).hexdigest()
+    return f"{where}-{text_digest(text)[:16]}"
+
+
+def chunk_markdown(
+    markdown: str,
+    source: str,
+    max_chars: int = 1000,
+    min_chars: Optional[int] = None,
+) -> list[Chunk]:
+    """Split a converted document into chunks with stable IDs.
+
+    Args:
+        markdown: The document, with or without its metadata header.
+        source: Name of the document; part of every chunk ID.
+        max_chars: Chunk size limit.  A single paragraph (or, for an
+                   oversized paragraph, a single line) longer than this
+                   becomes a chunk of its own.
+        min_chars: Size before a content-defined boundary may end a chunk
+                   (default: a quarter of *max_chars*).
+    """
+    if min_chars is None:
+        min_chars = max_chars // 4
+    title, body = _split_header(markdown)
+    chunks: list[Chunk] = []
+    seen: Counter[str] = Counter()
+    for headings, units in _sections(body, title):
+        for group in _group(units, max_chars, min_chars):
+            text = "".join(group).strip()
+            cid = chunk_id(source, headings, text)
+            seen[cid] += 1
+            if seen[cid] > 1:  # the same text twice under one heading
+                cid = f"{cid}-{seen[cid]}"
+            chunks.append(Chunk(cid, source, headings, text))
+    return chunks
+
+
+def _split_header(markdown: str) -> tuple[Optional[str], str]:
+    """Return the title and the body of a document with a metadata header."""
+    lines = markdown.split("\n")
+    if not lines[0].startswith("# "):
+        return None, markdown
+    i = 1
+    while i < len(lines) and (not lines[i].strip() or lines[i].startswith("*")):
+        i += 1
+    if i < len(lines) and lines[i].strip() == "---":
+        return lines[0][2:].strip(), "\n".join(lines[i + 1 :])
+    return None, markdown
+
+
+def _sections(body: str, title: Optional[str]) -> Iterator[tuple[tuple[str, ...], list[str]]]:
+    """Yield ``(heading path, units)`` per section of *body*, skipping empty ones.
+
+    Units are paragraphs with their separator; fenced code blocks are never
+    split at a blank line, and headings inside them are ignored.
+    """
+    path: list[tuple[int, str]] = [(1, title)] if title else []
+    heading = ""
+    block: list[str] = []
+    blocks: list[str] = []
+    fence = ""
+
+    def section() -> Iterator[tuple[tuple[str, ...], list[str]]]:
+        if block:
+            blocks.append("\n".join(block))
+        if blocks:
+            if heading:
+                blocks[0] = f"{heading}\n\n{blocks[0]}"
+            yield tuple(name for _, name in path), [b + "\n\n" for b in blocks]
+        block.clear()
+        blocks.clear()
+
+    for line in body.split("\n"):
+        if fence:
+            block.append(line)
+            if line.strip().startswith(fence) and not line.strip().strip(fence[0]):
+                fence = ""
+            continue
+        opening = _FENCE.match(line)
+        if opening:
+            fence = opening[1]
+            block.append(line)
+            continue
+        match = _HEADING.match(line)
+        if match:
+            yield from section()
+            level = len(match[1])
+            while path and path[-1][0] >= level:
+                path.pop()
+            path.append((level, match[2]))
+            heading = line.strip()
+        elif not line.strip():
+            if block:
+                blocks.append("\n".join(block))
+                block.clear()
+        else:
+            block.append(line.rstrip())
+    yield from section()
+
+
+def _group(units: list[str], max_chars: int, min_chars: int) -> Iterator[list[str]]:
+    """Gather *units* into chunks at content-defined boundaries."""
+    chunk: list[str] = []
+    size = 0
+    for unit in _fit(units, max_chars):
+        if chunk and size + len(unit) > max_chars:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(unit)
+        size += len(unit)
+        if size >= min_chars and _is_boundary(unit):
+            yield chunk
+            chunk, size = [], 0
+    if chunk:
+        yield chunk
+
+
+def _fit(units: list[str], max_chars: int) -> Iterator[str]:
+    """*units*, with those over *max_chars* split into lines."""
+    for unit in units:
+        if len(unit) <= max_chars:
+            yield unit
+            continue
+        lines = unit.rstrip("\n").split("\n")
+        for line in lines[:-1]:
+            yield line + "\n"
+        yield lines[-1] + "\n\n"
+
+
+def _is_boundary(unit: str) -> bool:
+    h = hashlib.blake2b(unit.encode("utf-8"), digest_size=4).digest()
+    return not h[0] & _BOUNDARY_MASK
+
+
+# ----------------------------------------------------------------------
+# Deltas
+# ----------------------------------------------------------------------
+
+
+def read_documents(path: str | Path) -> Iterator[tuple[str, str]]:
+    """Yield ``(source, markdown)`` from a batch's output.
+
+    *path* is a directory of ``.md`` files (sources are their paths relative
+    to it) or a JSONL corpus (sources are the records' ``source``).
+    """
+    path = Path(path)
+    if path.is_dir():
+        for md in sorted(path.rglob("*.md")):
+            yield md.relative_to(path).as_posix(), md.read_text(encoding="utf-8")
+        return
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                record = json.loads(line)
+                yield record["source"], record["markdown"]
+
+
+class ChunkFeed:
+    """Chunk documents and emit only what changed since the last run.
+
+    Each call to :meth:`update` returns change events for one document,
+    against the chunks recorded for it in the manifest.  Events are dicts
+    with ``op`` (``"add"``, ``"modify"`` or ``"remove"``), ``id``,
+    ``source`` and ``headings``; ``add`` and ``modify`` also carry
+    ``index`` (position in the document) and ``text``, and ``modify``
+    carries ``replaces``, the ID of the chunk it supersedes.  Counts of
+    events and of unchanged chunks are kept in :attr:`counts`.
+
+    Args:
+        manifest: JSON file holding the previous run's chunk IDs per
+                  source.  It need not exist yet; without it every chunk
+                  is an ``add``.
+        max_chars, min_chars: Chunk sizes; see :func:`chunk_markdown`.
+    """
+
+    def __init__(
+        self,
+        manifest: Optional[str | Path] = None,
+        max_chars: int = 1000,
+        min_chars: Optional[int] = None,
+    ) -> None:
+        self.manifest = Path(manifest) if manifest is not None else None
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+        self._previous: dict[str, list[dict]] = {}
+        if self.manifest is not None and self.manifest.exists():
+            self._previous = json.loads(self.manifest.read_text(encoding="utf-8"))
+        self._current: dict[str, list[dict]] = {}
+        self.counts: Counter[str] = Counter()
+
+    def update(self, source: str, markdown: str) -> list[dict]:
+        """Chunk one document and return its change events."""
+        chunks = chunk_markdown(markdown, source, self.max_chars, self.min_chars)
+        # A source seen earlier in this run is compared with that version.
+        previous = self._current.get(source, self._previous.get(source, []))
+        self._current[source] = [{"id": c.id, "headings": list(c.headings)} for c in chunks]
+
+        new_ids = {c.id for c in chunks}
+        old_ids = {entry["id"] for entry in previous}
+        # Chunks that went away, by heading path, in document order.
+        gone: dict[tuple[str, ...], list[str]] = {}
+        for entry in previous:
+            if entry["id"] not in new_ids:
+                gone.setdefault(tuple(entry["headings"]), []).append(entry["id"])
+
+        events = []
+        for index, chunk in enumerate(chunks):
+            if chunk.id in old_ids:
+                self.counts["unchanged"] += 1
+                continue
+            event = {"op": "add", "id": chunk.id, "source": source,
+                     "headings": list(chunk.headings), "index": index, "text": chunk.text}
+            replaced = gone.get(chunk.headings)
+            if replaced:
+                event["op"] = "modify"
+                event["replaces"] = replaced.pop(0)
+            events.append(event)
+        for headings, ids in gone.items():
+            events.extend(
+                {"op": "remove", "id": cid, "source": source, "headings": list(headings)}
+                for cid in ids
+            )
+        self.counts.update(e["op"] for e in events)
+        return events
+
+    def finish(self) -> list[dict]:
+        """Return ``remove`` events for the sources not updated in this run."""
+        events = [
+            {"op": "remove", "id": entry["id"], "source": source, "headings": entry["headings"]}
+            for source, entries in self._previous.items()
+            if source not in self._current
+            for entry in entries
+        ]
+        self.counts["remove"] += len(events)
+        return events
+
+    def save(self) -> None:
+        """Write this run's chunk IDs to the manifest (atomically)."""
+        if self.manifest is None:
+            raise ValueError("ChunkFeed was created without a manifest")
+        self.manifest.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(
+            self.manifest, json.dumps(self._current, ensure_ascii=False, separators=(",", ":"))
+        )
@@ -1,11 +1,84 @@
 """Command-line interface for the Universal Markdown Converter."""
 
 import argparse
+import json
 import logging
+import os
 import sys
 from pathlib import Path
+from typing import Iterator, Optional
 
+from .archives import ArchiveReader
+from .checkpoint import default_journal_path
+from .chunking import ChunkFeed, read_documents
 from .converter import UniversalMarkdownConverter
+from .dedup import Deduplicator, default_report_path
+from .executor import ConversionExecutor
+from .scheduler import Scheduler
+from .utils.file_detector import SNIFFED_EXTENSIONS, FileDetector
+from .utils.output_sink import SINK_FORMATS, StreamSink, Unchanged, open_sink
+
+
+def _coerce(value: str) -> object:
+    """Turn a ``-P`` option value into a bool / int / float when it looks like one."""
+    lowered = value.lower()
+    if lowered in ("true", "yes", "on"):
+        return True
+    if lowered in ("false", "no", "off"):
+        return False
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _parser_options(pairs: list[str]) -> dict[str, dict]:
+    """Parse ``KEY.NAME=VALUE`` strings into ``parser_options`` for the converter."""
+    options: dict[str, dict] = {}
+    for pair in pairs:
+        target, sep, value = pair.partition("=")
+        key, dot, name = target.partition(".")
+        if not (sep and dot and key and name):
+            raise ValueError(f"Invalid parser option {pair!r}; expected KEY.NAME=VALUE")
+        options.setdefault(key, {})[name.replace("-", "_")] = _coerce(value)
+    return options
+
+
+def _iter_paths(source: str, null: bool) -> Iterator[Path]:
+    """Lazily read newline- or NUL-delimited paths from *source* (``-`` = stdin)."""
+    fh = sys.stdin.buffer if source == "-" else open(source, "rb")
+    sep = b"\0" if null else b"\n"
+    try:
+        tail = b""
+        while True:
+            block = fh.read(1 << 16)
+            if not block:
+                break
+            *items, tail = (tail + block).split(sep)
+            for item in items:
+                if not null:
+                    item = item.rstrip(b"\r")
+                if item:
+                    yield Path(os.fsdecode(item))
+        if tail.strip(b"\r"):
+            yield Path(os.fsdecode(tail.rstrip(b"\r") if not null else tail))
+    finally:
+        if fh is not sys.stdin.buffer:
+            fh.close()
+
+
+def _type_hint(kind: Optional[str]) -> Optional[Path]:
+    """Turn ``--type`` (an extension or parser key) into a filename hint."""
+    if kind is None:
+        return None
+    ext = kind if kind.startswith(".") else f".{kind}"
+    if FileDetector.detect(Path(f"stdin{ext}")) is not None:
+        return Path(f"stdin{ext}")
+    if kind in SNIFFED_EXTENSIONS:
+        return Path(f"stdin{SNIFFED_EXTENSIONS[kind]}")
+    raise ValueError(f"Unknown --type {kind!r}; use a supported extension, e.g. pdf or csv")
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -15,29 +88,247 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     sub = parser.add_subparsers(dest="command", required=True)
 
+    # Options shared by every converting sub-command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "-P",
+        "--parser-option",
+        action="append",
+        default=[],
+        metavar="KEY.NAME=VALUE",
+        help="Parser setting, e.g. -P docx.engine=xml (repeatable)",
+    )
+    common.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="Reproducible output: no timestamp, source and output digests in "
+        "the header; unchanged .md files are not rewritten",
+    )
+
+    # Options for sub-commands that convert many files
+    parallel = argparse.ArgumentParser(add_help=False)
+    parallel.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for converting many files (0 = one per CPU)",
+    )
+    parallel.add_argument(
+        "--threads",
+        type=int,
+        default=0,
+        help="Threads converting text, code and Markdown files, which then "
+        "skip the worker processes (default: 0)",
+    )
+
     # -- convert ----------------------------------------------------------
-    p_convert = sub.add_parser("convert", help="Convert a single file to Markdown")
-    p_convert.add_argument("input", help="Path to the source file")
+    p_convert = sub.add_parser(
+        "convert",
+        parents=[common, parallel],
+        help="Convert a file, stdin, or a list of files to Markdown",
+    )
+    p_convert.add_argument(
+        "input",
+        nargs="?",
+        help="Path to the source file, or - to read the document from stdin",
+    )
     p_convert.add_argument(
         "-o",
         "--output",
         default=None,
         help="Output file path (default: print to stdout)",
     )
+    p_convert.add_argument(
+        "--files-from",
+        metavar="FILE",
+        default=None,
+        help="Convert every path listed in FILE (- for stdin), one per line",
+    )
+    p_convert.add_argument(
+        "-0",
+        "--null",
+        action="store_true",
+        help="Paths in --files-from are NUL-delimited (as from find -print0)",
+    )
+    p_convert.add_argument(
+        "--type",
+        default=None,
+        help="Document type of stdin input, e.g. pdf, docx, csv (default: sniff)",
+    )
+    p_convert.add_argument(
+        "--format",
+        choices=StreamSink.FORMATS,
+        default="md",
+        help="Output as concatenated Markdown documents (default) or JSON Lines",
+    )
 
     # -- batch-convert ----------------------------------------------------
     p_batch = sub.add_parser(
-        "batch-convert", help="Convert all supported files in a directory"
+        "batch-convert",
+        parents=[common, parallel],
+        help="Convert all supported files in a directory",
     )
     p_batch.add_argument("input_dir", help="Source directory")
     p_batch.add_argument(
-        "-o", "--output-dir", required=True, help="Destination directory"
+        "-o",
+        "--output-dir",
+        required=True,
+        help="Destination directory (or bundle file with --format)",
+    )
+    p_batch.add_argument(
+        "--format",
+        choices=SINK_FORMATS,
+        default="md",
+        help="Output layout: one .md per file (default) or a single bundle",
+    )
+    p_batch.add_argument(
+        "--rotate-mb",
+        type=float,
+        default=None,
+        help="Split jsonl/parquet output into shards of about this many MB",
     )
     p_batch.add_argument(
         "--no-recursive",
         action="store_true",
         help="Do not recurse into sub-directories",
     )
+    p_batch.add_argument(
+        "--schedule",
+        choices=Scheduler.POLICIES,
+        default=None,
+        help="Work order (default: largest-first with -j/--queue, else sorted)",
+    )
+    p_batch.add_argument(
+        "--priority",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Schedule files matching GLOB (relative to INPUT_DIR) first; repeatable",
+    )
+    p_batch.add_argument(
+        "--no-archives",
+        action="store_true",
+        help="Skip zip/tar archives instead of converting their members",
+    )
+    p_batch.add_argument(
+        "--archive-depth",
+        type=int,
+        default=2,
+        help="Archive nesting levels to open (default: 2, archives in archives)",
+    )
+    p_batch.add_argument(
+        "--archive-max-mb",
+        type=float,
+        default=2048.0,
+        help="Decompressed MB allowed per archive before it is rejected (default: 2048)",
+    )
+    p_batch.add_argument(
+        "--dedup",
+        choices=Deduplicator.MODES,
+        default=None,
+        help="Convert byte-identical files once ('exact'), and also report "
+        "similar text ('near'); findings go to OUTPUT_DIR.duplicates.json",
+    )
+    p_batch.add_argument(
+        "--near-threshold",
+        type=float,
+        default=0.8,
+        metavar="SIMILARITY",
+        help="Shingle similarity from which --dedup near reports a pair (default: 0.8)",
+    )
+    p_batch.add_argument(
+        "--resume",
+        action="store_true",
+        help="Journal progress to <output>.journal and skip files an earlier --resume run finished",
+    )
+    p_batch.add_argument(
+        "--queue",
+        metavar="DB",
+        default=None,
+        help="Share the work through this SQLite queue with other processes/nodes",
+    )
+    p_batch.add_argument(
+        "--lease",
+        type=float,
+        default=300.0,
+        metavar="SECONDS",
+        help="Queue lease length; leases of dead workers expire after this (default: 300)",
+    )
+    p_batch.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Attempts per file before the queue marks it failed (default: 3)",
+    )
+    p_batch.add_argument(
+        "--queue-journal",
+        choices=("wal", "delete"),
+        default="wal",
+        help="SQLite journal mode; use 'delete' when the queue is on NFS",
+    )
+
+    # -- serve ------------------------------------------------------------
+    p_serve = sub.add_parser(
+        "serve",
+        parents=[common],
+        help="Run a conversion service with warm workers (HTTP or Unix socket)",
+    )
+    p_serve.add_argument("--host", default="127.0.0.1", help="Bind address")
+    p_serve.add_argument("--port", type=int, default=8765, help="TCP port")
+    p_serve.add_argument(
+        "--socket",
+        default=None,
+        metavar="PATH",
+        help="Listen on a Unix-domain socket instead of TCP",
+    )
+    p_serve.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of conversion workers (default: CPU count)",
+    )
+    p_serve.add_argument(
+        "--queue-size",
+        type=int,
+        default=64,
+        help="Jobs allowed to wait for a worker before requests get 503",
+    )
+    p_serve.add_argument(
+        "--timeout",
+        type=float,
+        default=300.0,
+        help="Seconds a request waits for its conversion",
+    )
+
+    # -- chunk ------------------------------------------------------------
+    p_chunk = sub.add_parser(
+        "chunk",
+        help="Chunk converted output with stable IDs, emitting only changes",
+    )
+    p_chunk.add_argument(
+        "input",
+        help="Output of batch-convert: a directory of .md files or a JSONL corpus",
+    )
+    p_chunk.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="JSONL file for the chunk events (default: stdout)",
+    )
+    p_chunk.add_argument(
+        "--manifest",
+        metavar="FILE",
+        default=None,
+        help="Chunk IDs of the previous run; only changed chunks are emitted "
+        "and the file is updated",
+    )
+    p_chunk.add_argument(
+        "--max-chars",
+        type=int,
+        default=1000,
+        help="Chunk size limit in characters (default: 1000)",
+    )
 
     # -- list-formats -----------------------------------------------------
     sub.add_parser("list-formats", help="Show all supported file extensions")
@@ -59,36 +350,153 @@ def main(argv: list[str] | None = None) -> int:
         format="%(levelname)s: %(message)s",
     )
 
-    converter = UniversalMarkdownConverter()
+    try:
+        converter = UniversalMarkdownConverter(
+            _parser_options(getattr(args, "parser_option", [])),
+            deterministic=getattr(args, "deterministic", False),
+        )
+    except (TypeError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
 
     if args.command == "convert":
-        try:
-            md = converter.convert(args.input, args.output)
-        except (FileNotFoundError, ValueError) as exc:
-            print(f"Error: {exc}", file=sys.stderr)
+        if (args.input is None) == (args.files_from is None):
+            print("Error: pass either INPUT or --files-from", file=sys.stderr)
+            return 1
+        if args.input == "-" and args.files_from == "-":
+            print("Error: stdin cannot hold both a document and a file list", file=sys.stderr)
             return 1
+        if args.type and args.input not in (None, "-"):
+            print("Error: --type only applies to a document on stdin", file=sys.stderr)
+            return 1
+        if args.files_from is None and args.input != "-" and args.format == "md":
+            try:
+                md = converter.convert(args.input, args.output)
+            except (FileNotFoundError, ValueError) as exc:
+                print(f"Error: {exc}", file=sys.stderr)
+                return 1
 
-        if args.output is None:
-            print(md)
-        else:
-            print(f"Converted → {args.output}")
-        return 0
+            if args.output is None:
+                print(md)
+            else:
+                print(f"Converted → {args.output}")
+            return 0
+        return _convert_to_stream(converter, args)
 
     if args.command == "batch-convert":
-        results = converter.batch_convert(
-            args.input_dir,
-            args.output_dir,
-            recursive=not args.no_recursive,
-        )
+        if args.resume and (args.queue or args.format not in ("md", "jsonl")):
+            print("Error: --resume needs md or jsonl output and no --queue", file=sys.stderr)
+            return 1
+        if args.dedup and args.queue:
+            print("Error: --dedup cannot be combined with --queue", file=sys.stderr)
+            return 1
+        max_bytes = int(args.rotate_mb * 1024 * 1024) if args.rotate_mb else None
+        try:
+            sink = open_sink(
+                args.output_dir,
+                args.format,
+                max_bytes=max_bytes,
+                append=args.resume or args.queue is not None,
+            )
+        except (ImportError, ValueError) as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 1
+        queue = None
+        if args.queue:
+            from .work_queue import WorkQueue
+
+            queue = WorkQueue(
+                args.queue,
+                lease_seconds=args.lease,
+                max_attempts=args.max_attempts,
+                journal_mode=args.queue_journal,
+            )
+        if not args.resume:
+            # The output is replaced, so a journal left by an earlier
+            # --resume run no longer describes it.
+            default_journal_path(args.output_dir).unlink(missing_ok=True)
+        schedule = None
+        if args.schedule or args.priority:
+            parallel = args.jobs != 1 or args.threads or queue is not None
+            default = "largest-first" if parallel else "sorted"
+            schedule = Scheduler(args.schedule or default, args.priority)
+        archives = False
+        if not args.no_archives:
+            archives = ArchiveReader(
+                args.archive_depth, int(args.archive_max_mb * 1024 * 1024)
+            )
+        dedup = None
+        if args.dedup:
+            dedup = Deduplicator(args.dedup, threshold=args.near_threshold)
+        with sink:
+            results = converter.batch_convert(
+                args.input_dir,
+                args.output_dir,
+                recursive=not args.no_recursive,
+                sink=sink,
+                workers=args.jobs,
+                threads=args.threads,
+                work_queue=queue,
+                resume=args.resume,
+                schedule=schedule,
+                dedup=dedup,
+                archives=archives,
+            )
         ok = sum(1 for v in results.values() if isinstance(v, str))
         fail = sum(1 for v in results.values() if isinstance(v, Exception))
-        print(f"Done: {ok} converted, {fail} failed")
+        unchanged = sum(1 for v in results.values() if isinstance(v, Unchanged))
+        if unchanged:
+            print(f"Done: {ok - unchanged} converted, {unchanged} unchanged, {fail} failed")
+        else:
+            print(f"Done: {ok} converted, {fail} failed")
+        if converter.stats:
+            print("Stats: " + ", ".join(f"{k}={v}" for k, v in sorted(converter.stats.items())))
+        if dedup is not None:
+            report = default_report_path(args.output_dir)
+            dedup.write_report(report, Path(args.input_dir))
+            print(
+                f"Duplicates: {len(dedup.exact)} exact, {len(dedup.near)} near "
+                f"(see {report})"
+            )
+        if queue is not None:
+            counts = queue.counts()
+            queue.close()
+            print(
+                f"Queue: {counts['done']} done, {counts['failed']} failed, "
+                f"{counts['pending'] + counts['leased']} outstanding"
+            )
+            # Attempts that failed here may have succeeded on a retry.
+            return 1 if counts["failed"] else 0
         if fail:
             for path, exc in results.items():
                 if isinstance(exc, Exception):
                     print(f"  FAIL {path}: {exc}", file=sys.stderr)
         return 1 if fail else 0
 
+    if args.command == "serve":
+        from .server import serve
+
+        where = args.socket or f"http://{args.host}:{args.port}"
+        print(f"Serving on {where} with {args.workers} workers (Ctrl-C to stop)")
+        try:
+            serve(
+                host=args.host,
+                port=args.port,
+                socket_path=args.socket,
+                workers=args.workers,
+                queue_size=args.queue_size,
+                parser_options=_parser_options(args.parser_option),
+                timeout=args.timeout,
+                deterministic=args.deterministic,
+            )
+        except OSError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 1
+        return 0
+
+    if args.command == "chunk":
+        return _chunk(args)
+
     if args.command == "list-formats":
         exts = converter.supported_formats()
         print("Supported file extensions:")
@@ -99,5 +507,98 @@ def main(argv: list[str] | None = None) -> int:
     return 0
 
 
+def _chunk(args) -> int:
+    """Write the chunk events for a batch's output as JSON Lines."""
+    feed = ChunkFeed(args.manifest, max_chars=args.max_chars)
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for source, markdown in read_documents(args.input):
+            events = feed.update(source, markdown)
+            out.writelines(_json_line(e) for e in events)
+        out.writelines(_json_line(e) for e in feed.finish())
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+    if args.manifest:
+        feed.save()
+    counts = feed.counts
+    print(
+        f"Chunks: {counts['add']} added, {counts['modify']} modified, "
+        f"{counts['remove']} removed, {counts['unchanged']} unchanged",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _json_line(value: dict) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def _convert_to_stream(converter: UniversalMarkdownConverter, args) -> int:
+    """Convert a file, stdin or a ``--files-from`` list into one output stream."""
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    sink = StreamSink(out, args.format, name=args.output or "-")
+    fail = ok = 0
+    try:
+        if args.input == "-":
+            converted = [_convert_stdin(converter, args.type)]
+        elif args.input is not None:
+            path = Path(args.input)
+            converted = [(path, converter.convert_record(path))]
+        else:
+            executor = ConversionExecutor(
+                args.jobs,
+                converter.parser_options,
+                converter=converter,
+                deterministic=converter.deterministic,
+                threads=args.threads,
+            )
+            converted = executor.map_records(_iter_paths(args.files_from, args.null))
+
+        for path, record in converted:
+            if isinstance(record, Exception):
+                fail += 1
+                print(f"  FAIL {path}: {record}", file=sys.stderr)
+                continue
+            ok += 1
+            sink.write(
+                Path(record["source"]).with_suffix(".md"),
+                record["markdown"],
+                source=record["source"],
+                parser=record["parser"],
+                metadata=record["metadata"],
+            )
+    except BrokenPipeError:
+        # Downstream reader went away (e.g. `| head`); stop quietly.
+        sys.stderr.close()
+        return 1
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if args.output:
+            out.close()
+
+    if args.files_from is not None:
+        print(f"Done: {ok} converted, {fail} failed", file=sys.stderr)
+    return 1 if fail else 0
+
+
+def _convert_stdin(
+    converter: UniversalMarkdownConverter, kind: Optional[str]
+) -> tuple[Path, dict | Exception]:
+    hint = _type_hint(kind)
+    data = sys.stdin.buffer.read()
+    try:
+        return hint or Path("-"), converter.convert_record(hint, stream=data)
+    except ValueError as exc:
+        return hint or Path("-"), exc
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -1,8 +1,12 @@
 """Main converter that orchestrates file-to-Markdown conversion."""
 
+import io
 import logging
+import threading
+import time
+from collections import Counter
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, BinaryIO, Iterator, Optional
 
 from .parsers.base_parser import BaseParser
 from .parsers.pdf_parser import PDFParser
@@ -13,8 +17,18 @@ from .parsers.json_parser import JSONParser
 from .parsers.code_parser import CodeParser
 from .parsers.text_parser import TextParser
 from .parsers.markdown_passthrough import MarkdownPassthrough
-from .utils.file_detector import FileDetector
+from .utils.digest import file_digest, stream_digest, text_digest
+from .utils.file_detector import SNIFFED_EXTENSIONS, FileDetector
 from .utils.markdown_formatter import MarkdownFormatter
+from .utils.output_sink import DirectorySink, OutputSink, Unchanged, open_sink
+
+if TYPE_CHECKING:
+    from .archives import ArchiveMember, ArchiveReader
+    from .checkpoint import CheckpointJournal
+    from .dedup import Deduplicator
+    from .executor import ConversionExecutor
+    from .scheduler import Scheduler
+    from .work_queue import WorkQueue
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +41,41 @@ class UniversalMarkdownConverter:
         converter = UniversalMarkdownConverter()
         md = converter.convert("report.pdf")
         converter.batch_convert("./docs", "./output")
+
+    In *deterministic* mode the same input always converts to the same
+    bytes: the ``Converted`` timestamp is left out of the metadata header
+    and two fields are added, ``Source digest`` (of the input bytes) and,
+    last, ``Digest`` (of the complete document without that line).
+    Writing ``.md`` files, in a batch or with :meth:`convert`'s
+    *output_path*, then leaves an output that already holds the same
+    document untouched (see :class:`~src.utils.output_sink.Unchanged`).
     """
 
-    def __init__(self) -> None:
-        self.parsers: dict[str, BaseParser] = self._register_parsers()
+    def __init__(
+        self,
+        parser_options: Optional[dict[str, dict]] = None,
+        deterministic: bool = False,
+    ) -> None:
+        """
+        Args:
+            parser_options: Per-parser constructor keyword arguments keyed by
+                            parser registry key, e.g.
+                            ``{"docx": {"engine": "xml"}}``.
+            deterministic: Produce reproducible output with content digests.
+        """
+        self.parser_options = parser_options
+        self.deterministic = deterministic
+        self.parsers: dict[str, BaseParser] = self._register_parsers(parser_options)
+        # Relative and absolute output paths both resolve against the CWD;
+        # the sink remembers directories it has already created.
+        self._writer = DirectorySink(Path())
+        #: Running totals of parser counters (see
+        #: :meth:`BaseParser.parse_with_stats`) over every document converted,
+        #: including batch work done in worker processes.
+        self.stats: Counter[str] = Counter()
+        # Converters may be shared by threads (see ConversionExecutor), and
+        # Counter updates are not atomic without the GIL.
+        self._stats_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Public API
@@ -55,89 +100,616 @@ class UniversalMarkdownConverter:
             FileNotFoundError: If *input_path* does not exist.
             ValueError: If the file type is not supported.
         """
-        input_path = Path(input_path)
-        if not input_path.exists():
-            raise FileNotFoundError(f"File not found: {input_path}")
+        record = self.convert_record(input_path)
+        md = record["markdown"]
 
-        parser_key = FileDetector.detect(input_path)
-        if parser_key is None:
-            raise ValueError(
-                f"Unsupported file type: {input_path.suffix!r}. "
-                f"Supported: {', '.join(FileDetector.supported_extensions())}"
+        if output_path is not None:
+            location = self._writer.write(
+                Path(output_path),
+                md,
+                source=record["source"],
+                parser=record["parser"],
+                metadata=record["metadata"],
             )
+            if isinstance(location, Unchanged):
+                logger.info("Unchanged: %s", output_path)
+            else:
+                logger.info("Written to %s", output_path)
+
+        return md
+
+    def convert_bytes(
+        self,
+        data: bytes | bytearray | memoryview,
+        filename: Optional[str | Path] = None,
+    ) -> str:
+        """Convert an in-memory document to Markdown without touching disk.
+
+        Args:
+            data: The raw document.
+            filename: Name used to pick the parser (by extension) and for
+                      the metadata header.  Without it, or with an
+                      unrecognised extension, the type is sniffed from the
+                      content (PDF, DOCX, HTML, JSON, else plain text).
+
+        Returns:
+            The Markdown content.
+
+        Raises:
+            ValueError: If the type cannot be determined.
+        """
+        return self.convert_record(filename, stream=_as_stream(data))["markdown"]
+
+    def convert_stream(
+        self,
+        stream: BinaryIO,
+        filename: Optional[str | Path] = None,
+    ) -> str:
+        """Convert a binary file-like object to Markdown; see :meth:`convert_bytes`.
+
+        Seekable streams are read in place (from the start); others are
+        buffered in memory first.  The stream is not closed.
+        """
+        return self.convert_record(filename, stream=_as_stream(stream))["markdown"]
+
+    def convert_record(
+        self,
+        input_path: Optional[str | Path],
+        stream: Optional[BinaryIO] = None,
+    ) -> dict:
+        """Convert a single file and return a structured record.
+
+        Args:
+            input_path: Path to the source file.  With *stream*, only the
+                        document's name (may be ``None``; see
+                        :meth:`convert_bytes`).
+            stream: Binary document content; bytes-like values and
+                    non-seekable streams are accepted too.
+
+        Returns:
+            A dict with ``source`` (path string), ``parser`` (registry key),
+            ``metadata`` (the header fields, see
+            :meth:`BaseParser.metadata_fields`), ``markdown`` (the complete
+            document, identical to what :meth:`convert` returns) and
+            ``stats`` (parser counters, see
+            :meth:`BaseParser.parse_with_stats`).
 
-        parser = self.parsers[parser_key]
+        Raises:
+            FileNotFoundError: If *input_path* does not exist.
+            ValueError: If the file type is not supported.
+        """
+        stream = _as_stream(stream)
+        input_path, parser_key, parser = self._resolve_parser(input_path, stream)
         logger.info("Converting %s with %s parser", input_path, parser_key)
 
-        raw_md = parser.parse(input_path)
-        md = parser.add_metadata(raw_md, input_path)
-        md = MarkdownFormatter.strip_excessive_newlines(md)
+        raw_md, stats, extra = parser.parse_with_metadata(input_path, stream)
+        with self._stats_lock:
+            self.stats.update(stats)
+        return self._make_record(
+            input_path,
+            parser_key,
+            parser,
+            raw_md,
+            stats=stats,
+            source_digest=self._source_digest(input_path, stream),
+            **extra,
+        )
 
-        if output_path is not None:
-            output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(md, encoding="utf-8")
-            logger.info("Written to %s", output_path)
+    def convert_chunks(
+        self,
+        input_path: Optional[str | Path],
+        stream: Optional[BinaryIO] = None,
+    ) -> Iterator[dict]:
+        """Convert a file into a stream of self-contained chunk records.
 
-        return md
+        Parsers that can split their output (currently ``CSVParser`` via
+        ``iter_chunks``) yield one record per block, each with its own
+        metadata header, a ``Rows`` metadata field (``none`` for the one
+        block of a header-only CSV) and the column headers repeated.  Other parsers yield a single record.  Records have the
+        same shape as :meth:`convert_record` and are produced lazily, so
+        arbitrarily large inputs are converted in constant memory.
+        *input_path* and *stream* are as for :meth:`convert_record`.
+
+        Raises:
+            FileNotFoundError: If *input_path* does not exist.
+            ValueError: If the file type is not supported.
+        """
+        stream = _as_stream(stream)
+        input_path, parser_key, parser = self._resolve_parser(input_path, stream)
+        iter_chunks = getattr(parser, "iter_chunks", None)
+        if iter_chunks is None:
+            yield self.convert_record(input_path, stream)
+            return
+
+        logger.info("Chunking %s with %s parser", input_path, parser_key)
+        source_digest = self._source_digest(input_path, stream)
+        for chunk in iter_chunks(input_path, stream):
+            first, last = chunk["first_row"], chunk["last_row"]
+            yield self._make_record(
+                input_path,
+                parser_key,
+                parser,
+                chunk["markdown"],
+                source_digest=source_digest,
+                Rows=f"{first}–{last}" if last >= first else "none",
+            )
 
     def batch_convert(
         self,
         input_dir: str | Path,
         output_dir: str | Path,
         recursive: bool = True,
+        output_format: str = "md",
+        sink: Optional[OutputSink] = None,
+        workers: int = 1,
+        work_queue: Optional["WorkQueue"] = None,
+        worker_id: Optional[str] = None,
+        resume: bool = False,
+        journal: Optional[str | Path] = None,
+        schedule: Optional["Scheduler"] = None,
+        dedup: Optional["Deduplicator"] = None,
+        archives: "bool | ArchiveReader" = True,
+        threads: int = 0,
     ) -> dict[str, str | Exception]:
         """Convert every supported file in a directory.
 
         Args:
             input_dir: Root directory to scan.
-            output_dir: Destination directory for ``.md`` files.
+            output_dir: Destination directory for ``.md`` files, or the
+                        bundle file when *output_format* is not ``"md"``.
             recursive: Walk sub-directories when ``True``.
+            output_format: ``"md"`` for one file per document, or a bundled
+                           format (``"zip"``, ``"jsonl"``, ``"parquet"``);
+                           see :data:`~src.utils.output_sink.SINK_FORMATS`.
+                           An existing ``jsonl`` corpus is replaced unless
+                           *resume* or *work_queue* is given.
+            sink: A pre-built :class:`OutputSink`; overrides *output_dir*
+                  and *output_format*.  The caller remains responsible for
+                  closing it.
+            workers: Convert in this many worker processes (see
+                     :class:`~src.executor.ConversionExecutor`).
+            work_queue: Coordinate with other processes or nodes through
+                        this shared :class:`~src.work_queue.WorkQueue`: the
+                        scan is enqueued and files are converted as they
+                        are claimed, until no work is left anywhere.
+            worker_id: Lease owner name in *work_queue* (default
+                       ``host:pid``).
+            resume: Skip the files recorded in the checkpoint journal by an
+                    earlier run and include their outcomes in the results.
+            journal: Checkpoint journal to write (see
+                     :mod:`~src.checkpoint`); defaults to
+                     ``<output_dir>.journal`` when *resume* is set.
+            schedule: Order in which files are handed out (see
+                      :class:`~src.scheduler.Scheduler`).  By default a
+                      single worker takes files in sorted path order and
+                      parallel or queued runs start with the most expensive
+                      files.  Scheduled files are written as they finish.
+            dedup: Detect duplicates with this
+                   :class:`~src.dedup.Deduplicator`.  Files whose bytes
+                   match an earlier file are not converted: the sink
+                   aliases them to the original's output (a hard link for
+                   ``md``) and their result is that location or the
+                   original's error.  Near duplicates are converted as
+                   usual.  Both are recorded on *dedup*, and their
+                   locations in the results are
+                   :class:`~src.dedup.Duplicate` strings naming the
+                   original.
+            archives: Convert the supported members of zip and tar archives
+                      (see :class:`~src.archives.ArchiveReader`) straight
+                      from the archive, writing them under
+                      ``<archive name>/<member path>``.  ``True`` uses the
+                      default depth and size limits, ``False`` skips
+                      archives.  Not available with a *work_queue*, which
+                      logs a warning for each archive it skips.
+            threads: Convert plain text, code and Markdown files in this
+                     many threads instead of worker processes.
 
         Returns:
             A dict mapping each source file path (str) to either the output
-            path (str) on success or an ``Exception`` on failure.
+            location (str) on success or an ``Exception`` on failure.  With
+            a *work_queue*, only the files this call converted are listed;
+            the queue holds the combined results.  Archive members are
+            listed under their archive path, and an archive that cannot be
+            read (corrupt, or over the size limit) under its own path.
+
+        Raises:
+            ValueError: If a journal or *dedup* is combined with a
+                        *work_queue*, or a journal with a sink that does not
+                        persist each document as it is written (``zip``,
+                        ``parquet``, or ``jsonl`` without *resume*).
         """
         input_dir = Path(input_dir)
-        output_dir = Path(output_dir)
-        results: dict[str, str | Exception] = {}
+        if sink is None:
+            append = resume or work_queue is not None
+            with open_sink(output_dir, output_format, append=append) as owned:
+                return self.batch_convert(
+                    input_dir, output_dir, recursive, sink=owned, workers=workers,
+                    threads=threads, work_queue=work_queue, worker_id=worker_id,
+                    resume=resume, journal=journal, schedule=schedule, dedup=dedup,
+                    archives=archives,
+                )
+        if schedule is None and (workers != 1 or threads or work_queue is not None):
+            from .scheduler import Scheduler
+
+            schedule = Scheduler()
+        if work_queue is not None:
+            if resume or journal is not None:
+                raise ValueError("A work queue records progress itself; drop resume/journal")
+            if dedup is not None:
+                raise ValueError("Deduplication is per process and cannot span a work queue")
+            return self._batch_from_queue(
+                sink, input_dir, recursive, workers, work_queue, worker_id, schedule, threads,
+                warn_archives=archives is not False and archives is not None,
+            )
+        if archives is True:
+            from .archives import ArchiveReader
+
+            archives = ArchiveReader()
+        elif archives is False:
+            archives = None
+        if journal is None and not resume:
+            return self._batch_into(
+                sink, input_dir, recursive, workers,
+                schedule=schedule, dedup=dedup, archives=archives, threads=threads,
+            )
+
+        from .checkpoint import CheckpointJournal, default_journal_path
+
+        if not sink.durable:
+            raise ValueError(
+                f"{type(sink).__name__} only persists documents on close; "
+                "checkpointing needs md output, or jsonl with resume=True"
+            )
+        path = journal if journal is not None else default_journal_path(output_dir)
+        # A record appended after the journal's last flush would be appended
+        # again on resume, so journal such sinks' files one by one.
+        flush_interval = 0.0 if sink.appends else 1.0
+        with CheckpointJournal(path, resume=resume, flush_interval=flush_interval) as checkpoint:
+            return self._batch_into(
+                sink, input_dir, recursive, workers,
+                checkpoint, schedule, dedup, archives, threads,
+            )
+
+    def supported_formats(self) -> list[str]:
+        """Return sorted list of supported file extensions."""
+        return FileDetector.supported_extensions()
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _resolve_parser(
+        self,
+        input_path: Optional[str | Path],
+        stream: Optional[BinaryIO] = None,
+    ) -> tuple[Path, str, BaseParser]:
+        """Return the (document path or name, parser key, parser) to use."""
+        if stream is None:
+            input_path = Path(input_path)
+            if not input_path.exists():
+                raise FileNotFoundError(f"File not found: {input_path}")
+            parser_key = FileDetector.detect(input_path)
+        else:
+            input_path = Path(input_path or "document")
+            parser_key = FileDetector.detect(input_path) or FileDetector.sniff(stream)
+            if parser_key is not None and not input_path.suffix:
+                input_path = input_path.with_suffix(SNIFFED_EXTENSIONS[parser_key])
+
+        if parser_key is None:
+            raise ValueError(
+                f"Unsupported file type: {input_path.suffix!r}. "
+                f"Supported: {', '.join(FileDetector.supported_extensions())}"
+            )
+        return input_path, parser_key, self.parsers[parser_key]
+
+    def _source_digest(self, input_path: Path, stream: Optional[BinaryIO]) -> Optional[str]:
+        """Digest of the input bytes in deterministic mode, else ``None``."""
+        if not self.deterministic:
+            return None
+        if stream is not None:
+            return stream_digest(stream)
+        return file_digest(input_path)
+
+    def _make_record(
+        self,
+        input_path: Path,
+        parser_key: str,
+        parser: BaseParser,
+        raw_md: str,
+        stats: Optional[dict[str, int]] = None,
+        source_digest: Optional[str] = None,
+        **extra,
+    ) -> dict:
+        fields = parser.metadata_fields(raw_md, input_path, **extra)
+        if self.deterministic:
+            fields.pop("Converted", None)
+            fields["Source digest"] = source_digest
+        md = parser.format_metadata(fields) + raw_md
+        md = MarkdownFormatter.strip_excessive_newlines(md)
+        if self.deterministic:
+            # The digest covers the document as it would be without its own
+            # line, which is appended last to the header.
+            fields["Digest"] = text_digest(md)
+            md = MarkdownFormatter.strip_excessive_newlines(
+                parser.format_metadata(fields) + raw_md
+            )
+
+        return {
+            "source": str(input_path),
+            "parser": parser_key,
+            "metadata": fields,
+            "markdown": md,
+            "stats": stats or {},
+        }
+
+    @staticmethod
+    def _scan(input_dir: Path, recursive: bool, archives: bool = False) -> Iterator[Path]:
+        """Supported files (and archives, if asked) under *input_dir*, sorted."""
+        from .archives import is_archive
 
         pattern = "**/*" if recursive else "*"
         for file_path in sorted(input_dir.glob(pattern)):
-            if not file_path.is_file():
-                continue
-            if FileDetector.detect(file_path) is None:
-                continue
+            if file_path.is_file() and (
+                FileDetector.detect(file_path) is not None
+                or (archives and is_archive(file_path))
+            ):
+                yield file_path
 
-            relative = file_path.relative_to(input_dir)
-            dest = output_dir / relative.with_suffix(".md")
+    @staticmethod
+    def _skip_archives(files: Iterator[Path]) -> Iterator[Path]:
+        """*files* without archives, each skipped one logged as a warning."""
+        from .archives import is_archive
+
+        for file_path in files:
+            if is_archive(file_path):
+                logger.warning(
+                    "Skipping archive %s: archives are not expanded in work-queue runs",
+                    file_path,
+                )
+            else:
+                yield file_path
+
+    @staticmethod
+    def _write_record(sink: OutputSink, relative: Path, record: dict) -> str:
+        return sink.write(
+            relative.with_suffix(".md"),
+            record["markdown"],
+            source=record["source"],
+            parser=record["parser"],
+            metadata=record["metadata"],
+        )
+
+    def _executor(self, workers: int, threads: int) -> "ConversionExecutor":
+        from .executor import ConversionExecutor
+
+        return ConversionExecutor(
+            workers,
+            self.parser_options,
+            converter=self,
+            deterministic=self.deterministic,
+            threads=threads,
+        )
 
+    def _batch_into(
+        self,
+        sink: OutputSink,
+        input_dir: Path,
+        recursive: bool,
+        workers: int = 1,
+        checkpoint: Optional["CheckpointJournal"] = None,
+        schedule: Optional["Scheduler"] = None,
+        dedup: Optional["Deduplicator"] = None,
+        archives: Optional["ArchiveReader"] = None,
+        threads: int = 0,
+    ) -> dict[str, str | Exception]:
+        results: dict[str, str | Exception] = {}
+        files = self._scan(input_dir, recursive, archives is not None)
+        if schedule is not None:
+            files = iter(schedule.order(files, input_dir))
+        if archives is not None:
+            files = self._expand_archives(files, archives, results)
+        if checkpoint is not None and checkpoint.completed:
+            files = self._skip_completed(files, input_dir, checkpoint.completed, results)
+        aliases: dict[Path, Path] = {}
+        if dedup is not None:
+            from .dedup import Duplicate
+
+            files = self._skip_duplicates(files, dedup, aliases)
+        executor = self._executor(workers, threads)
+        for file_path, record in executor.map_records(files, ordered=schedule is None):
+            relative = file_path.relative_to(input_dir)
             try:
-                self.convert(file_path, dest)
-                results[str(file_path)] = str(dest)
+                if isinstance(record, Exception):
+                    raise record
+                results[str(file_path)] = self._write_record(sink, relative, record)
+                if not executor.in_process:  # counted in the worker's converter
+                    self.stats.update(record["stats"])
+                if dedup is not None:
+                    # Compare bodies only; headers differ in name and time.
+                    body = record["markdown"].split("\n---\n", 1)[-1]
+                    match = dedup.check_text(file_path, body)
+                    if match is not None:
+                        results[str(file_path)] = Duplicate(results[str(file_path)], *match)
             except Exception as exc:
                 logger.error("Failed to convert %s: %s", file_path, exc)
                 results[str(file_path)] = exc
+            if checkpoint is not None:
+                checkpoint.record(relative, results[str(file_path)])
+
+        # Copies are settled once their originals have been written.
+        for file_path, original in aliases.items():
+            relative = file_path.relative_to(input_dir)
+            outcome = results[str(original)]
+            if isinstance(outcome, str):
+                try:
+                    outcome = Duplicate(sink.alias(relative.with_suffix(".md"), outcome), original)
+                except Exception as exc:
+                    logger.error("Failed to alias %s: %s", file_path, exc)
+                    outcome = exc
+            results[str(file_path)] = outcome
+            if checkpoint is not None:
+                checkpoint.record(relative, outcome)
 
         return results
 
-    def supported_formats(self) -> list[str]:
-        """Return sorted list of supported file extensions."""
-        return FileDetector.supported_extensions()
+    @staticmethod
+    def _expand_archives(
+        files: Iterator[Path],
+        reader: "ArchiveReader",
+        results: dict[str, str | Exception],
+    ) -> Iterator["Path | ArchiveMember"]:
+        """Yield files, with each archive replaced by its supported members.
 
-    # ------------------------------------------------------------------
-    # Internal
-    # ------------------------------------------------------------------
+        An archive that fails to read is recorded in *results*; members
+        read before the failure are still converted.
+        """
+        from .archives import is_archive
+
+        for file_path in files:
+            if not is_archive(file_path):
+                yield file_path
+                continue
+            try:
+                yield from reader.members(file_path)
+            except Exception as exc:
+                logger.error("Failed to read archive %s: %s", file_path, exc)
+                results[str(file_path)] = exc
 
     @staticmethod
-    def _register_parsers() -> dict[str, BaseParser]:
-        return {
-            "pdf": PDFParser(),
-            "docx": DOCXParser(),
-            "html": HTMLParser(),
-            "csv": CSVParser(),
-            "json": JSONParser(),
-            "code": CodeParser(),
-            "text": TextParser(),
-            "markdown": MarkdownPassthrough(),
+    def _skip_completed(
+        files: Iterator["Path | ArchiveMember"],
+        input_dir: Path,
+        completed: dict[str, str | Exception],
+        results: dict[str, str | Exception],
+    ) -> Iterator["Path | ArchiveMember"]:
+        """Yield the files not in *completed*, copying the others' outcomes."""
+        from .archives import item_path
+
+        for item in files:
+            file_path = item_path(item)
+            outcome = completed.get(file_path.relative_to(input_dir).as_posix())
+            if outcome is None:
+                yield item
+            else:
+                results[str(file_path)] = outcome
+
+    @staticmethod
+    def _skip_duplicates(
+        files: Iterator["Path | ArchiveMember"],
+        dedup: "Deduplicator",
+        aliases: dict[Path, Path],
+    ) -> Iterator["Path | ArchiveMember"]:
+        """Yield the files whose bytes are new, collecting copies in *aliases*."""
+        from .archives import ArchiveMember
+
+        for item in files:
+            if isinstance(item, ArchiveMember):
+                file_path, data = item
+            else:
+                file_path, data = item, None
+            try:
+                original = dedup.check_file(file_path, data)
+            except OSError:  # let the conversion report it
+                original = None
+            if original is None:
+                yield item
+            else:
+                logger.info("Skipping %s: same content as %s", file_path, original)
+                aliases[file_path] = original
+
+    def _batch_from_queue(
+        self,
+        sink: OutputSink,
+        input_dir: Path,
+        recursive: bool,
+        workers: int,
+        queue: "WorkQueue",
+        worker_id: Optional[str],
+        schedule: Optional["Scheduler"] = None,
+        threads: int = 0,
+        warn_archives: bool = False,
+    ) -> dict[str, str | Exception]:
+        from .work_queue import LeaseKeeper, default_worker_id
+
+        worker_id = worker_id or default_worker_id()
+        files = self._scan(input_dir, recursive, warn_archives)
+        if warn_archives:
+            files = self._skip_archives(files)
+        if schedule is not None:
+            files = schedule.order(files, input_dir)
+        # Items are claimed in enqueue order.
+        added = queue.enqueue(p.relative_to(input_dir) for p in files)
+        logger.info("Enqueued %d new file(s) in %s", added, queue.path)
+
+        executor = self._executor(workers, threads)
+        poll = min(queue.lease_seconds / 2, 5.0)
+        results: dict[str, str | Exception] = {}
+
+        def claims(keeper: LeaseKeeper) -> Iterator[Path]:
+            while True:
+                claimed = queue.claim(worker_id, executor.concurrency)
+                if not claimed:
+                    return
+                keeper.hold(claimed)
+                for relative in claimed:
+                    yield input_dir / relative
+
+        with LeaseKeeper(queue, worker_id) as keeper:
+            while True:
+                for file_path, record in executor.map_records(claims(keeper), ordered=False):
+                    relative = file_path.relative_to(input_dir).as_posix()
+                    try:
+                        if isinstance(record, Exception):
+                            raise record
+                        location = self._write_record(sink, Path(relative), record)
+                        queue.complete(worker_id, relative, location)
+                        if not executor.in_process:
+                            self.stats.update(record["stats"])
+                        results[str(file_path)] = location
+                    except Exception as exc:
+                        logger.error("Failed to convert %s: %s", file_path, exc)
+                        queue.fail(worker_id, relative, f"{type(exc).__name__}: {exc}")
+                        results[str(file_path)] = exc
+                    keeper.release(relative)
+
+                # Nothing claimable; wait out other workers' leases in case
+                # they fail or their node dies, then try again.
+                if not queue.leased_by_others(worker_id):
+                    break
+                time.sleep(poll)
+
+        return results
+
+    @staticmethod
+    def _register_parsers(
+        options: Optional[dict[str, dict]] = None,
+    ) -> dict[str, BaseParser]:
+        classes: dict[str, type[BaseParser]] = {
+            "pdf": PDFParser,
+            "docx": DOCXParser,
+            "html": HTMLParser,
+            "csv": CSVParser,
+            "json": JSONParser,
+            "code": CodeParser,
+            "text": TextParser,
+            "markdown": MarkdownPassthrough,
         }
+        options = options or {}
+        unknown = sorted(set(options) - set(classes))
+        if unknown:
+            raise ValueError(
+                f"Unknown parser key(s) in options: {', '.join(unknown)}. "
+                f"Supported: {', '.join(classes)}"
+            )
+        return {key: cls(**options.get(key, {})) for key, cls in classes.items()}
+
+
+def _as_stream(data) -> Optional[BinaryIO]:
+    """Wrap bytes-like data, and buffer non-seekable streams, as seekable streams."""
+    if data is None:
+        return None
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return io.BytesIO(data)
+    if not data.seekable():
+        return io.BytesIO(data.read())
+    return data
@@ -0,0 +1,210 @@
+"""Exact and near-duplicate detection across a batch.
+
+Shares often hold the same document under several paths, plus revisions
+that differ in a few words.  :class:`Deduplicator` catches both:
+
+- exact duplicates by a streaming BLAKE2b digest of the input bytes, taken
+  before anything is parsed, so a copy is never converted twice;
+- near duplicates by MinHash signatures over word shingles of the
+  converted text, looked up in an in-memory LSH index (the signature cut
+  into bands), so a document is only compared with the few earlier ones
+  that share a band with it.  Signatures use one-permutation hashing: each
+  shingle hash is binned once, instead of being permuted once per
+  signature slot, so a 5,000-word document costs a few milliseconds.
+
+Findings are kept on the instance and can be written out with
+:meth:`Deduplicator.write_report` for the ingest side, which can then skip
+embedding the redundant documents.  A batch also marks them in its results
+as :class:`Duplicate` locations.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+from .utils.digest import file_digest
+from .utils.output_sink import Unchanged, atomic_write_text
+
+_WORD = re.compile(r"\w+")
+
+
+def default_report_path(output: str | Path) -> Path:
+    """Duplicate report for a batch writing to *output*: ``<output>.duplicates.json``."""
+    output = Path(output)
+    return output.with_name(output.name + ".duplicates.json")
+
+
+def shingle_hashes(text: str, size: int = 5) -> set[int]:
+    """64-bit hashes of the case-folded word *size*-grams of *text*."""
+    words = _WORD.findall(text.lower())
+    grams = [" ".join(words[i : i + size]) for i in range(max(len(words) - size + 1, 1))]
+    return {
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little")
+        for g in grams
+        if g
+    }
+
+
+def minhash(hashes: set[int], num_perm: int) -> tuple[int, ...]:
+    """One-permutation MinHash signature of *hashes* with *num_perm* slots.
+
+    Each hash falls into slot ``h % num_perm`` and a slot keeps its
+    smallest ``h // num_perm``.  Empty slots (short texts) borrow the value
+    of the next filled slot, so equal sets still give equal signatures.
+    """
+    empty = 1 << 64
+    slots = [empty] * num_perm
+    for h in hashes:
+        value, slot = divmod(h, num_perm)
+        if value < slots[slot]:
+            slots[slot] = value
+    filled = [i for i, v in enumerate(slots) if v != empty]
+    if filled and len(filled) < num_perm:
+        for i in range(num_perm):
+            if slots[i] == empty:
+                nxt = next((j for j in filled if j > i), filled[0])
+                slots[i] = slots[nxt] + (nxt - i) % num_perm * empty
+    return tuple(slots)
+
+
+class Duplicate(str):
+    """Batch result location of a document that duplicates an earlier one.
+
+    A ``str`` like any other success, with :attr:`original` (the earlier
+    file) and :attr:`similarity` (``1.0`` for an exact copy).  A duplicate
+    whose output was left as it was is also :class:`Unchanged`.
+    """
+
+    original: Path
+    similarity: float
+
+    def __new__(cls, location: str, original: Path, similarity: float = 1.0) -> "Duplicate":
+        if isinstance(location, Unchanged):
+            cls = _UnchangedDuplicate
+        self = super().__new__(cls, location)
+        self.original = original
+        self.similarity = similarity
+        return self
+
+
+class _UnchangedDuplicate(Duplicate, Unchanged):
+    pass
+
+
+class Deduplicator:
+    """Find exact and near-duplicate documents in one batch run.
+
+    Args:
+        mode: ``"exact"`` compares input bytes only; ``"near"`` also
+              compares converted text.
+        threshold: Estimated Jaccard similarity of the word shingles at
+                   or above which a document is a near duplicate.
+        num_perm: MinHash signature length.
+        bands: LSH bands the signature is cut into; must divide
+               *num_perm*.  More bands find pairs at lower similarity at
+               the cost of more comparisons (16 bands of 4 catch pairs at
+               0.8 with probability above 0.999).
+        shingle: Words per shingle.
+    """
+
+    MODES = ("exact", "near")
+
+    def __init__(
+        self,
+        mode: str = "near",
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle: int = 5,
+    ) -> None:
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Unknown dedup mode: {mode!r}. Supported: {', '.join(self.MODES)}"
+            )
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.mode = mode
+        self.threshold = threshold
+        self.shingle = shingle
+        self.num_perm = num_perm
+        self._rows = num_perm // bands
+        self._digests: dict[str, Path] = {}
+        self._buckets: list[dict[tuple[int, ...], list[Path]]] = [{} for _ in range(bands)]
+        self._signatures: dict[Path, tuple[int, ...]] = {}
+        #: Exact duplicates: path -> the earlier path with the same bytes.
+        self.exact: dict[Path, Path] = {}
+        #: Near duplicates: path -> (most similar earlier path, similarity).
+        self.near: dict[Path, tuple[Path, float]] = {}
+
+    def check_file(self, path: Path, data: Optional[bytes] = None) -> Optional[Path]:
+        """Return the earlier file with the same bytes as *path*, if any.
+
+        *data* is the file's content when it is not on disk (an archive
+        member).
+        """
+        if data is None:
+            digest = file_digest(path)
+        else:
+            digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        original = self._digests.setdefault(digest, path)
+        if original == path:
+            return None
+        self.exact[path] = original
+        return original
+
+    def check_text(self, path: Path, text: str) -> Optional[tuple[Path, float]]:
+        """Index *path*'s converted text; return its closest earlier near duplicate.
+
+        Returns ``(path, similarity)`` when the best match reaches
+        :attr:`threshold`, else ``None`` (always ``None`` in ``"exact"``
+        mode).
+        """
+        if self.mode != "near":
+            return None
+        hashes = shingle_hashes(text, self.shingle)
+        if not hashes:
+            return None
+        signature = minhash(hashes, self.num_perm)
+
+        candidates: set[Path] = set()
+        for band, buckets in enumerate(self._buckets):
+            key = signature[band * self._rows : (band + 1) * self._rows]
+            bucket = buckets.setdefault(key, [])
+            candidates.update(bucket)
+            bucket.append(path)
+        self._signatures[path] = signature
+
+        best = max(
+            ((self._similarity(signature, self._signatures[c]), c) for c in candidates),
+            default=None,
+        )
+        if best is None or best[0] < self.threshold:
+            return None
+        self.near[path] = (best[1], best[0])
+        return best[1], best[0]
+
+    def report(self, root: Optional[Path] = None) -> dict[str, list[dict]]:
+        """Findings as JSON-ready lists, with paths relative to *root* if given."""
+
+        def name(path: Path) -> str:
+            return (path.relative_to(root) if root is not None else path).as_posix()
+
+        return {
+            "exact": [
+                {"path": name(p), "duplicate_of": name(o)} for p, o in self.exact.items()
+            ],
+            "near": [
+                {"path": name(p), "duplicate_of": name(o), "similarity": round(s, 3)}
+                for p, (o, s) in self.near.items()
+            ],
+        }
+
+    def write_report(self, path: str | Path, root: Optional[Path] = None) -> None:
+        """Write :meth:`report` as JSON to *path*."""
+        atomic_write_text(Path(path), json.dumps(self.report(root), indent=2) + "\n")
+
+    @staticmethod
+    def _similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+        return sum(x == y for x, y in zip(a, b)) / len(a)
@@ -0,0 +1,213 @@
+"""Parallel conversion across a pool of warm worker processes.
+
+:class:`ConversionExecutor` feeds any iterable of paths to a
+``ProcessPoolExecutor`` whose workers each build one
+:class:`~src.converter.UniversalMarkdownConverter` at start-up, so parser
+imports and the registry are paid once per worker rather than per file.
+The number of submitted-but-unconsumed jobs is bounded, which keeps memory
+flat when the input is a long generator (e.g. 200k paths read from a
+pipe), and results come back in input order.  Archive members
+(:class:`~src.archives.ArchiveMember`) may be mixed in with the paths; they
+are converted from their bytes.
+
+With ``threads`` set, files whose parser is cheap and mostly waiting on
+I/O (:data:`THREAD_KEYS`: plain text, code, Markdown) are converted by a
+thread pool in the calling process instead, so thousands of small files do
+not each pay for pickling and a round trip to a worker process.  The rest
+still goes to the process pool.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from .archives import ArchiveMember, item_path
+from .converter import UniversalMarkdownConverter
+from .utils.file_detector import FileDetector
+
+#: Parser keys converted in threads when an executor has ``threads``.
+#: PDF and DOCX parsing is CPU-bound (and PyMuPDF is not thread-safe), so
+#: those stay in processes.
+THREAD_KEYS: tuple[str, ...] = ("text", "code", "markdown")
+
+# Converter owned by the current worker process (set by ``_init_worker``).
+_worker_converter: Optional[UniversalMarkdownConverter] = None
+
+
+def _init_worker(parser_options: Optional[dict[str, dict]], deterministic: bool) -> None:
+    global _worker_converter
+    _worker_converter = UniversalMarkdownConverter(parser_options, deterministic)
+
+
+def _convert_job(item: Path | ArchiveMember, chunks: bool) -> dict | list[dict]:
+    return _run(_worker_converter, item, chunks)
+
+
+def _call_in_worker(fn: Callable[..., object], *args) -> object:
+    """Run ``fn(converter, *args)`` with the worker process's converter."""
+    return fn(_worker_converter, *args)
+
+
+def _run(
+    converter: UniversalMarkdownConverter, item: Path | ArchiveMember, chunks: bool
+) -> dict | list[dict]:
+    path, data = (item.path, item.data) if isinstance(item, ArchiveMember) else (item, None)
+    if chunks:
+        return list(converter.convert_chunks(path, data))
+    return converter.convert_record(path, data)
+
+
+class ConversionExecutor:
+    """Convert many files in parallel, yielding results in input order.
+
+    Args:
+        workers: Worker processes; ``None`` means one per CPU.  With ``1``
+                 everything runs in the calling process.
+        parser_options: Passed to each worker's converter.
+        max_pending: Jobs submitted ahead of the consumer (default: four
+                     per worker).
+        converter: Converter to use when running in-process (``workers=1``
+                   and no *threads*); a new one is built if omitted.
+        deterministic: Build the workers' converters in deterministic mode
+                       (see :class:`~src.converter.UniversalMarkdownConverter`).
+        threads: Threads converting the files whose parser key is in
+                 *thread_keys*; ``0`` sends everything to the processes.
+                 The threads share one converter.  With threads, even
+                 ``workers=1`` starts a worker process, for the other files.
+        thread_keys: Parser keys routed to the threads.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        parser_options: Optional[dict[str, dict]] = None,
+        max_pending: Optional[int] = None,
+        converter: Optional[UniversalMarkdownConverter] = None,
+        deterministic: bool = False,
+        threads: int = 0,
+        thread_keys: Iterable[str] = THREAD_KEYS,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1")
+        if threads < 0:
+            raise ValueError("threads must not be negative")
+        self.threads = threads
+        self.thread_keys = frozenset(thread_keys)
+        self.parser_options = parser_options
+        self.max_pending = max_pending or (self.workers + self.threads) * 4
+        self._converter = converter
+        self.deterministic = deterministic
+
+    @property
+    def in_process(self) -> bool:
+        """Whether files are converted one by one with the caller's converter."""
+        return self.workers == 1 and not self.threads
+
+    @property
+    def concurrency(self) -> int:
+        """Number of files converted at the same time."""
+        return self.workers + self.threads
+
+    def map_records(
+        self,
+        paths: Iterable[str | Path | ArchiveMember],
+        chunks: bool = False,
+        ordered: bool = True,
+    ) -> Iterator[tuple[Path, dict | list[dict] | Exception]]:
+        """Convert each path, yielding ``(path, result)`` pairs.
+
+        *result* is the record from
+        :meth:`~src.converter.UniversalMarkdownConverter.convert_record`
+        (or the list of chunk records when *chunks* is true), or the
+        exception raised while converting that file.
+
+        With ``ordered=False`` results are yielded as they complete, so one
+        slow file does not hold back the pending window behind it.
+        """
+        if self.in_process:
+            converter = self._converter or UniversalMarkdownConverter(
+                self.parser_options, self.deterministic
+            )
+            for item in map(_job, paths):
+                try:
+                    yield item_path(item), _run(converter, item, chunks)
+                except Exception as exc:
+                    yield item_path(item), exc
+            return
+
+        with ExitStack() as stack:
+            submit = self._open_pools(stack, chunks)
+            if not ordered:
+                yield from self._as_completed(submit, paths)
+                return
+            pending: deque[tuple[Path, Future]] = deque()
+            for item in map(_job, paths):
+                pending.append((item_path(item), submit(item)))
+                if len(pending) >= self.max_pending:
+                    yield _collect(*pending.popleft())
+            while pending:
+                yield _collect(*pending.popleft())
+
+    def _open_pools(
+        self, stack: ExitStack, chunks: bool
+    ) -> Callable[[Path | ArchiveMember], Future]:
+        """Start the pools on *stack*; return a function submitting one item."""
+        # Worker processes are only spawned once jobs are submitted to them.
+        processes = stack.enter_context(
+            ProcessPoolExecutor(
+                self.workers,
+                initializer=_init_worker,
+                initargs=(self.parser_options, self.deterministic),
+            )
+        )
+        if not self.threads:
+            return lambda item: processes.submit(_convert_job, item, chunks)
+
+        converter = UniversalMarkdownConverter(self.parser_options, self.deterministic)
+        threads = stack.enter_context(
+            ThreadPoolExecutor(self.threads, thread_name_prefix="converter")
+        )
+
+        def submit(item: Path | ArchiveMember) -> Future:
+            if FileDetector.detect(item_path(item)) in self.thread_keys:
+                return threads.submit(_run, converter, item, chunks)
+            return processes.submit(_convert_job, item, chunks)
+
+        return submit
+
+    def _as_completed(
+        self,
+        submit: Callable[[Path | ArchiveMember], Future],
+        paths: Iterable[str | Path | ArchiveMember],
+    ) -> Iterator[tuple[Path, dict | list[dict] | Exception]]:
+        running: dict[Future, Path] = {}
+        for item in map(_job, paths):
+            running[submit(item)] = item_path(item)
+            if len(running) >= self.max_pending:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield _collect(running.pop(future), future)
+        for future in as_completed(running):
+            yield _collect(running[future], future)
+
+
+def _job(item: str | Path | ArchiveMember) -> Path | ArchiveMember:
+    return item if isinstance(item, ArchiveMember) else Path(item)
+
+
+def _collect(path: Path, future: Future) -> tuple[Path, dict | list[dict] | Exception]:
+    try:
+        return path, future.result()
+    except Exception as exc:
+        return path, exc
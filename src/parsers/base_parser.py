@@ -1,24 +1,59 @@
 """Abstract base class for all file parsers."""
 
+import io
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, TextIO
 
 
 class BaseParser(ABC):
-    """Base class that every format-specific parser must inherit from."""
+    """Base class that every format-specific parser must inherit from.
+
+    Parsers read either from *file_path* or, when *stream* is given, from a
+    seekable binary stream; *file_path* then only names the document (for
+    titles, metadata and language hints) and is never opened.  Subclasses
+    read their input through :meth:`_open_binary` / :meth:`_open_text` /
+    :meth:`_read_text` so both cases share one code path.
+    """
 
     @abstractmethod
-    def parse(self, file_path: Path) -> str:
+    def parse(self, file_path: Path, stream: Optional[BinaryIO] = None) -> str:
         """Convert a file to Markdown content (without metadata header).
 
         Args:
-            file_path: Path to the source file.
+            file_path: Path to the source file, or its name when *stream*
+                       is given.
+            stream: Seekable binary stream holding the document; read from
+                    the start.
 
         Returns:
             Markdown-formatted string of the file's content.
         """
 
+    def parse_with_stats(
+        self, file_path: Path, stream: Optional[BinaryIO] = None
+    ) -> tuple[str, dict[str, int]]:
+        """Like :meth:`parse`, also returning counters about the work done.
+
+        Parsers that measure something worth reporting (e.g. bytes of PDF
+        boilerplate removed) override this; the default reports nothing.
+        """
+        return self.parse(file_path, stream), {}
+
+    def parse_with_metadata(
+        self, file_path: Path, stream: Optional[BinaryIO] = None
+    ) -> tuple[str, dict[str, int], dict[str, object]]:
+        """Like :meth:`parse_with_stats`, also returning metadata found while parsing.
+
+        The metadata (e.g. a PDF's page count) belongs to this document
+        only; pass it to :meth:`metadata_fields` as *extra*.  The default
+        reports none.
+        """
+        content, stats = self.parse_with_stats(file_path, stream)
+        return content, stats, {}
+
     def add_metadata(self, content: str, file_path: Path, **extra) -> str:
         """Wrap parsed content with a metadata header for RAG ingestion.
 
@@ -30,30 +65,83 @@ class BaseParser(ABC):
         Returns:
             Complete Markdown document with metadata block.
         """
-        title = self._derive_title(file_path, content)
-        file_type = self._file_type_label()
-        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        fields = self.metadata_fields(content, file_path, **extra)
+        return self.format_metadata(fields) + content
 
-        header_lines = [
-            f"# {title}",
-            "",
-            f"*Source: {file_path.name}*  ",
-            f"*Type: {file_type}*  ",
-            f"*Converted: {now}*  ",
-        ]
-        for key, value in extra.items():
+    @staticmethod
+    def format_metadata(fields: dict[str, str]) -> str:
+        """Render a ``metadata_fields`` dict as the Markdown header block."""
+        fields = dict(fields)
+        header_lines = [f"# {fields.pop('Title')}", ""]
+        for key, value in fields.items():
             header_lines.append(f"*{key}: {value}*  ")
 
         header_lines.append("")
         header_lines.append("---")
         header_lines.append("")
 
-        return "\n".join(header_lines) + content
+        return "\n".join(header_lines)
+
+    def metadata_fields(self, content: str, file_path: Path, **extra) -> dict[str, str]:
+        """Return the metadata written by ``add_metadata`` as an ordered dict.
+
+        The ``Title`` entry comes first, followed by ``Source``, ``Type``,
+        ``Converted`` and any *extra* pairs.  Record-oriented sinks store
+        these fields alongside the Markdown.  Subclasses add format-specific
+        entries by overriding this method.
+        """
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        fields = {
+            "Title": self._derive_title(file_path, content),
+            "Source": file_path.name,
+            "Type": self._file_type_label(),
+            "Converted": now,
+        }
+        for key, value in extra.items():
+            fields[key] = str(value)
+        return fields
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    @contextmanager
+    def _open_binary(file_path: Path, stream: Optional[BinaryIO] = None) -> Iterator[BinaryIO]:
+        """Open the document for binary reading; *stream* is rewound, not closed."""
+        if stream is None:
+            with open(file_path, "rb") as fh:
+                yield fh
+        else:
+            stream.seek(0)
+            yield stream
+
+    @staticmethod
+    @contextmanager
+    def _open_text(
+        file_path: Path,
+        stream: Optional[BinaryIO] = None,
+        encoding: str = "utf-8",
+        errors: str = "replace",
+        newline: Optional[str] = None,
+    ) -> Iterator[TextIO]:
+        """Open the document as text, decoding *stream* the way ``open`` would."""
+        if stream is None:
+            with open(file_path, encoding=encoding, errors=errors, newline=newline) as fh:
+                yield fh
+            return
+        stream.seek(0)
+        wrapper = io.TextIOWrapper(stream, encoding=encoding, errors=errors, newline=newline)
+        try:
+            yield wrapper
+        finally:
+            wrapper.detach()  # leave the caller's stream open
+
+    def _read_text(self, file_path: Path, stream: Optional[BinaryIO] = None) -> str:
+        """Return the whole document decoded as UTF-8 (undecodable bytes replaced)."""
+        with self._open_text(file_path, stream) as fh:
+            return fh.read()
+
     def _derive_title(self, file_path: Path, content: str) -> str:
         """Try to extract a title from the content; fall back to file stem."""
         for line in content.splitlines():
@@ -1,25 +1,206 @@
 """Code file → Markdown parser."""
 
+import ast
+import re
 from pathlib import Path
+from typing import BinaryIO, NamedTuple, Optional
 
 from .base_parser import BaseParser
 from ..utils.file_detector import FileDetector
 from ..utils.markdown_formatter import MarkdownFormatter
 
 
+class Symbol(NamedTuple):
+    """A named span of source lines (1-based, inclusive)."""
+
+    name: str
+    start: int
+    end: int
+
+
+# Top-level definitions in brace- and keyword-delimited languages, matched
+# against unindented lines; group 1 is the name.
+_DEFINITIONS = (
+    re.compile(
+        r"(?:export\s+(?:default\s+)?)?(?:pub(?:\([^)]*\))?\s+)?"
+        r"(?:(?:public|private|protected|internal|static|final|abstract|sealed|"
+        r"async|unsafe|extern|inline|virtual|override|partial|data|open)\s+)*"
+        r"(?:function\*?|class|interface|enum|struct|union|trait|impl(?:<[^>]*>)?|"
+        r"fn|func|def|module|namespace|object|record|protocol|type)\s+"
+        r"(?:\([^)]*\)\s*)?"  # Go method receiver
+        r"([A-Za-z_$][\w$]*)"
+    ),
+    re.compile(
+        r"(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s+)?"
+        r"(?:function\b|\([^)]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)"
+    ),
+    # C-family function definitions: return type, name, parameters, no ';'.
+    re.compile(
+        r"(?!(?:if|for|while|switch|return|else|do|case|typedef)\b)"
+        r"[A-Za-z_][\w\s*&:<>,]*?[\s*&]([A-Za-z_][\w:~]*)\s*\([^;]*$"
+    ),
+)
+
+_COMMENT_PREFIXES = ("#", "//", "/*", "*", "@", "--")
+
+# Data and markup languages have no definitions to split on.
+_UNSEGMENTED = {"yaml", "toml", "ini", "xml", "css", "scss", "less", "sql"}
+
+MODULE = "<module>"
+
+
+def _with_leading_comments(lines: list[str], start: int, prefixes: tuple[str, ...]) -> int:
+    """Move *start* up over the comment and decorator lines directly above it."""
+    while start > 1 and lines[start - 2].strip().startswith(prefixes):
+        start -= 1
+    return start
+
+
+def python_symbols(code: str, split_lines: int) -> Optional[list[Symbol]]:
+    """Top-level functions and classes of Python *code*, from its AST.
+
+    Classes longer than *split_lines* lines are split into the class
+    header and one symbol per method (``Class.method``).  Returns ``None``
+    if *code* does not parse.
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    lines = code.split("\n")
+    symbols = []
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        start = _with_leading_comments(lines, _first_line(node), ("#",))
+        methods = [
+            n for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ] if isinstance(node, ast.ClassDef) else []
+        if not methods or node.end_lineno - start + 1 <= split_lines:
+            symbols.append(Symbol(node.name, start, node.end_lineno))
+            continue
+        # Each method runs to the next one, so the class has no gaps.
+        starts = [_with_leading_comments(lines, _first_line(m), ("#",)) for m in methods]
+        if starts[0] > start:
+            symbols.append(Symbol(node.name, start, starts[0] - 1))
+        ends = [s - 1 for s in starts[1:]] + [node.end_lineno]
+        for method, first, last in zip(methods, starts, ends):
+            symbols.append(Symbol(f"{node.name}.{method.name}", first, last))
+    return symbols
+
+
+def _first_line(node: ast.AST) -> int:
+    return min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", ())])
+
+
+def scan_symbols(code: str) -> list[Symbol]:
+    """Top-level definitions found by :data:`_DEFINITIONS`, each running to the next."""
+    lines = code.split("\n")
+    starts: list[tuple[int, str]] = []
+    for number, line in enumerate(lines, 1):
+        if not line or line[0].isspace():
+            continue
+        for pattern in _DEFINITIONS:
+            match = pattern.match(line)
+            if match:
+                start = _with_leading_comments(lines, number, _COMMENT_PREFIXES)
+                starts.append((start, match[1]))
+                break
+    ends = [start - 1 for start, _ in starts[1:]] + [len(lines)]
+    return [Symbol(name, start, end) for (start, name), end in zip(starts, ends)]
+
+
+def sections(symbols: list[Symbol], lines: list[str]) -> list[Symbol]:
+    """*symbols* plus :data:`MODULE` spans for the code between them.
+
+    Spans are trimmed of blank lines at both ends; empty ones are dropped.
+    """
+    spans: list[Symbol] = []
+    line = 1
+    for symbol in sorted(symbols, key=lambda s: s.start):
+        if symbol.start > line:
+            spans.append(Symbol(MODULE, line, symbol.start - 1))
+        spans.append(symbol)
+        line = max(line, symbol.end + 1)
+    if line <= len(lines):
+        spans.append(Symbol(MODULE, line, len(lines)))
+
+    trimmed = []
+    for name, start, end in spans:
+        while start <= end and not lines[start - 1].strip():
+            start += 1
+        while end >= start and not lines[end - 1].strip():
+            end -= 1
+        if start <= end:
+            trimmed.append(Symbol(name, start, end))
+    return trimmed
+
+
 class CodeParser(BaseParser):
-    """Wrap source-code files in a Markdown fenced code block with syntax hints."""
+    """Wrap source-code files in Markdown fenced code blocks with syntax hints.
 
-    def parse(self, file_path: Path) -> str:
-        code = file_path.read_text(encoding="utf-8", errors="replace")
+    Modes:
+
+    - ``"whole"``: the file in one fenced block.
+    - ``"symbols"``: one ``## name (lines a–b)`` section per top-level
+      function, class or other definition, so retrieval can return a
+      single function.  Python is split from its AST (long classes per
+      method); other languages by a regex scan of unindented definition
+      lines.  Code between definitions becomes ``<module>`` sections.
+      Files with fewer than two definitions stay whole.
+    - ``"auto"`` (default): ``"symbols"`` for files over *max_lines*
+      lines, otherwise ``"whole"``.
+    """
+
+    MODES = ("auto", "whole", "symbols")
+
+    def __init__(self, mode: str = "auto", max_lines: int = 400) -> None:
+        """
+        Args:
+            mode: One of :attr:`MODES`.
+            max_lines: Line count above which ``"auto"`` splits a file, and
+                       a Python class is split into its methods.
+        """
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Unknown code mode: {mode!r}. Supported: {', '.join(self.MODES)}"
+            )
+        self.mode = mode
+        self.max_lines = max_lines
+
+    def parse(self, file_path: Path, stream: Optional[BinaryIO] = None) -> str:
+        code = self._read_text(file_path, stream).rstrip()
         language = FileDetector.language_hint(file_path)
-        return MarkdownFormatter.wrap_code_block(code.rstrip(), language)
+        fence = MarkdownFormatter.code_fence(code)
+        lines = code.split("\n")
+        if (
+            self.mode == "whole"
+            or (self.mode == "auto" and len(lines) <= self.max_lines)
+            or language in _UNSEGMENTED
+        ):
+            return MarkdownFormatter.wrap_code_block(code, language, fence)
+
+        symbols = python_symbols(code, self.max_lines) if language == "python" else None
+        if symbols is None:
+            symbols = scan_symbols(code)
+        if len(symbols) < 2:
+            return MarkdownFormatter.wrap_code_block(code, language, fence)
+
+        parts = []
+        for name, start, end in sections(symbols, lines):
+            block = "\n".join(lines[start - 1 : end])
+            where = f"lines {start}–{end}" if end > start else f"line {start}"
+            parts.append(
+                f"## {name} ({where})\n\n"
+                + MarkdownFormatter.wrap_code_block(block, language, fence)
+            )
+        return "\n\n".join(parts)
 
     def _file_type_label(self) -> str:
         return "Code"
 
-    def add_metadata(self, content: str, file_path: Path, **extra) -> str:
+    def metadata_fields(self, content: str, file_path: Path, **extra) -> dict[str, str]:
         lang = FileDetector.language_hint(file_path)
         if lang:
             extra.setdefault("Language", lang.capitalize())
-        return super().add_metadata(content, file_path, **extra)
+        return super().metadata_fields(content, file_path, **extra)
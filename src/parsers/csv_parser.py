@@ -1,39 +1,76 @@
 """CSV → Markdown parser."""
 
 import csv
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
 
 from .base_parser import BaseParser
+from ..utils.column_stats import TableProfile
 from ..utils.markdown_formatter import MarkdownFormatter
 
 
 class CSVParser(BaseParser):
-    """Convert CSV files to a Markdown table."""
+    """Convert CSV files to a Markdown table.
+
+    Modes:
+
+    - ``"table"`` (default): a Markdown table of the first ``MAX_ROWS`` rows
+      plus a truncation note.
+    - ``"summary"``: stream the whole file once and emit a schema section
+      (type, nulls, min / max / mean, top values per column) followed by a
+      uniform sample of ``SAMPLE_ROWS`` rows.
+    - ``"auto"``: ``"table"`` when the file fits in ``MAX_ROWS``, otherwise
+      ``"summary"``.
+    - ``"chunks"``: every row, as consecutive ``## Rows a–b`` sections of
+      *chunk_rows* rows, each repeating the header row so a chunker never
+      splits a table away from its column names.
+
+    Every mode reads the file as a stream; memory is bounded by
+    ``MAX_ROWS`` / ``CHUNK_ROWS`` / *chunk_rows* rather than by the file
+    size.  :meth:`iter_chunks` yields the row blocks one at a time.
+    """
 
     MAX_ROWS = 500  # safety limit for very large CSVs
+    SAMPLE_ROWS = 20  # rows shown in summary mode
+    CHUNK_ROWS = 10_000  # rows per statistics chunk in summary mode
 
-    def parse(self, file_path: Path) -> str:
-        with file_path.open(newline="", encoding="utf-8", errors="replace") as fh:
-            sniffer = csv.Sniffer()
-            sample = fh.read(8192)
-            fh.seek(0)
+    MODES = ("table", "summary", "auto", "chunks")
 
-            try:
-                dialect = sniffer.sniff(sample)
-            except csv.Error:
-                dialect = csv.excel
+    def __init__(self, mode: str = "table", chunk_rows: int = 100) -> None:
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Unknown CSV mode: {mode!r}. Supported: {', '.join(self.MODES)}"
+            )
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+        self.mode = mode
+        self.chunk_rows = chunk_rows
 
-            reader = csv.reader(fh, dialect)
-            rows = list(reader)
+    def parse(self, file_path: Path, stream: Optional[BinaryIO] = None) -> str:
+        if self.mode == "chunks":
+            parts = [chunk["markdown"] for chunk in self.iter_chunks(file_path, stream)]
+            return "\n\n".join(parts) if parts else "*Empty CSV file.*"
 
-        if not rows:
-            return "*Empty CSV file.*"
+        with self._open(file_path, stream) as reader:
+            headers = next(reader, None)
+            if headers is None:
+                return "*Empty CSV file.*"
 
-        headers = rows[0]
-        body = rows[1:]
+            if self.mode == "summary":
+                return self._summarize(headers, [], reader)
+
+            head = list(islice(reader, self.MAX_ROWS + 1))
+            if len(head) <= self.MAX_ROWS:
+                return MarkdownFormatter.make_table(headers, head)
+            if self.mode == "auto":
+                return self._summarize(headers, head, reader)
+
+            total = len(head) + sum(1 for _ in reader)
 
         table, note = MarkdownFormatter.truncate_table(
-            headers, body, max_rows=self.MAX_ROWS
+            headers, head, max_rows=self.MAX_ROWS, total_rows=total
         )
 
         parts = [table]
@@ -41,5 +78,64 @@ class CSVParser(BaseParser):
             parts.append(f"\n{note}")
         return "\n".join(parts)
 
+    def iter_chunks(
+        self, file_path: Path, stream: Optional[BinaryIO] = None
+    ) -> Iterator[dict]:
+        """Stream the CSV as blocks of *chunk_rows* rows.
+
+        Yields:
+            Dicts with ``first_row`` / ``last_row`` (1-based data-row numbers,
+            header excluded) and ``markdown``: a ``## Rows a–b`` heading
+            followed by a table that repeats the header row.  A header-only
+            file yields a single block with an empty row range
+            (``last_row`` is ``first_row - 1``) headed ``## Rows (none)``.
+        """
+        with self._open(file_path, stream) as reader:
+            headers = next(reader, None)
+            if headers is None:
+                return
+
+            first = 1
+            emitted = False
+            while True:
+                block = list(islice(reader, self.chunk_rows))
+                if not block and emitted:
+                    return
+                last = first + len(block) - 1
+                title = f"Rows {first}–{last}" if block else "Rows (none)"
+                yield {
+                    "first_row": first,
+                    "last_row": last,
+                    "markdown": MarkdownFormatter.heading(title, 2)
+                    + "\n\n"
+                    + MarkdownFormatter.make_table(headers, block),
+                }
+                emitted = True
+                if len(block) < self.chunk_rows:
+                    return
+                first = last + 1
+
+    @contextmanager
+    def _open(self, file_path: Path, stream: Optional[BinaryIO] = None) -> Iterator:
+        """Open the document and yield a ``csv.reader`` with a sniffed dialect."""
+        with self._open_text(file_path, stream, newline="") as fh:
+            sniffer = csv.Sniffer()
+            sample = fh.read(8192)
+            fh.seek(0)
+
+            try:
+                dialect = sniffer.sniff(sample)
+            except csv.Error:
+                dialect = csv.excel
+
+            yield csv.reader(fh, dialect)
+
+    def _summarize(self, headers: list[str], head: list[list[str]], rest) -> str:
+        profile = TableProfile(headers, sample_size=self.SAMPLE_ROWS)
+        if head:
+            profile.update(head)
+        profile.consume(rest, chunk_size=self.CHUNK_ROWS)
+        return profile.to_markdown()
+
     def _file_type_label(self) -> str:
         return "CSV"
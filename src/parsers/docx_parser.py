@@ -1,18 +1,63 @@
 """DOCX → Markdown parser."""
 
+import zipfile
 from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
 
 from .base_parser import BaseParser
 from ..utils.markdown_formatter import MarkdownFormatter
 
+# WordprocessingML namespace and the qualified tags the XML engine reads.
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY = f"{_W}body"
+_W_P = f"{_W}p"
+_W_TBL = f"{_W}tbl"
+_W_TR = f"{_W}tr"
+_W_TC = f"{_W}tc"
+_W_R = f"{_W}r"
+_W_HYPERLINK = f"{_W}hyperlink"
+_W_VAL = f"{_W}val"
+
+# Run children that contribute text, mirroring python-docx's ``Run.text``.
+_RUN_TEXT = {
+    f"{_W}t": None,  # element text
+    f"{_W}tab": "\t",
+    f"{_W}ptab": "\t",
+    f"{_W}cr": "\n",
+    f"{_W}noBreakHyphen": "-",
+}
+_W_BR = f"{_W}br"
+_W_DRAWING = f"{_W}drawing"
+_WP_DOCPR = "{http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing}docPr"
+_R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+# Built-in style names stored lower-case in styles.xml (python-docx BabelFish).
+_UI_STYLE_NAMES = {f"heading {i}": f"Heading {i}" for i in range(1, 10)}
+
 
 class DOCXParser(BaseParser):
     """Convert Microsoft Word .docx files to Markdown.
 
-    Uses *python-docx* to iterate over paragraphs and tables, mapping Word
-    styles to Markdown headings, lists, and tables.
+    Two engines are available:
+
+    - ``"python-docx"`` (default) iterates over the *python-docx* object
+      model, mapping Word styles to Markdown headings, lists, and tables.
+    - ``"xml"`` streams ``word/document.xml`` straight out of the zip with
+      lxml ``iterparse``, resolving style IDs once from ``styles.xml`` and
+      discarding each body element after it is rendered.  Output matches
+      the python-docx engine; memory stays flat on very large documents.
+
+    With ``rich=True`` (default) both engines also render list numbering
+    and nesting from ``numPr``/``ilvl``, bold/italic runs, hyperlinks and
+    ``[Image: alt text]`` placeholders.  Everything is collected while
+    rendering each body element, so no extra pass over the document is
+    made.  ``rich=False`` produces plain paragraph text with every list
+    item flattened to ``-`` / ``1.``.
     """
 
+    ENGINES = ("python-docx", "xml")
+
     # Mapping from Word built-in style names → Markdown heading levels.
     _HEADING_STYLES: dict[str, int] = {
         "Title": 1,
@@ -24,42 +69,104 @@ class DOCXParser(BaseParser):
         "Heading 6": 6,
     }
 
-    def parse(self, file_path: Path) -> str:
+    # Spaces per list nesting level (valid under both "- " and "1. " items).
+    LIST_INDENT = 4
+
+    def __init__(self, engine: str = "python-docx", rich: bool = True) -> None:
+        if engine not in self.ENGINES:
+            raise ValueError(
+                f"Unknown DOCX engine: {engine!r}. Supported: {', '.join(self.ENGINES)}"
+            )
+        self.engine = engine
+        self.rich = rich
+
+    def parse(self, file_path: Path, stream: Optional[BinaryIO] = None) -> str:
+        if self.engine == "xml":
+            blocks = self.iter_blocks_xml(file_path, stream)
+        else:
+            blocks = self._iter_blocks_docx(file_path, stream)
+        parts = list(blocks)
+        return "\n\n".join(parts) if parts else "*Empty document.*"
+
+    def iter_blocks_xml(
+        self, file_path: Path, stream: Optional[BinaryIO] = None
+    ) -> Iterator[str]:
+        """Yield Markdown blocks (paragraphs / tables) using the XML engine."""
+        from lxml import etree
+
+        with self._open_binary(file_path, stream) as raw, zipfile.ZipFile(raw) as zf:
+            ctx = _DocContext(
+                _read_part(zf, "word/styles.xml"),
+                _read_part(zf, "word/numbering.xml"),
+                _external_links(_read_part(zf, "word/_rels/document.xml.rels")),
+            )
+            with zf.open("word/document.xml") as fh:
+                for _, elem in etree.iterparse(fh, events=("end",), tag=(_W_P, _W_TBL)):
+                    parent = elem.getparent()
+                    if parent is None or parent.tag != _W_BODY:
+                        continue  # nested in a table cell; rendered with the table
+
+                    if elem.tag == _W_P:
+                        style_name = ctx.style_name(_paragraph_style_id(elem))
+                        if self.rich:
+                            md = self._render_rich(elem, style_name, ctx)
+                        else:
+                            md = self._format_paragraph(
+                                _paragraph_text(elem).strip(), style_name
+                            )
+                    else:
+                        md = self._rows_to_table(_table_rows(elem))
+
+                    # Drop the rendered element and anything before it.
+                    elem.clear(keep_tail=True)
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+                    if md:
+                        yield md
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _iter_blocks_docx(
+        self, file_path: Path, stream: Optional[BinaryIO] = None
+    ) -> Iterator[str]:
         from docx import Document
         from docx.table import Table
         from docx.text.paragraph import Paragraph
 
-        doc = Document(str(file_path))
-        parts: list[str] = []
+        with self._open_binary(file_path, stream) as fh:
+            doc = Document(fh)
+        ctx = self._docx_context(doc) if self.rich else None
 
         for element in doc.element.body:
             tag = element.tag.split("}")[-1]  # strip namespace
 
             if tag == "p":
                 para = Paragraph(element, doc)
-                md = self._convert_paragraph(para)
+                if ctx is not None:
+                    style_name = para.style.name if para.style else ""
+                    md = self._render_rich(element, style_name, ctx)
+                else:
+                    md = self._convert_paragraph(para)
                 if md is not None:
-                    parts.append(md)
+                    yield md
 
             elif tag == "tbl":
                 table = Table(element, doc)
                 md = self._convert_table(table)
                 if md:
-                    parts.append(md)
-
-        return "\n\n".join(parts) if parts else "*Empty document.*"
-
-    # ------------------------------------------------------------------
-    # Internal helpers
-    # ------------------------------------------------------------------
+                    yield md
 
     def _convert_paragraph(self, para) -> str | None:
-        text = para.text.strip()
+        style_name = para.style.name if para.style else ""
+        return self._format_paragraph(para.text.strip(), style_name)
+
+    def _format_paragraph(self, text: str, style_name: str) -> str | None:
         if not text:
             return None
 
-        style_name = para.style.name if para.style else ""
-
         # Headings
         level = self._HEADING_STYLES.get(style_name)
         if level is not None:
@@ -74,13 +181,15 @@ class DOCXParser(BaseParser):
         # Default paragraph
         return text
 
-    @staticmethod
-    def _convert_table(table) -> str:
-        rows = []
-        for row in table.rows:
-            cells = [cell.text.strip() for cell in row.cells]
-            rows.append(cells)
+    @classmethod
+    def _convert_table(cls, table) -> str:
+        return cls._rows_to_table(
+            [cell.text.strip() for cell in row.cells] for row in table.rows
+        )
 
+    @staticmethod
+    def _rows_to_table(rows) -> str:
+        rows = list(rows)
         if not rows:
             return ""
 
@@ -88,5 +197,352 @@ class DOCXParser(BaseParser):
         body = rows[1:]
         return MarkdownFormatter.make_table(headers, body)
 
+    def _render_rich(self, p, style_name: str, ctx: "_DocContext") -> str | None:
+        """Render one ``w:p`` element with numbering and inline formatting."""
+        segments = _inline_segments(p, ctx.links)
+        if not segments:
+            return None
+
+        level = self._HEADING_STYLES.get(style_name)
+        if level is not None:
+            text = "".join(seg[0] for seg in segments if not seg[4]).strip()
+            return MarkdownFormatter.heading(text, level) if text else None
+
+        inline = _render_inline(segments).strip()
+        if not inline:
+            return None
+
+        marker = ctx.list_marker(p, style_name)
+        if marker is None:
+            return inline
+        ilvl, bullet = marker
+        return f"{' ' * (self.LIST_INDENT * ilvl)}{bullet} {inline}"
+
+    @staticmethod
+    def _docx_context(doc) -> "_DocContext":
+        try:
+            numbering = doc.part.numbering_part.element
+        except (KeyError, NotImplementedError):
+            numbering = None
+        links = {
+            r_id: rel.target_ref
+            for r_id, rel in doc.part.rels.items()
+            if rel.is_external
+        }
+        return _DocContext(doc.styles.element, numbering, links)
+
     def _file_type_label(self) -> str:
         return "DOCX"
+
+
+# ----------------------------------------------------------------------
+# Element helpers (lxml elements; python-docx oxml elements are lxml too)
+# ----------------------------------------------------------------------
+
+def _read_part(zf: zipfile.ZipFile, name: str):
+    """Parse a package part into an lxml root, or ``None`` if absent."""
+    from lxml import etree
+
+    try:
+        return etree.fromstring(zf.read(name))
+    except KeyError:
+        return None
+
+
+def _external_links(rels_root) -> dict[str, str]:
+    if rels_root is None:
+        return {}
+    return {
+        rel.get("Id"): rel.get("Target")
+        for rel in rels_root.iterfind(_PKG_REL)
+        if rel.get("TargetMode") == "External"
+    }
+
+
+def _is_on(el) -> bool:
+    """Evaluate an OOXML on/off property such as ``<w:b/>``."""
+    return el is not None and el.get(_W_VAL, "true") not in ("0", "false", "off")
+
+
+def _num_pr(ppr) -> Optional[tuple[str, int]]:
+    """Return ``(numId, ilvl)`` from a ``w:pPr`` element, if it has numbering."""
+    if ppr is None:
+        return None
+    numpr = ppr.find(f"{_W}numPr")
+    if numpr is None:
+        return None
+    num_id = numpr.find(f"{_W}numId")
+    ilvl = numpr.find(f"{_W}ilvl")
+    return (
+        num_id.get(_W_VAL) if num_id is not None else None,
+        int(ilvl.get(_W_VAL, "0")) if ilvl is not None else 0,
+    )
+
+
+class _DocContext:
+    """Lookup tables resolved once per document, plus list counters.
+
+    Built from the ``styles.xml``, ``numbering.xml`` and relationship
+    parts, so per-paragraph work is reduced to dictionary lookups.
+    """
+
+    def __init__(self, styles_root, numbering_root, links: dict[str, str]) -> None:
+        self.links = links
+        # style ID → UI style name; None → default paragraph style
+        self.style_names: dict[Optional[str], str] = {None: ""}
+        # style ID → (numId, ilvl) for list styles carrying their own numbering
+        self.style_numbering: dict[str, tuple[Optional[str], int]] = {}
+        # numId → {ilvl: numFmt}
+        self.num_formats: dict[str, dict[int, str]] = {}
+        # (numId, ilvl) → last number emitted
+        self._counters: dict[tuple[Optional[str], int], int] = {}
+
+        if styles_root is not None:
+            for style in styles_root.iterfind(f"{_W}style"):
+                if style.get(f"{_W}type") != "paragraph":
+                    continue
+                style_id = style.get(f"{_W}styleId")
+                name_el = style.find(f"{_W}name")
+                name = name_el.get(_W_VAL, "") if name_el is not None else ""
+                name = _UI_STYLE_NAMES.get(name, name)
+                self.style_names[style_id] = name
+                if style.get(f"{_W}default") in ("1", "true", "on"):
+                    self.style_names[None] = name
+                numpr = _num_pr(style.find(f"{_W}pPr"))
+                if numpr is not None:
+                    self.style_numbering[style_id] = numpr
+
+        if numbering_root is not None:
+            abstract: dict[str, dict[int, str]] = {}
+            for an in numbering_root.iterfind(f"{_W}abstractNum"):
+                levels: dict[int, str] = {}
+                for lvl in an.iterfind(f"{_W}lvl"):
+                    fmt = lvl.find(f"{_W}numFmt")
+                    levels[int(lvl.get(f"{_W}ilvl", "0"))] = (
+                        fmt.get(_W_VAL, "decimal") if fmt is not None else "decimal"
+                    )
+                abstract[an.get(f"{_W}abstractNumId")] = levels
+            for num in numbering_root.iterfind(f"{_W}num"):
+                ref = num.find(f"{_W}abstractNumId")
+                if ref is not None:
+                    self.num_formats[num.get(f"{_W}numId")] = abstract.get(
+                        ref.get(_W_VAL), {}
+                    )
+
+    def style_name(self, style_id: Optional[str]) -> str:
+        return self.style_names.get(style_id, self.style_names[None])
+
+    def list_marker(self, p, style_name: str) -> Optional[tuple[int, str]]:
+        """Return ``(nesting level, marker)`` for a list paragraph, else ``None``."""
+        # "List Bullet 2" etc. encode their depth in the name; built-in list
+        # styles usually point at level 0 of a separately indented list.
+        is_list_style = style_name.startswith(("List Bullet", "List Number"))
+        suffix = style_name.rsplit(" ", 1)[-1]
+        style_level = int(suffix) - 1 if is_list_style and suffix.isdigit() else 0
+
+        numpr = _num_pr(p.find(f"{_W}pPr"))
+        if numpr is None:
+            pstyle_id = _paragraph_style_id(p)
+            numpr = self.style_numbering.get(pstyle_id) if pstyle_id else None
+            if numpr is not None:
+                numpr = (numpr[0], max(numpr[1], style_level))
+
+        if numpr is not None:
+            num_id, ilvl = numpr
+            if num_id == "0":
+                return None  # numbering explicitly removed
+            fmt = self.num_formats.get(num_id, {}).get(ilvl)
+            if fmt is None:
+                fmt = "bullet" if "Bullet" in style_name else "decimal"
+        elif is_list_style:
+            num_id, ilvl = style_name, style_level
+            fmt = "bullet" if style_name.startswith("List Bullet") else "decimal"
+        else:
+            return None
+
+        if fmt == "bullet":
+            return ilvl, "-"
+        if fmt == "none":
+            return None
+
+        # Ordered: count per (list, level) and restart deeper levels.
+        number = self._counters.get((num_id, ilvl), 0) + 1
+        self._counters[(num_id, ilvl)] = number
+        for key in [k for k in self._counters if k[0] == num_id and k[1] > ilvl]:
+            del self._counters[key]
+        return ilvl, f"{number}."
+
+
+# A run fragment: (text, bold, italic, hyperlink target, is_image)
+_Segment = tuple[str, bool, bool, Optional[str], bool]
+
+
+def _run_segments(r, href: Optional[str], out: list) -> None:
+    rpr = r.find(f"{_W}rPr")
+    bold = rpr is not None and _is_on(rpr.find(f"{_W}b"))
+    italic = rpr is not None and _is_on(rpr.find(f"{_W}i"))
+    parts: list[str] = []
+    for child in r:
+        tag = child.tag
+        if tag in _RUN_TEXT:
+            text = _RUN_TEXT[tag]
+            parts.append((child.text or "") if text is None else text)
+        elif tag == _W_BR:
+            if child.get(f"{_W}type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == _W_DRAWING:
+            if parts:
+                out.append(("".join(parts), bold, italic, href, False))
+                parts = []
+            doc_pr = next(child.iter(_WP_DOCPR), None)
+            alt = ""
+            if doc_pr is not None:
+                alt = (doc_pr.get("descr") or doc_pr.get("title") or "").strip()
+            out.append((f"[Image: {alt}]" if alt else "[Image]", False, False, None, True))
+    if parts:
+        out.append(("".join(parts), bold, italic, href, False))
+
+
+def _inline_segments(p, links: dict[str, str]) -> list[_Segment]:
+    """Collect text, emphasis, links and images of a paragraph in one pass."""
+    out: list[_Segment] = []
+    for child in p:
+        if child.tag == _W_R:
+            _run_segments(child, None, out)
+        elif child.tag == _W_HYPERLINK:
+            href = links.get(child.get(_R_ID))
+            if href is None and child.get(f"{_W}anchor"):
+                href = f"#{child.get(f'{_W}anchor')}"
+            for r in child.iterchildren(_W_R):
+                _run_segments(r, href, out)
+    return out
+
+
+def _emphasise(text: str, bold: bool, italic: bool) -> str:
+    if not (bold or italic):
+        return text
+    core = text.strip()
+    if not core:
+        return text
+    lead = text[: len(text) - len(text.lstrip())]
+    trail = text[len(text.rstrip()) :]
+    marker = "***" if bold and italic else "**" if bold else "*"
+    return f"{lead}{marker}{core}{marker}{trail}"
+
+
+def _render_inline(segments: list[_Segment]) -> str:
+    """Render segments, merging neighbours that share formatting."""
+    out: list[str] = []
+    i = 0
+    while i < len(segments):
+        href = segments[i][3]
+        j = i
+        while j < len(segments) and segments[j][3] == href:
+            j += 1
+        # Within a link (or plain stretch), merge runs of equal emphasis.
+        inner: list[str] = []
+        k = i
+        while k < j:
+            _, bold, italic, _, _ = segments[k]
+            m = k
+            while m < j and segments[m][1:3] == (bold, italic):
+                m += 1
+            inner.append(_emphasise("".join(s[0] for s in segments[k:m]), bold, italic))
+            k = m
+        text = "".join(inner)
+        core = text.strip()
+        if href and core:
+            lead = text[: len(text) - len(text.lstrip())]
+            trail = text[len(text.rstrip()) :]
+            out.append(f"{lead}[{core}]({href}){trail}")
+        else:
+            out.append(text)
+        i = j
+    return "".join(out)
+
+
+def _paragraph_style_id(p) -> Optional[str]:
+    ppr = p.find(f"{_W}pPr")
+    if ppr is None:
+        return None
+    pstyle = ppr.find(f"{_W}pStyle")
+    return pstyle.get(_W_VAL) if pstyle is not None else None
+
+
+def _run_text(r) -> str:
+    parts: list[str] = []
+    for child in r:
+        tag = child.tag
+        if tag in _RUN_TEXT:
+            text = _RUN_TEXT[tag]
+            parts.append((child.text or "") if text is None else text)
+        elif tag == _W_BR:
+            if child.get(f"{_W}type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+    return "".join(parts)
+
+
+def _paragraph_text(p) -> str:
+    parts: list[str] = []
+    for child in p:
+        if child.tag == _W_R:
+            parts.append(_run_text(child))
+        elif child.tag == _W_HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterchildren(_W_R))
+    return "".join(parts)
+
+
+def _grid_span(tc) -> int:
+    tcpr = tc.find(f"{_W}tcPr")
+    if tcpr is not None:
+        span = tcpr.find(f"{_W}gridSpan")
+        if span is not None:
+            return int(span.get(_W_VAL, "1"))
+    return 1
+
+
+def _is_vmerge_continue(tc) -> bool:
+    tcpr = tc.find(f"{_W}tcPr")
+    if tcpr is None:
+        return False
+    vmerge = tcpr.find(f"{_W}vMerge")
+    return vmerge is not None and vmerge.get(_W_VAL, "continue") == "continue"
+
+
+def _grid_before(tr) -> int:
+    trpr = tr.find(f"{_W}trPr")
+    if trpr is not None:
+        before = trpr.find(f"{_W}gridBefore")
+        if before is not None:
+            return int(before.get(_W_VAL, "0"))
+    return 0
+
+
+def _table_rows(tbl) -> list[list[str]]:
+    """Return cell texts per row, expanded like python-docx ``_Row.cells``.
+
+    Horizontally merged cells repeat once per spanned grid column and
+    vertically merged continuation cells repeat the text of the cell that
+    starts the merge.  Each cell's text is computed once.
+    """
+    rows: list[list[str]] = []
+    above: dict[int, str] = {}  # grid offset → text of the cell covering it
+    for tr in tbl.iterchildren(_W_TR):
+        cells: list[str] = []
+        current: dict[int, str] = {}
+        offset = _grid_before(tr)
+        for tc in tr.iterchildren(_W_TC):
+            span = _grid_span(tc)
+            if _is_vmerge_continue(tc):
+                text = above.get(offset, "")
+            else:
+                text = "\n".join(
+                    _paragraph_text(p) for p in tc.iterchildren(_W_P)
+                ).strip()
+            for i in range(span):
+                current[offset + i] = text
+            cells.extend([text] * span)
+            offset += span
+        above = current
+        rows.append(cells)
+    return rows
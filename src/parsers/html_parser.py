@@ -1,6 +1,7 @@
 """HTML → Markdown parser."""
 
 from pathlib import Path
+from typing import BinaryIO, Optional
 
 from .base_parser import BaseParser
 
@@ -8,10 +9,10 @@ from .base_parser import BaseParser
 class HTMLParser(BaseParser):
     """Convert HTML files to Markdown using *html2text*."""
 
-    def parse(self, file_path: Path) -> str:
+    def parse(self, file_path: Path, stream: Optional[BinaryIO] = None) -> str:
         import html2text
 
-        raw_html = file_path.read_text(encoding="utf-8", errors="replace")
+        raw_html = self._read_text(file_path, stream)
 
         converter = html2text.HTML2Text()
         converter.body_width = 0  # no line wrapping
@@ -1,7 +1,10 @@
 """JSON → Markdown parser."""
 
 import json
+import re
+from itertools import islice
 from pathlib import Path
+from typing import IO, BinaryIO, Iterator, Optional
 
 from .base_parser import BaseParser
 from ..utils.markdown_formatter import MarkdownFormatter
@@ -13,12 +16,49 @@ class JSONParser(BaseParser):
     - Objects and arrays are rendered as fenced JSON code blocks.
     - Flat arrays-of-objects are also rendered as a Markdown table when
       all items share the same keys.
+    - With ``mode="union"``, arrays of objects with differing keys become
+      one table over the union of their keys: nested objects are flattened
+      to dotted columns up to *max_depth* levels, and keys present in fewer
+      than *min_key_frequency* of the rows are dropped (and listed).
+    - Top-level arrays larger than ``STREAM_THRESHOLD`` bytes are decoded
+      incrementally: only the first ``MAX_TABLE_ROWS`` items are built as
+      Python objects, the remainder is merely counted (so only those items
+      decide whether it becomes a table).  If anything but
+      whitespace follows the array (e.g. JSON Lines of arrays), the file is
+      parsed whole like a small one.
     """
 
     MAX_TABLE_ROWS = 200
+    STREAM_THRESHOLD = 1024 * 1024  # bytes; larger arrays are streamed
 
-    def parse(self, file_path: Path) -> str:
-        text = file_path.read_text(encoding="utf-8", errors="replace").strip()
+    MODES = ("strict", "union")
+
+    def __init__(
+        self,
+        mode: str = "strict",
+        max_depth: int = 2,
+        min_key_frequency: float = 0.05,
+    ) -> None:
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Unknown JSON mode: {mode!r}. Supported: {', '.join(self.MODES)}"
+            )
+        if not 0.0 <= min_key_frequency <= 1.0:
+            raise ValueError("min_key_frequency must be between 0 and 1")
+        self.mode = mode
+        self.max_depth = max_depth
+        self.min_key_frequency = min_key_frequency
+
+    def parse(self, file_path: Path, stream: Optional[BinaryIO] = None) -> str:
+        if _size(file_path, stream) > self.STREAM_THRESHOLD:
+            with self._open_text(file_path, stream) as fh:
+                array = _ArrayStream(fh)
+                if array.is_array:
+                    rendered = self._render_stream(array)
+                    if rendered is not None:
+                        return rendered
+
+        text = self._read_text(file_path, stream).strip()
 
         # Try JSONL (one JSON object per line)
         if "\n" in text and not text.startswith(("[", "{")):
@@ -27,6 +67,9 @@ class JSONParser(BaseParser):
         try:
             data = json.loads(text)
         except json.JSONDecodeError as exc:
+            if exc.msg == "Extra data" and "\n" in text:
+                # Several top-level documents: JSON Lines of objects.
+                return self._parse_jsonl(text)
             return f"*Failed to parse JSON: {exc}*"
 
         return self._render(data)
@@ -49,21 +92,229 @@ class JSONParser(BaseParser):
 
     def _render(self, data: object) -> str:
         # Try to render flat list-of-dicts as a table
-        if isinstance(data, list) and data and all(isinstance(r, dict) for r in data):
-            keys = list(data[0].keys())
-            if all(set(r.keys()) == set(keys) for r in data):
-                rows = [[str(r.get(k, "")) for k in keys] for r in data]
-                table, note = MarkdownFormatter.truncate_table(
-                    keys, rows, max_rows=self.MAX_TABLE_ROWS
-                )
-                parts = [table]
-                if note:
-                    parts.append(f"\n{note}")
-                return "\n".join(parts)
+        if isinstance(data, list):
+            table = self._render_table(data[: self.MAX_TABLE_ROWS + 1], len(data), data)
+            if table is not None:
+                return table
 
         # Fall back to formatted JSON code block
         pretty = json.dumps(data, indent=2, ensure_ascii=False, default=str)
         return MarkdownFormatter.wrap_code_block(pretty, "json")
 
+    def _render_stream(self, stream: "_ArrayStream") -> Optional[str]:
+        """Render a streamed top-level array from its head and item count.
+
+        Returns ``None`` if more data follows the array.
+        """
+        try:
+            head = list(islice(stream.items(), self.MAX_TABLE_ROWS + 1))
+            total = len(head) + stream.count_remaining()
+        except json.JSONDecodeError as exc:
+            return f"*Failed to parse JSON: {exc}*"
+        if not stream.at_end():
+            return None
+
+        table = self._render_table(head, total)
+        if table is not None:
+            return table
+
+        # Too large to pretty-print whole: show the leading items only.
+        shown = head[: self.MAX_TABLE_ROWS]
+        pretty = json.dumps(shown, indent=2, ensure_ascii=False, default=str)
+        parts = [MarkdownFormatter.wrap_code_block(pretty, "json")]
+        if total > len(shown):
+            parts.append(f"\n*Array truncated: showing {len(shown)} of {total} items.*")
+        return "\n".join(parts)
+
+    def _render_table(
+        self, head: list, total: int, items: Optional[list] = None
+    ) -> str | None:
+        """Render *head* (the leading items of a *total*-item array) as a table.
+
+        Returns ``None`` unless every item is a dict with the same keys
+        (or, in ``"union"`` mode, unless every item is a dict).  Only *head*
+        is checked, unless the whole array is in memory and passed as
+        *items*.
+        """
+        checked = head if items is None else items
+        if not head or not all(isinstance(r, dict) for r in checked):
+            return None
+        if self.mode == "union":
+            return self._render_union_table(head, total)
+        keys = list(head[0].keys())
+        key_set = head[0].keys()
+        if not all(r.keys() == key_set for r in checked):
+            return None
+
+        rows = [[str(r.get(k, "")) for k in keys] for r in head[: self.MAX_TABLE_ROWS]]
+        table, note = MarkdownFormatter.truncate_table(
+            keys, rows, max_rows=self.MAX_TABLE_ROWS, total_rows=total
+        )
+        parts = [table]
+        if note:
+            parts.append(f"\n{note}")
+        return "\n".join(parts)
+
+    def _render_union_table(self, head: list[dict], total: int) -> str:
+        """Render dict records over the union of their (flattened) keys."""
+        records = [_flatten(r, self.max_depth) for r in head[: self.MAX_TABLE_ROWS]]
+
+        # One pass: key frequencies, in first-seen order.
+        freq: dict[str, int] = {}
+        for record in records:
+            for key in record:
+                freq[key] = freq.get(key, 0) + 1
+
+        cutoff = self.min_key_frequency * len(records)
+        keys = [k for k, n in freq.items() if n >= cutoff]
+        dropped = [k for k, n in freq.items() if n < cutoff]
+
+        rows = [[_cell(r.get(k, _MISSING)) for k in keys] for r in records]
+        table, note = MarkdownFormatter.truncate_table(
+            keys, rows, max_rows=self.MAX_TABLE_ROWS, total_rows=total
+        )
+        parts = [table]
+        if note:
+            parts.append(f"\n{note}")
+        if dropped:
+            parts.append(
+                f"\n*Sparse keys omitted (in fewer than "
+                f"{self.min_key_frequency:.0%} of rows): {', '.join(dropped)}*"
+            )
+        return "\n".join(parts)
+
     def _file_type_label(self) -> str:
         return "JSON"
+
+
+_MISSING = object()
+
+
+def _size(file_path: Path, stream: Optional[BinaryIO]) -> int:
+    if stream is None:
+        return file_path.stat().st_size
+    return stream.seek(0, 2)
+
+
+def _flatten(record: dict, max_depth: int, prefix: str = "", out: dict | None = None) -> dict:
+    """Flatten nested dicts into ``{"a.b": value}`` up to *max_depth* levels."""
+    if out is None:
+        out = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and value and max_depth > 0:
+            _flatten(value, max_depth - 1, f"{name}.", out)
+        else:
+            out[name] = value
+    return out
+
+
+def _cell(value: object) -> str:
+    """Table cell text: strings as-is, other values as compact JSON."""
+    if value is _MISSING:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+# ----------------------------------------------------------------------
+# Incremental array decoding
+# ----------------------------------------------------------------------
+
+_WS = re.compile(r"[ \t\n\r]*")
+
+
+class _ArrayStream:
+    """Decode the elements of a top-level JSON array from a text stream.
+
+    Elements are decoded one at a time with ``JSONDecoder.raw_decode`` over
+    a sliding buffer, so memory is bounded by the largest single element
+    plus *chunk_size*.
+    """
+
+    def __init__(self, fh: IO[str], chunk_size: int = 1 << 20) -> None:
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = fh.read(chunk_size)
+        self._eof = not self._buf
+        self._pos = _WS.match(self._buf).end()
+        self.is_array = self._buf[self._pos : self._pos + 1] == "["
+        self._done = not self.is_array
+        self._after_value = False  # a value was read since the last comma
+        self._after_comma = False
+        if self.is_array:
+            self._pos += 1
+
+    def _refill(self) -> None:
+        more = self._fh.read(self._chunk_size)
+        self._buf = self._buf[self._pos :] + more
+        self._pos = 0
+        self._eof = not more
+
+    def _error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    def items(self) -> Iterator[object]:
+        """Yield array elements in order until the closing bracket."""
+        while not self._done:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos == len(self._buf):
+                if self._eof:
+                    raise self._error("Unterminated array")
+                self._refill()
+                continue
+
+            char = self._buf[self._pos]
+            if char == "]" and not self._after_comma:
+                self._pos += 1
+                self._done = True
+                return
+            if char == "," and self._after_value:
+                self._pos += 1
+                self._after_value = False
+                self._after_comma = True
+                continue
+            if char in ",]":
+                raise self._error("Expecting value")
+
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._refill()
+                continue
+            after = _WS.match(self._buf, end).end()
+            if after == len(self._buf) or self._buf[after] not in ",]":
+                # A number may continue in the next chunk ("1.5e" + "10"):
+                # only accept a value once its delimiter is in the buffer.
+                if not self._eof:
+                    self._refill()
+                    continue
+                self._pos = after
+                raise self._error("Expecting ',' delimiter")
+            self._pos = end
+            self._after_value = True
+            self._after_comma = False
+            yield value
+
+    def count_remaining(self) -> int:
+        """Count the elements left in the array, discarding each one.
+
+        Elements are still scanned by the C decoder (faster in CPython than
+        any pure-Python or regex lexer) but never retained, so memory stays
+        bounded by the largest single element.
+        """
+        return sum(1 for _ in self.items())
+
+    def at_end(self) -> bool:
+        """Whether only whitespace follows the closing bracket."""
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return False
+            if self._eof:
+                return True
+            self._refill()
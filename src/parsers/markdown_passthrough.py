@@ -1,6 +1,7 @@
 """Markdown passthrough parser — adds metadata to existing .md files."""
 
 from pathlib import Path
+from typing import BinaryIO, Optional
 
 from .base_parser import BaseParser
 
@@ -12,8 +13,8 @@ class MarkdownPassthrough(BaseParser):
     is prepended.
     """
 
-    def parse(self, file_path: Path) -> str:
-        text = file_path.read_text(encoding="utf-8", errors="replace").rstrip()
+    def parse(self, file_path: Path, stream: Optional[BinaryIO] = None) -> str:
+        text = self._read_text(file_path, stream).rstrip()
         return text if text else "*Empty file.*"
 
     def _file_type_label(self) -> str:
@@ -1,9 +1,16 @@
 """
 PDF Parser with table extraction and text cleaning
 """
+import re
+from bisect import bisect_right
 from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional
 from .base_parser import BaseParser
-import fitz  # PyMuPDF
+from ..utils.markdown_formatter import MarkdownFormatter
+try:
+    import pymupdf as fitz  # PyMuPDF
+except ImportError:  # older PyMuPDF releases only install ``fitz``
+    import fitz
 import pdfplumber
 
 
@@ -64,76 +71,428 @@ def table_to_markdown(table_data: list) -> str:
     """Convert table data to Markdown table format"""
     if not table_data or len(table_data) < 2:
         return ""
-    
-    markdown = "\n"
-    
-    # Header row
-    headers = [str(cell or '').strip() for cell in table_data[0]]
-    markdown += "| " + " | ".join(headers) + " |\n"
-    
-    # Separator row
-    markdown += "| " + " | ".join(["---"] * len(headers)) + " |\n"
-    
-    # Data rows
-    for row in table_data[1:]:
-        cells = [str(cell or '').strip() for cell in row]
-        # Pad row if needed
-        while len(cells) < len(headers):
-            cells.append('')
-        markdown += "| " + " | ".join(cells[:len(headers)]) + " |\n"
-    
-    markdown += "\n"
-    return markdown
+
+    table = MarkdownFormatter.make_table(table_data[0], table_data[1:])
+    return f"\n{table}\n\n"
+
+
+_DIGITS = re.compile(r"\d+")
+
+
+class _Heading(NamedTuple):
+    """An outline entry placed in a page's blocks: Markdown *level* and *title*."""
+
+    level: int
+    title: str
+
+
+def _outline(doc) -> dict[int, list[tuple[float, _Heading]]]:
+    """Bookmarks by page index, as ``(y, heading)`` pairs.
+
+    Outline level 1 becomes ``##`` (the document title keeps ``#``), level 2
+    ``###`` and deeper levels ``####``.  Entries without a target point on
+    the page are placed at its top; entries without a target page are
+    dropped.
+    """
+    marks: dict[int, list[tuple[float, _Heading]]] = {}
+    for level, title, page, dest in doc.get_toc(simple=False):
+        title = " ".join(title.split())
+        if not title or not 1 <= page <= doc.page_count:
+            continue
+        to = dest.get("to") if dest.get("kind") == fitz.LINK_GOTO else None
+        heading = _Heading(min(level + 1, 4), fix_utf8_encoding(fix_pdf_ligatures(title)))
+        marks.setdefault(page - 1, []).append((to.y if to is not None else 0.0, heading))
+    return marks
+
+
+def _usable_tables(found: Iterator[tuple[tuple, list]]) -> list[tuple[tuple, list]]:
+    """``(bbox, rows)`` of tables that render (a header and a row), top to bottom."""
+    return sorted(
+        ((bbox, rows) for bbox, rows in found if len(rows) >= 2),
+        key=lambda table: table[0][1],
+    )
+
+
+def _markers(tables: list, headings: list) -> tuple[list[float], list]:
+    """Tops and blocks of a page's tables and headings, top to bottom.
+
+    A heading sharing its top with a table goes first.
+    """
+    marks = sorted(
+        [(bbox[1], 1, rows) for bbox, rows in tables]
+        + [(y, 0, heading) for y, heading in headings],
+        key=lambda mark: mark[:2],
+    )
+    return [top for top, _, _ in marks], [block for _, _, block in marks]
+
+
+def _inside(x: float, y: float, boxes: list[tuple]) -> bool:
+    return any(x0 <= x <= x1 and top <= y <= bottom for x0, top, x1, bottom in boxes)
+
+
+def _interleave(texts: list[str], markers: list) -> list:
+    """Blocks ``texts[0], marker 0, texts[1], marker 1, ...`` for a page.
+
+    ``texts[i]`` holds the text whose vertical centre lies below the top of
+    marker ``i - 1`` and above the top of marker ``i``, so each table or
+    heading lands where it starts on the page.  A heading's own line, when
+    it opens the text below it, is not repeated.
+    """
+    blocks: list = []
+    for i, text in enumerate(texts):
+        if i and isinstance(markers[i - 1], _Heading):
+            text = _drop_title(text, markers[i - 1].title)
+        if text:
+            blocks.append(text)
+        if i < len(markers):
+            blocks.append(markers[i])
+    return blocks
+
+
+def _drop_title(text: str, title: str) -> str:
+    """*text* without its first non-blank line if that line is *title*."""
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        if line.strip():
+            if " ".join(line.split()).lower() == title.lower():
+                return "\n".join(lines[i + 1:])
+            break
+    return text
+
+
+def _normalize_line(line: str) -> tuple[str, tuple[int, ...]]:
+    """Case- and whitespace-folded line with digit runs masked, and the digits.
+
+    ``"Page 3 of 9"`` gives ``("page # of #", (3, 9))``.
+    """
+    folded = " ".join(line.split()).lower()
+    return _DIGITS.sub("#", folded), tuple(int(d) for d in _DIGITS.findall(folded))
+
+
+def _is_running(occurrences: list[tuple[int, tuple[int, ...]]]) -> bool:
+    """Whether a line's numbers are fixed or count the pages.
+
+    *occurrences* holds ``(page index, numbers)`` for one masked line.  It
+    is boilerplate when the numbers never change, or when exactly one of
+    them moves in step with the page index ("Page 3 of 9") while the others
+    stay fixed.  Body lines that merely share a template
+    ("Revenue 2021: 12") do neither.
+    """
+    numbers = {digits for _, digits in occurrences}
+    if len(numbers) == 1:
+        return True
+    width = len(occurrences[0][1])
+    fixed = [len({digits[p] for _, digits in occurrences}) == 1 for p in range(width)]
+    return fixed.count(False) == 1 and len(
+        {digits[fixed.index(False)] - page for page, digits in occurrences}
+    ) == 1
+
+
+def _edge_lines(blocks: list, k: int) -> dict[int, dict[int, str]]:
+    """The first and last *k* non-blank lines of a page, by block and line index.
+
+    Only text at the very top (before any table) and the very bottom
+    (after the last table) of the page is considered; outline headings
+    there are stepped over.
+    """
+    edges: dict[int, dict[int, str]] = {}
+    text = [b for b, block in enumerate(blocks) if not isinstance(block, _Heading)]
+    for b, reverse in ((text[0], False), (text[-1], True)) if text else ():
+        if not isinstance(blocks[b], str):
+            continue
+        lines = blocks[b].split("\n")
+        order = range(len(lines) - 1, -1, -1) if reverse else range(len(lines))
+        found = [i for i in order if lines[i].strip()][:k]
+        edges.setdefault(b, {}).update((i, lines[i]) for i in found)
+    return edges
+
+
+def strip_boilerplate(pages: list[list], k: int = 3, share: float = 0.5) -> tuple[int, int]:
+    """Remove running headers, footers and page numbers from *pages* in place.
+
+    The first and last *k* non-blank lines of every page are normalised
+    (see :func:`_normalize_line`) and counted once per page in one pass.
+    Those that recur on more than *share* of the pages, with numbers that
+    are fixed or count the pages (see :func:`_is_running`), are dropped
+    wherever they appear at a page edge.  Documents under three pages are
+    left alone.
+
+    Args:
+        pages: One list of blocks per page, as yielded by the engines.
+        k: Lines examined at the top and at the bottom of each page.
+        share: Fraction of pages a line must exceed to be boilerplate.
+
+    Returns:
+        The number of lines and of UTF-8 bytes removed.
+    """
+    if len(pages) < 3:
+        return 0, 0
+
+    edges = []
+    seen: dict[str, dict[int, tuple[int, ...]]] = {}
+    for page, blocks in enumerate(pages):
+        page_edges = {
+            b: {i: _normalize_line(line) for i, line in lines.items()}
+            for b, lines in _edge_lines(blocks, k).items()
+        }
+        edges.append(page_edges)
+        for lines in page_edges.values():
+            for key, digits in lines.values():
+                seen.setdefault(key, {}).setdefault(page, digits)
+
+    limit = share * len(pages)
+    repeated = {
+        key
+        for key, by_page in seen.items()
+        if len(by_page) > limit and _is_running(list(by_page.items()))
+    }
+    if not repeated:
+        return 0, 0
+
+    n_lines = n_bytes = 0
+    for blocks, page_edges in zip(pages, edges):
+        for b, keys in page_edges.items():
+            drop = {i for i, (key, _) in keys.items() if key in repeated}
+            if not drop:
+                continue
+            lines = blocks[b].split("\n")
+            for i in drop:
+                n_lines += 1
+                n_bytes += len(lines[i].encode("utf-8")) + 1
+            blocks[b] = "\n".join(line for i, line in enumerate(lines) if i not in drop)
+    return n_lines, n_bytes
 
 
 class PDFParser(BaseParser):
-    """Parser for PDF files with table extraction and text cleaning"""
-    
+    """Parser for PDF files with table extraction and text cleaning.
+
+    Two engines are available:
+
+    - ``"pdfplumber"`` (default) finds tables with pdfplumber and takes the
+      text of table pages from it too; table-free pages are read with
+      PyMuPDF.  Every page therefore goes through pdfminer's pure-Python
+      layout analysis.
+    - ``"pymupdf"`` does both with PyMuPDF (``page.find_tables`` and
+      ``page.get_text``), a single native pass that is several times
+      faster.  Its table detector is a port of pdfplumber's, so tables
+      usually match; text on table pages follows MuPDF's reading order.
+
+    On pages with tables, characters inside a table's bounding box are
+    left out of the page text, and each Markdown table is placed where it
+    starts on the page instead of after all of the text.
+
+    Sections follow the document outline (bookmarks) when it has one: each
+    entry becomes a heading at its target page and height, and the
+    ``## Page N`` headings are left out.  Documents without an outline, or
+    with ``headings="pages"``, get one section per page.
+    """
+
+    ENGINES = ("pdfplumber", "pymupdf")
+    HEADINGS = ("outline", "pages")
+
+    def __init__(
+        self,
+        engine: str = "pdfplumber",
+        boilerplate: bool = True,
+        boilerplate_lines: int = 3,
+        boilerplate_share: float = 0.5,
+        headings: str = "outline",
+    ) -> None:
+        """
+        Args:
+            engine: One of :attr:`ENGINES`.
+            boilerplate: Strip running headers, footers and page numbers
+                         (see :func:`strip_boilerplate`).
+            boilerplate_lines: Lines at the top and bottom of each page
+                               examined for boilerplate.
+            boilerplate_share: A line is boilerplate when it recurs on more
+                               than this share of the pages.
+            headings: One of :attr:`HEADINGS`: sections from the outline,
+                      falling back to pages, or always one per page.
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(
+                f"Unknown PDF engine: {engine!r}. Supported: {', '.join(self.ENGINES)}"
+            )
+        if headings not in self.HEADINGS:
+            raise ValueError(
+                f"Unknown PDF headings mode: {headings!r}. "
+                f"Supported: {', '.join(self.HEADINGS)}"
+            )
+        self.engine = engine
+        self.boilerplate = boilerplate
+        self.boilerplate_lines = boilerplate_lines
+        self.boilerplate_share = boilerplate_share
+        self.headings = headings
+        if engine == "pymupdf":
+            # find_tables otherwise prints a package recommendation to
+            # stdout, which may be carrying converted output.
+            quiet = getattr(fitz, "no_recommend_layout", None)
+            if quiet is not None:
+                quiet()
+
     def _file_type_label(self) -> str:
         return "PDF"
-    
-    def parse(self, file_path: Path) -> str:
+
+    def parse(self, file_path: Path, stream: Optional[BinaryIO] = None) -> str:
         """Parse PDF with table extraction and encoding fixes"""
-        
+        return self.parse_with_stats(file_path, stream)[0]
+
+    def parse_with_stats(
+        self, file_path: Path, stream: Optional[BinaryIO] = None
+    ) -> tuple[str, dict[str, int]]:
+        """Parse the PDF; stats report the boilerplate lines and bytes removed."""
+        return self.parse_with_metadata(file_path, stream)[:2]
+
+    def parse_with_metadata(
+        self, file_path: Path, stream: Optional[BinaryIO] = None
+    ) -> tuple[str, dict[str, int], dict[str, object]]:
+        """Parse the PDF; the metadata holds its page count as ``Pages``."""
+        outline: dict[int, list] = {}
+        if self.engine == "pymupdf":
+            pages = list(self._iter_pages_pymupdf(file_path, stream, outline))
+        else:
+            pages = list(self._iter_pages_pdfplumber(file_path, stream, outline))
+
+        stats = {}
+        if self.boilerplate:
+            lines, removed = strip_boilerplate(
+                pages, self.boilerplate_lines, self.boilerplate_share
+            )
+            stats = {"boilerplate_lines": lines, "boilerplate_bytes": removed}
+
         content_parts = []
-        
+        for page_num, blocks in enumerate(pages, 1):
+            page_heading = f"## Page {page_num}" if not outline else ""
+            page_content = self._render_page(page_heading, blocks)
+            if page_content.strip() != page_heading:
+                content_parts.append(page_content)
+        return "\n".join(content_parts), stats, {"Pages": len(pages)}
+
+    # ------------------------------------------------------------------
+    # Engines: yield each page as a list of blocks in reading order, where
+    # a block is page text (str), a table (list of rows) or an outline
+    # heading.  The outline, if used, is filled into *outline* first.
+    # ------------------------------------------------------------------
+
+    def _iter_pages_pdfplumber(
+        self, file_path: Path, stream: Optional[BinaryIO], outline: dict
+    ) -> Iterator[list]:
+        doc = None  # PyMuPDF document, opened on the first table-free page
+
         # Use pdfplumber for table detection
-        with pdfplumber.open(file_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                page_content = f"## Page {page_num}\n\n"
-                
-                # Try to extract tables
-                tables = page.extract_tables()
-                
-                if tables:
-                    # Page has tables - extract text first
-                    text = page.extract_text()
-                    
-                    if text:
-                        # Apply encoding fixes to text
-                        text = fix_pdf_ligatures(text)
-                        text = fix_utf8_encoding(text)
-                        page_content += text + "\n\n"
-                    
-                    # Add tables in Markdown format
-                    for i, table in enumerate(tables, 1):
-                        if len(tables) > 1:
-                            page_content += f"### Tableau {i}\n"
-                        page_content += table_to_markdown(table)
-                
-                else:
-                    # No tables - use PyMuPDF for better text extraction
-                    doc = fitz.open(file_path)
-                    fitz_page = doc[page_num - 1]
-                    text = fitz_page.get_text()
+        with self._open_binary(file_path, stream) as fh, pdfplumber.open(fh) as pdf:
+            try:
+                if self.headings == "outline":
+                    doc = self._open_fitz(file_path, stream)
+                    outline.update(_outline(doc))
+                for page_num, page in enumerate(pdf.pages, 1):
+                    headings = outline.get(page_num - 1, [])
+                    tables = _usable_tables((t.bbox, t.extract()) for t in page.find_tables())
+                    if tables:
+                        yield self._blocks_pdfplumber(page, tables, headings)
+                    elif headings:
+                        yield self._blocks_pymupdf(doc[page_num - 1], [], headings)
+                    else:
+                        # No tables - use PyMuPDF for better text extraction
+                        if doc is None:
+                            doc = self._open_fitz(file_path, stream)
+                        yield [doc[page_num - 1].get_text()]
+            finally:
+                if doc is not None:
                     doc.close()
-                    
-                    # Apply encoding fixes
-                    text = fix_pdf_ligatures(text)
-                    text = fix_utf8_encoding(text)
-                    page_content += text + "\n"
-                
-                if page_content.strip() != f"## Page {page_num}":
-                    content_parts.append(page_content)
-        
-        return "\n".join(content_parts)
\ No newline at end of file
+
+    def _iter_pages_pymupdf(
+        self, file_path: Path, stream: Optional[BinaryIO], outline: dict
+    ) -> Iterator[list]:
+        doc = self._open_fitz(file_path, stream)
+        try:
+            if self.headings == "outline":
+                outline.update(_outline(doc))
+            for page in doc:
+                headings = outline.get(page.number, [])
+                # Tables are found from ruling lines, so pages without any
+                # vector drawings skip find_tables' per-character setup.
+                tables = []
+                if page.get_cdrawings():
+                    tables = _usable_tables(
+                        (t.bbox, t.extract()) for t in page.find_tables().tables
+                    )
+                if tables or headings:
+                    yield self._blocks_pymupdf(page, tables, headings)
+                else:
+                    yield [page.get_text()]
+        finally:
+            doc.close()
+
+    @staticmethod
+    def _blocks_pdfplumber(page, tables: list, headings: list) -> list:
+        """Text between the tables and headings, without the characters in tables."""
+        boxes = [bbox for bbox, _ in tables]
+        tops, markers = _markers(tables, headings)
+
+        def in_band(band: int):
+            def keep(obj) -> bool:
+                if obj.get("object_type") != "char":
+                    return True
+                x = (obj["x0"] + obj["x1"]) / 2
+                y = (obj["top"] + obj["bottom"]) / 2
+                return bisect_right(tops, y) == band and not _inside(x, y, boxes)
+            return keep
+
+        texts = [page.filter(in_band(i)).extract_text() for i in range(len(markers) + 1)]
+        return _interleave(texts, markers)
+
+    @staticmethod
+    def _blocks_pymupdf(page, tables: list, headings: list) -> list:
+        """Text lines between the tables and headings, without the spans in tables."""
+        boxes = [bbox for bbox, _ in tables]
+        tops, markers = _markers(tables, headings)
+        bands: list[list[str]] = [[] for _ in range(len(markers) + 1)]
+        for block in page.get_text("dict")["blocks"]:
+            for line in block.get("lines", ()):  # image blocks have none
+                spans = [
+                    span["text"]
+                    for span in line["spans"]
+                    if not _inside(
+                        (span["bbox"][0] + span["bbox"][2]) / 2,
+                        (span["bbox"][1] + span["bbox"][3]) / 2,
+                        boxes,
+                    )
+                ]
+                if spans:
+                    y = (line["bbox"][1] + line["bbox"][3]) / 2
+                    bands[bisect_right(tops, y)].append("".join(spans))
+        return _interleave(["\n".join(lines) for lines in bands], markers)
+
+    @staticmethod
+    def _render_page(page_heading: str, blocks: list) -> str:
+        page_content = f"{page_heading}\n\n" if page_heading else ""
+        if len(blocks) == 1 and isinstance(blocks[0], str):
+            return page_content + fix_utf8_encoding(fix_pdf_ligatures(blocks[0])) + "\n"
+
+        n_tables = sum(1 for block in blocks if isinstance(block, list))
+        table_num = 0
+        for block in blocks:
+            if isinstance(block, _Heading):
+                page_content += f"{'#' * block.level} {block.title}\n\n"
+            elif isinstance(block, list):
+                # Add tables in Markdown format
+                table_num += 1
+                if n_tables > 1:
+                    page_content += f"### Tableau {table_num}\n"
+                page_content += table_to_markdown(block)
+            elif block.strip():
+                page_content += fix_utf8_encoding(fix_pdf_ligatures(block)) + "\n\n"
+        return page_content
+
+    @staticmethod
+    def _open_fitz(file_path: Path, stream: Optional[BinaryIO] = None):
+        """Open the PDF with PyMuPDF from *file_path* or from *stream*'s bytes."""
+        if stream is None:
+            return fitz.open(file_path)
+        position = stream.tell()  # pdfplumber is reading the same stream
+        stream.seek(0)
+        data = stream.read()
+        stream.seek(position)
+        return fitz.open(stream=data, filetype="pdf")
\ No newline at end of file
@@ -1,5 +1,6 @@
 """Text Parser with automatic encoding detection"""
 from pathlib import Path
+from typing import BinaryIO, Optional
 from .base_parser import BaseParser
 import chardet
 
@@ -11,11 +12,11 @@ class TextParser(BaseParser):
         """Return the file type label for metadata"""
         return "Plain Text"
     
-    def parse(self, file_path: Path) -> str:
+    def parse(self, file_path: Path, stream: Optional[BinaryIO] = None) -> str:
         """Parse plain text file with encoding detection"""
         
         # Detect encoding
-        with open(file_path, 'rb') as f:
+        with self._open_binary(file_path, stream) as f:
             result = chardet.detect(f.read(10000))
         
         encoding = result.get('encoding', 'utf-8')
@@ -26,8 +27,8 @@ class TextParser(BaseParser):
         
         # Read with detected encoding
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
+            with self._open_text(file_path, stream, encoding=encoding, errors='strict') as f:
                 return f.read()
         except:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            with self._open_text(file_path, stream) as f:
                 return f.read()
\ No newline at end of file
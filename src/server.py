@@ -0,0 +1,477 @@
+"""Long-lived conversion service over local HTTP or a Unix-domain socket.
+
+Starting the converter imports PyMuPDF, pdfplumber, python-docx and
+html2text and builds the parser registry; a caller that shells out per
+file pays that on every invocation.  :func:`serve` pays it once: a pool of
+worker threads pulls jobs from a bounded queue behind a small HTTP API.
+Files whose parser is cheap (:data:`~src.executor.THREAD_KEYS`) are
+converted on the thread with its own warm
+:class:`UniversalMarkdownConverter`; the thread hands everything else (PDF,
+DOCX, ...) to a pool of warm worker processes and waits for the result, as
+:class:`~src.executor.ConversionExecutor` does.  PyMuPDF is not
+thread-safe, so PDFs are never parsed on the threads.
+
+Endpoints:
+
+- ``POST /convert?path=/abs/file.pdf`` converts a file the server can read.
+- ``POST /convert?filename=report.pdf`` converts the request body in
+  memory; the filename is only used to pick the parser and fill in the
+  metadata.  Without it the type is sniffed from the content.
+- Add ``chunks=1`` for ``{"chunks": [record, ...]}`` (see
+  :meth:`UniversalMarkdownConverter.convert_chunks`) or
+  ``format=markdown`` for the bare Markdown document instead of a JSON
+  record.
+- ``GET /health`` returns a JSON status; ``GET /metrics`` returns counters
+  in the Prometheus text format.
+
+When the queue is full the request is rejected immediately with ``503``
+and ``Retry-After`` instead of piling up behind the workers.
+"""
+
+import io
+import json
+import logging
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .converter import UniversalMarkdownConverter
+from .executor import THREAD_KEYS, _call_in_worker, _init_worker
+from .utils.file_detector import FileDetector
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceBusy(RuntimeError):
+    """Raised when the job queue is full."""
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+# ----------------------------------------------------------------------
+# Worker pool
+# ----------------------------------------------------------------------
+
+class WorkerPool:
+    """Fixed set of threads, each with its own warm converter, plus processes.
+
+    Each thread keeps its own converter, so the converters' ``stats`` are
+    per worker.  Jobs are callables taking the worker's converter;
+    :meth:`submit_conversion` queues a conversion that runs on the thread
+    only if its parser key is in *thread_keys*, and in a worker process
+    otherwise.
+
+    Args:
+        workers: Number of worker threads, i.e. of jobs running at once.
+        queue_size: Maximum number of jobs waiting for a worker.
+        parser_options: Passed to every :class:`UniversalMarkdownConverter`.
+        deterministic: Build the converters in deterministic mode.
+        processes: Worker processes for the other parser keys (default:
+                   *workers*).  They are only spawned once needed.
+        thread_keys: Parser keys converted on the threads.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        queue_size: int = 64,
+        parser_options: Optional[dict[str, dict]] = None,
+        deterministic: bool = False,
+        processes: Optional[int] = None,
+        thread_keys: Iterable[str] = THREAD_KEYS,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.queue_size = queue_size
+        self.thread_keys = frozenset(thread_keys)
+        self.busy = 0
+        self._busy_lock = threading.Lock()
+        # Build every converter up front so a bad option fails at startup.
+        converters = [
+            UniversalMarkdownConverter(parser_options, deterministic) for _ in range(workers)
+        ]
+        self._threads = [
+            threading.Thread(
+                target=self._run, args=(c,), name=f"converter-{i}", daemon=True
+            )
+            for i, c in enumerate(converters)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self._process_count = processes or workers
+        self._processes = ProcessPoolExecutor(
+            self._process_count,
+            initializer=_init_worker,
+            initargs=(parser_options, deterministic),
+        )
+
+    @property
+    def workers(self) -> int:
+        return len(self._threads)
+
+    @property
+    def processes(self) -> int:
+        return self._process_count
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, job: Callable[[UniversalMarkdownConverter], object]) -> Future:
+        """Queue *job* without blocking.
+
+        Raises:
+            ServiceBusy: If the queue is full.
+        """
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((job, future))
+        except queue.Full:
+            raise ServiceBusy("Conversion queue is full") from None
+        return future
+
+    def submit_conversion(
+        self, key: Optional[str], fn: Callable[..., object], *args
+    ) -> Future:
+        """Queue ``fn(converter, *args)`` for a file of parser *key*.
+
+        It runs on a worker thread when *key* is in :attr:`thread_keys`,
+        otherwise in a worker process (so *fn* and *args* must pickle).
+
+        Raises:
+            ServiceBusy: If the queue is full.
+        """
+        if key in self.thread_keys:
+            return self.submit(lambda c: fn(c, *args))
+        return self.submit(
+            lambda c: self._processes.submit(_call_in_worker, fn, *args).result()
+        )
+
+    def shutdown(self) -> None:
+        """Stop the workers once the jobs already queued have run."""
+        for _ in self._threads:
+            self._queue.put((None, None))
+        for thread in self._threads:
+            thread.join()
+        self._processes.shutdown()
+
+    def _run(self, converter: UniversalMarkdownConverter) -> None:
+        while True:
+            job, future = self._queue.get()
+            if job is None:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self._busy_lock:
+                self.busy += 1
+            try:
+                future.set_result(job(converter))
+            except BaseException as exc:
+                future.set_exception(exc)
+            finally:
+                with self._busy_lock:
+                    self.busy -= 1
+
+
+# ----------------------------------------------------------------------
+# Service
+# ----------------------------------------------------------------------
+
+class ConversionService:
+    """Conversion jobs plus the counters behind ``/health`` and ``/metrics``.
+
+    Args:
+        pool: The worker pool that runs conversions.
+        timeout: Seconds a request waits for its result.
+        max_body_bytes: Largest accepted upload.
+    """
+
+    def __init__(
+        self,
+        pool: WorkerPool,
+        timeout: float = 300.0,
+        max_body_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.pool = pool
+        self.timeout = timeout
+        self.max_body_bytes = max_body_bytes
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {
+            "conversions_total": 0,
+            "conversion_errors_total": 0,
+            "rejected_total": 0,
+            "conversion_seconds_total": 0.0,
+        }
+        self._responses: dict[int, int] = {}
+
+    def convert_path(self, path: str, chunks: bool = False) -> object:
+        """Convert a file on the server's filesystem."""
+        path = Path(path)
+        return self._run(FileDetector.detect(path), _convert, path, chunks)
+
+    def convert_upload(
+        self, data: bytes, filename: Optional[str] = None, chunks: bool = False
+    ) -> object:
+        """Convert uploaded bytes; *filename* (if any) selects the parser."""
+        if filename:
+            key = FileDetector.detect(Path(filename))
+        else:
+            key = FileDetector.sniff(io.BytesIO(data))
+        return self._run(key, _convert_upload, data, filename, chunks)
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "workers": self.pool.workers,
+            "processes": self.pool.processes,
+            "busy": self.pool.busy,
+            "queued": self.pool.queued,
+            "queue_size": self.pool.queue_size,
+            "uptime_seconds": round(time.time() - self.started, 3),
+        }
+
+    def metrics(self) -> str:
+        """Counters and gauges in the Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self._counters)
+            responses = dict(self._responses)
+        lines = []
+        for name, value in counters.items():
+            lines += [f"# TYPE ragmd_{name} counter", f"ragmd_{name} {value:g}"]
+        lines.append("# TYPE ragmd_http_responses_total counter")
+        lines += [
+            f'ragmd_http_responses_total{{code="{code}"}} {n}'
+            for code, n in sorted(responses.items())
+        ]
+        for name, value in (
+            ("workers", self.pool.workers),
+            ("worker_processes", self.pool.processes),
+            ("busy_workers", self.pool.busy),
+            ("queue_depth", self.pool.queued),
+            ("queue_capacity", self.pool.queue_size),
+        ):
+            lines += [f"# TYPE ragmd_{name} gauge", f"ragmd_{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def record_response(self, code: int) -> None:
+        with self._lock:
+            self._responses[code] = self._responses.get(code, 0) + 1
+
+    def _run(self, key: Optional[str], fn: Callable[..., object], *args) -> object:
+        try:
+            future = self.pool.submit_conversion(key, fn, *args)
+        except ServiceBusy:
+            self._count("rejected_total")
+            raise
+        start = time.perf_counter()
+        try:
+            result = future.result(timeout=self.timeout)
+        except Exception:
+            self._count("conversion_errors_total")
+            raise
+        finally:
+            self._count("conversion_seconds_total", time.perf_counter() - start)
+        self._count("conversions_total")
+        for record in result["chunks"] if "chunks" in result else [result]:
+            for name, value in record["stats"].items():
+                self._count(f"{name}_total", value)
+        return result
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+
+def _convert(
+    converter: UniversalMarkdownConverter,
+    path: Optional[Path],
+    chunks: bool,
+    stream: Optional[io.BytesIO] = None,
+) -> object:
+    if chunks:
+        return {"chunks": list(converter.convert_chunks(path, stream))}
+    return converter.convert_record(path, stream)
+
+
+def _convert_upload(
+    converter: UniversalMarkdownConverter,
+    data: bytes,
+    filename: Optional[str],
+    chunks: bool,
+) -> object:
+    name = Path(filename).name if filename else None
+    return _convert(converter, name, chunks, io.BytesIO(data))
+
+
+# ----------------------------------------------------------------------
+# HTTP front end
+# ----------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "rag-md-converter"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> ConversionService:
+        return self.server.service  # type: ignore[attr-defined]
+
+    def do_GET(self) -> None:
+        route = urlsplit(self.path).path
+        if route == "/health":
+            self._send_json(HTTPStatus.OK, self.service.health())
+        elif route == "/metrics":
+            self._send(HTTPStatus.OK, self.service.metrics().encode(), "text/plain; version=0.0.4")
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, f"No route {route}")
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != "/convert":
+            self._send_error(HTTPStatus.NOT_FOUND, f"No route {url.path}")
+            return
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        chunks = params.get("chunks", "").lower() in ("1", "true", "yes")
+        try:
+            body = self._read_body()
+            if "path" in params:
+                result = self.service.convert_path(params["path"], chunks)
+            elif body:
+                result = self.service.convert_upload(body, params.get("filename"), chunks)
+            else:
+                self._send_error(
+                    HTTPStatus.BAD_REQUEST, "Pass ?path=... or upload a request body"
+                )
+                return
+        except ServiceBusy as exc:
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, str(exc), {"Retry-After": "1"})
+            return
+        except _BodyTooLarge as exc:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, str(exc))
+            return
+        except FileNotFoundError as exc:
+            self._send_error(HTTPStatus.NOT_FOUND, str(exc))
+            return
+        except ValueError as exc:
+            self._send_error(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, str(exc))
+            return
+        except FutureTimeout:
+            self._send_error(HTTPStatus.GATEWAY_TIMEOUT, "Conversion timed out")
+            return
+        except Exception as exc:
+            logger.exception("Conversion failed")
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(exc))
+            return
+
+        if params.get("format") == "markdown":
+            records = result["chunks"] if chunks else [result]
+            text = "\n\n".join(r["markdown"] for r in records)
+            self._send(HTTPStatus.OK, text.encode("utf-8"), "text/markdown; charset=utf-8")
+        else:
+            self._send_json(HTTPStatus.OK, result)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.service.max_body_bytes:
+            # Drop the connection rather than reading an oversized body.
+            self.close_connection = True
+            raise _BodyTooLarge(
+                f"Body of {length} bytes exceeds {self.service.max_body_bytes}"
+            )
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, status: int, payload: object) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json")
+
+    def _send_error(self, status: int, message: str, headers: Optional[dict] = None) -> None:
+        body = json.dumps({"error": message}).encode("utf-8")
+        self._send(status, body, "application/json", headers)
+
+    def _send(
+        self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None
+    ) -> None:
+        self.service.record_response(int(status))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) address.
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def make_server(
+    service: ConversionService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str | Path] = None,
+) -> socketserver.BaseServer:
+    """Bind the HTTP front end to TCP *host*:*port* or a Unix *socket_path*.
+
+    The returned server is bound but not yet serving; call
+    ``serve_forever()`` on it.
+    """
+    if socket_path is not None:
+        socket_path = str(socket_path)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # stale socket from a previous run
+        server = _UnixHTTPServer(socket_path, _Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+    server.service = service  # type: ignore[attr-defined]
+    return server
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str | Path] = None,
+    workers: int = 4,
+    queue_size: int = 64,
+    parser_options: Optional[dict[str, dict]] = None,
+    timeout: float = 300.0,
+    deterministic: bool = False,
+) -> None:
+    """Run the conversion service until interrupted."""
+    pool = WorkerPool(workers, queue_size, parser_options, deterministic)
+    server = make_server(ConversionService(pool, timeout=timeout), host, port, socket_path)
+    where = socket_path or "http://%s:%d" % server.server_address[:2]
+    logger.info("Serving on %s with %d workers", where, workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.shutdown()
@@ -2,5 +2,26 @@
 
 from .file_detector import FileDetector
 from .markdown_formatter import MarkdownFormatter
+from .output_sink import (
+    DirectorySink,
+    JSONLSink,
+    OutputSink,
+    ParquetSink,
+    StreamSink,
+    Unchanged,
+    ZipSink,
+    open_sink,
+)
 
-__all__ = ["FileDetector", "MarkdownFormatter"]
+__all__ = [
+    "FileDetector",
+    "MarkdownFormatter",
+    "OutputSink",
+    "DirectorySink",
+    "ZipSink",
+    "JSONLSink",
+    "ParquetSink",
+    "StreamSink",
+    "Unchanged",
+    "open_sink",
+]
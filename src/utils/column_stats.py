@@ -0,0 +1,267 @@
+"""Streaming column statistics for large tabular inputs.
+
+:class:`TableProfile` consumes rows in chunks and keeps bounded state per
+column: inferred type, null count, min / max / mean for numeric columns and
+approximate top-k values.  A uniform reservoir sample of rows is kept
+alongside so a summary can show representative data, not just the head.
+"""
+
+import math
+import random
+import re
+from array import array
+from collections import Counter
+from typing import Iterable, Optional, Sequence
+
+from .markdown_formatter import MarkdownFormatter
+
+# Cell values treated as missing (after stripping).
+NULL_TOKENS = frozenset(
+    {"", "-", "NA", "N/A", "n/a", "na", "NaN", "nan",
+     "NULL", "null", "Null", "None", "none"}
+)
+
+_BOOL_TOKENS = frozenset(
+    {"true", "false", "True", "False", "TRUE", "FALSE",
+     "yes", "no", "Yes", "No", "YES", "NO"}
+)
+_DATE_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}"
+    r"(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?"
+)
+
+# Type candidates, each followed by the wider types it may widen into.
+_TYPE_CHAINS: dict[str, list[str]] = {
+    "integer": ["integer", "float", "text"],
+    "float": ["float", "text"],
+    "boolean": ["boolean", "text"],
+    "date": ["date", "text"],
+    "text": ["text"],
+}
+_FIRST_GUESS = ("integer", "float", "boolean", "date", "text")
+
+
+def _fits(kind: str, values: list[str]) -> Optional[array]:
+    """Return an array of parsed values if every value fits *kind*, else ``None``.
+
+    For non-numeric kinds an empty array signals success.
+    """
+    try:
+        if kind == "integer":
+            return array("q", map(int, values))
+        if kind == "float":
+            return array("d", map(float, values))
+    except (ValueError, OverflowError):
+        return None
+    if kind == "boolean":
+        return array("b") if _BOOL_TOKENS.issuperset(values) else None
+    if kind == "date":
+        return array("b") if all(map(_DATE_RE.fullmatch, values)) else None
+    return array("b")
+
+
+class ColumnStats:
+    """Bounded-memory statistics for one column, fed one chunk at a time."""
+
+    def __init__(self, name: str, top_k: int = 5, max_tracked: int = 2000) -> None:
+        self.name = name
+        self.top_k = top_k
+        self.max_tracked = max_tracked
+        self.count = 0
+        self.nulls = 0
+        self._candidates: Optional[list[str]] = None
+        self._min: object = None
+        self._max: object = None
+        self._sum = 0.0
+        self._numeric_count = 0
+        self._counter: Counter = Counter()
+        self._pruned = False
+
+    @property
+    def kind(self) -> str:
+        return self._candidates[0] if self._candidates else "empty"
+
+    def update(self, values: Sequence[str]) -> None:
+        """Fold one chunk of raw cell strings into the statistics."""
+        self.count += len(values)
+        present = [v for v in map(str.strip, values) if v not in NULL_TOKENS]
+        self.nulls += len(values) - len(present)
+        if not present:
+            return
+
+        if self._candidates is None:
+            for guess in _FIRST_GUESS:
+                parsed = _fits(guess, present)
+                if parsed is not None:
+                    self._candidates = list(_TYPE_CHAINS[guess])
+                    break
+        else:
+            parsed = _fits(self._candidates[0], present)
+            while parsed is None:
+                self._candidates.pop(0)
+                parsed = _fits(self._candidates[0], present)
+
+        kind = self.kind
+        if kind in ("integer", "float"):
+            lo, hi = min(parsed), max(parsed)
+            self._sum += math.fsum(parsed)
+            self._numeric_count += len(parsed)
+        elif kind in ("boolean", "date"):
+            lo, hi = min(present), max(present)
+        else:
+            lo = hi = None
+            self._sum = 0.0
+        if lo is not None:
+            self._min = lo if self._min is None else min(self._min, lo)
+            self._max = hi if self._max is None else max(self._max, hi)
+        else:
+            self._min = self._max = None
+
+        self._counter.update(present)
+        if len(self._counter) > self.max_tracked:
+            # Keep the heaviest hitters; counts become approximate.
+            self._counter = Counter(dict(self._counter.most_common(self.max_tracked // 2)))
+            self._pruned = True
+
+    def summary_cells(self) -> list[str]:
+        """Cells for the schema table row of this column."""
+        kind = self.kind
+        mean = ""
+        if kind in ("integer", "float") and self._numeric_count:
+            mean = _fmt_number(self._sum / self._numeric_count)
+        top = [(v, c) for v, c in self._counter.most_common(self.top_k) if c > 1]
+        top_text = ", ".join(f"{_short(v)} ({c:,})" for v, c in top)
+        if top_text and self._pruned:
+            top_text += " ≈"
+        return [
+            self.name,
+            kind,
+            f"{self.nulls:,}",
+            _fmt_number(self._min),
+            _fmt_number(self._max),
+            mean,
+            top_text,
+        ]
+
+
+class TableProfile:
+    """Profile a table streamed in chunks: per-column stats plus a row sample.
+
+    Args:
+        headers: Column names.
+        sample_size: Number of rows kept in the uniform reservoir sample.
+        top_k: Number of most frequent values reported per column.
+        seed: Seed for the sampler, so the same input gives the same output.
+    """
+
+    SCHEMA_HEADERS = ["Column", "Type", "Nulls", "Min", "Max", "Mean", "Top values"]
+
+    def __init__(
+        self,
+        headers: Sequence[str],
+        sample_size: int = 20,
+        top_k: int = 5,
+        seed: int = 0,
+    ) -> None:
+        self.headers = list(headers)
+        self.columns = [
+            ColumnStats(h or f"column_{i + 1}", top_k) for i, h in enumerate(self.headers)
+        ]
+        self.rows = 0
+        self.sample_size = sample_size
+        self._sample: list[tuple[int, list[str]]] = []
+        self._rng = random.Random(seed)
+        self._w = 1.0
+        self._next = 0
+        self._advance_reservoir(initial=True)
+
+    def update(self, chunk: list[list[str]]) -> None:
+        """Fold a chunk of rows (lists of cell strings) into the profile."""
+        width = len(self.headers)
+        for i, row in enumerate(chunk):
+            if len(row) != width:
+                chunk[i] = (row + [""] * width)[:width]
+
+        start = self.rows
+        self.rows += len(chunk)
+        self._sample_chunk(chunk, start)
+        for stats, values in zip(self.columns, zip(*chunk)):
+            stats.update(values)
+
+    def consume(self, rows: Iterable[list[str]], chunk_size: int = 10_000) -> None:
+        """Stream *rows* through :meth:`update` in chunks of *chunk_size*."""
+        chunk: list[list[str]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                self.update(chunk)
+                chunk = []
+        if chunk:
+            self.update(chunk)
+
+    def to_markdown(self) -> str:
+        """Render the schema section followed by the sampled rows."""
+        parts = [
+            MarkdownFormatter.heading("Schema", 2),
+            f"*Rows: {self.rows:,} · Columns: {len(self.headers)}*",
+            MarkdownFormatter.make_table(
+                self.SCHEMA_HEADERS, [c.summary_cells() for c in self.columns]
+            ),
+        ]
+        sample = [row for _, row in sorted(self._sample)]
+        if sample:
+            note = (
+                f"*{len(sample)} rows sampled uniformly from {self.rows:,}.*"
+                if self.rows > len(sample)
+                else f"*All {self.rows:,} rows.*"
+            )
+            parts += [
+                MarkdownFormatter.heading("Sample rows", 2),
+                note,
+                MarkdownFormatter.make_table(self.headers, sample),
+            ]
+        return "\n\n".join(parts)
+
+    # ------------------------------------------------------------------
+    # Reservoir sampling (Li's "Algorithm L": O(k log(n/k)) random draws)
+    # ------------------------------------------------------------------
+
+    def _advance_reservoir(self, initial: bool = False) -> None:
+        """Pick the index of the next row that replaces a reservoir slot."""
+        k = self.sample_size
+        if k <= 0:
+            self._next = math.inf
+            return
+        rand = self._rng.random
+        if initial:
+            self._w = math.exp(math.log(rand() or 1e-300) / k)
+            self._next = k - 1
+        else:
+            self._w *= math.exp(math.log(rand() or 1e-300) / k)
+        self._next += math.floor(math.log(rand() or 1e-300) / math.log1p(-self._w)) + 1
+
+    def _sample_chunk(self, chunk: list[list[str]], start: int) -> None:
+        k = self.sample_size
+        if len(self._sample) < k:
+            take = chunk[: k - len(self._sample)]
+            self._sample.extend((start + i, row) for i, row in enumerate(take))
+        end = start + len(chunk)
+        while self._next < end:
+            slot = self._rng.randrange(k)
+            self._sample[slot] = (self._next, chunk[self._next - start])
+            self._advance_reservoir()
+
+
+def _fmt_number(value: object) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    if isinstance(value, int):
+        return str(value)
+    return _short(str(value))
+
+
+def _short(text: str, limit: int = 40) -> str:
+    text = text.replace("\n", " ")
+    return text if len(text) <= limit else text[: limit - 1] + "…"
@@ -0,0 +1,38 @@
+"""Content digests for source documents and converted output.
+
+All digests are hex BLAKE2b with a 20-byte digest: short enough for a
+metadata header, and fast enough to take over every input of a batch.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import BinaryIO
+
+DIGEST_SIZE = 20
+
+
+def file_digest(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    """Hex digest of the file's bytes, read in *chunk_size* pieces."""
+    with open(path, "rb") as fh:
+        return stream_digest(fh, chunk_size)
+
+
+def stream_digest(stream: BinaryIO, chunk_size: int = 1 << 20) -> str:
+    """Hex digest of a seekable stream's bytes from its start.
+
+    The stream is left at the position it had on entry.
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    position = stream.tell()
+    stream.seek(0)
+    try:
+        while chunk := stream.read(chunk_size):
+            digest.update(chunk)
+    finally:
+        stream.seek(position)
+    return digest.hexdigest()
+
+
+def text_digest(text: str) -> str:
+    """Hex digest of *text* encoded as UTF-8."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=DIGEST_SIZE).hexdigest()
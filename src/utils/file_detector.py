@@ -1,7 +1,9 @@
 """Detect file types and map them to the appropriate parser key."""
 
+import codecs
+import zipfile
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 # Mapping from file extension (lower-case, with dot) → parser registry key.
 EXTENSION_MAP: dict[str, str] = {
@@ -112,6 +114,19 @@ LANGUAGE_MAP: dict[str, str] = {
 }
 
 
+# Canonical extension per parser key, used to name documents detected by
+# content alone.
+SNIFFED_EXTENSIONS: dict[str, str] = {
+    "pdf": ".pdf",
+    "docx": ".docx",
+    "html": ".html",
+    "json": ".json",
+    "text": ".txt",
+}
+
+_SNIFF_BYTES = 8192
+
+
 class FileDetector:
     """Detect file types by extension and return parser keys / language hints."""
 
@@ -120,6 +135,48 @@ class FileDetector:
         """Return the parser registry key for *file_path*, or ``None``."""
         return EXTENSION_MAP.get(file_path.suffix.lower())
 
+    @staticmethod
+    def sniff(stream: BinaryIO) -> Optional[str]:
+        """Guess the parser key from a seekable binary stream's content.
+
+        Recognises PDF and DOCX signatures, HTML and JSON documents, and
+        falls back to ``"text"`` for anything that decodes as UTF-8 without
+        NUL bytes.  Only the first ``_SNIFF_BYTES`` are examined, so a
+        multi-byte character cut off at the end of that sample is allowed.
+        Returns ``None`` for other binary data.  The stream is rewound
+        afterwards.
+        """
+        stream.seek(0)
+        head = stream.read(_SNIFF_BYTES)
+        stream.seek(0)
+
+        if head.startswith(b"%PDF-"):
+            return "pdf"
+        if head.startswith(b"PK\x03\x04"):
+            try:
+                with zipfile.ZipFile(stream) as zf:
+                    is_docx = "word/document.xml" in zf.namelist()
+            except zipfile.BadZipFile:
+                is_docx = False
+            finally:
+                stream.seek(0)
+            return "docx" if is_docx else None
+        if b"\x00" in head:
+            return None
+
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        try:
+            text = decoder.decode(head, final=len(head) < _SNIFF_BYTES)
+        except UnicodeDecodeError:
+            return None
+        text = text.lstrip("\ufeff \t\r\n")
+        lowered = text[:64].lower()
+        if lowered.startswith(("<!doctype html", "<html")):
+            return "html"
+        if text.startswith(("{", "[")):
+            return "json"
+        return "text"
+
     @staticmethod
     def language_hint(file_path: Path) -> str:
         """Return the Markdown code-fence language identifier."""
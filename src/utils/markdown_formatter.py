@@ -1,7 +1,17 @@
 """Markdown formatting utilities for clean, RAG-friendly output."""
 
 import re
-from typing import Optional
+from typing import Optional, Sequence
+
+_BACKTICK_RUNS = re.compile(r"`{3,}")
+
+
+def _cell_text(value: object) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _escape_cell(value: object) -> str:
+    return _cell_text(value).replace("|", "\\|")
 
 
 class MarkdownFormatter:
@@ -13,12 +23,22 @@ class MarkdownFormatter:
         return re.sub(r"\n{3,}", "\n\n", text)
 
     @staticmethod
-    def make_table(headers: list[str], rows: list[list[str]]) -> str:
+    def make_table(
+        headers: list[str],
+        rows: Sequence[Sequence[str]],
+        align: bool = False,
+    ) -> str:
         """Build a GitHub-Flavoured Markdown table.
 
+        Cells are stripped, ``None`` becomes an empty cell and ``|`` is
+        escaped.  Short rows are padded and long rows trimmed to the header
+        width.
+
         Args:
             headers: Column header strings.
             rows: List of rows, each row a list of cell strings.
+            align: Pad every column to its widest cell so the raw Markdown
+                   lines up (slower; meant for small tables).
 
         Returns:
             A Markdown table as a string.
@@ -26,29 +46,70 @@ class MarkdownFormatter:
         if not headers:
             return ""
 
-        # Escape pipe characters in cell values
-        def escape(cell: str) -> str:
-            return str(cell).replace("|", "\\|").strip()
-
-        header_line = "| " + " | ".join(escape(h) for h in headers) + " |"
-        sep_line = "| " + " | ".join("---" for _ in headers) + " |"
+        width = len(headers)
+        if align:
+            return MarkdownFormatter._make_aligned_table(headers, rows, width)
+
+        header_line = "| " + " | ".join(_escape_cell(h) for h in headers) + " |"
+        sep_line = "| " + " | ".join(["---"] * width) + " |"
+        if not rows:
+            return f"{header_line}\n{sep_line}"
+
+        # Fast path: join stripped cells directly and only escape rows whose
+        # pipe count shows that a cell contains "|".  Full-width rows are not
+        # copied; short rows are padded by appending separators.
+        lines: list[str] = []
+        append = lines.append
+        join = " | ".join
+        strip = str.strip
+        seps = width - 1
+        for row in rows:
+            n = len(row)
+            cells = row if n <= width else row[:width]
+            try:
+                line = join(map(strip, cells))
+                if n and line.count("|") != len(cells) - 1:
+                    line = join([c.strip().replace("|", "\\|") for c in cells])
+            except (TypeError, AttributeError):  # non-string cells (None, numbers)
+                line = join(map(_escape_cell, cells))
+            if n < width:
+                line += " | " * (seps - max(n - 1, 0))
+            append(line)
+
+        return f"{header_line}\n{sep_line}\n| " + " |\n| ".join(lines) + " |"
 
-        body_lines: list[str] = []
+    @staticmethod
+    def _make_aligned_table(
+        headers: list[str], rows: Sequence[Sequence[str]], width: int
+    ) -> str:
+        grid = [[_escape_cell(h) for h in headers]]
         for row in rows:
-            # Pad or trim row to match header count
-            padded = list(row) + [""] * (len(headers) - len(row))
-            padded = padded[: len(headers)]
-            body_lines.append("| " + " | ".join(escape(c) for c in padded) + " |")
+            cells = [_escape_cell(c) for c in row[:width]]
+            cells.extend([""] * (width - len(cells)))
+            grid.append(cells)
+
+        widths = [max(3, *(len(r[i]) for r in grid)) for i in range(width)]
+        lines = ["| " + " | ".join(c.ljust(w) for c, w in zip(r, widths)) + " |" for r in grid]
+        lines.insert(1, "| " + " | ".join("-" * w for w in widths) + " |")
+        return "\n".join(lines)
+
+    @staticmethod
+    def code_fence(code: str) -> str:
+        """Backtick fence longer than any backtick run in *code* (at least three).
 
-        return "\n".join([header_line, sep_line, *body_lines])
+        Found in a single scan, however long the longest run is, so it can
+        be computed once for a whole file and reused for every block cut
+        from it.
+        """
+        if "```" not in code:  # the common case, and a faster scan
+            return "```"
+        longest = max(map(len, _BACKTICK_RUNS.findall(code)))
+        return "`" * max(3, longest + 1)
 
     @staticmethod
-    def wrap_code_block(code: str, language: str = "") -> str:
-        """Wrap *code* in a fenced code block."""
-        fence = "```"
-        # Use longer fence if the code itself contains triple backticks
-        while fence in code:
-            fence += "`"
+    def wrap_code_block(code: str, language: str = "", fence: str = "") -> str:
+        """Wrap *code* in a fenced code block (*fence* defaults to :meth:`code_fence`)."""
+        fence = fence or MarkdownFormatter.code_fence(code)
         return f"{fence}{language}\n{code}\n{fence}"
 
     @staticmethod
@@ -69,14 +130,20 @@ class MarkdownFormatter:
         headers: list[str],
         rows: list[list[str]],
         max_rows: int = 100,
+        total_rows: Optional[int] = None,
     ) -> tuple[str, Optional[str]]:
         """Build a table, truncating if it exceeds *max_rows*.
 
+        Args:
+            total_rows: Row count of the full table when *rows* is only its
+                        head (streaming callers); defaults to ``len(rows)``.
+
         Returns:
             (table_markdown, note_or_None)
         """
         note = None
-        if len(rows) > max_rows:
-            note = f"*Table truncated: showing {max_rows} of {len(rows)} rows.*"
+        total = len(rows) if total_rows is None else total_rows
+        if total > max_rows:
+            note = f"*Table truncated: showing {max_rows} of {total} rows.*"
             rows = rows[:max_rows]
         return MarkdownFormatter.make_table(headers, rows), note
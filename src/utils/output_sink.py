@@ -0,0 +1,573 @@
+"""Output sinks that persist converted Markdown.
+
+A sink receives one converted document at a time and decides how it is
+stored: as individual ``.md`` files (:class:`DirectorySink`), bundled into
+a single archive (:class:`ZipSink`), streamed as one record per document
+into a corpus file (:class:`JSONLSink`, :class:`ParquetSink`), or piped to
+an open stream such as stdout (:class:`StreamSink`).  No sink
+leaves a truncated document behind: file-based sinks publish via
+``os.replace``, and a JSONL sink appending to an existing corpus writes
+whole lines.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from .digest import file_digest, text_digest
+
+_umask: Optional[int] = None
+_umask_lock = threading.Lock()
+
+
+def _process_umask() -> int:
+    """The process umask, read on first use.
+
+    Linux reports it in ``/proc/self/status``.  Elsewhere it can only be
+    read by setting it, which is then done once, under a lock.
+    """
+    global _umask
+    with _umask_lock:
+        if _umask is None:
+            try:
+                with open("/proc/self/status", encoding="ascii") as fh:
+                    for line in fh:
+                        if line.startswith("Umask:"):
+                            _umask = int(line.split()[1], 8)
+                            break
+            except (OSError, ValueError):
+                pass
+        if _umask is None:
+            _umask = os.umask(0o022)
+            os.umask(_umask)
+        return _umask
+
+
+def _install(tmp_name: str | Path, path: Path) -> None:
+    """Move the temp file *tmp_name* to *path* with the mode a plain write gives.
+
+    ``mkstemp`` creates files as 0600 and ``os.replace`` keeps that, so the
+    temp file first takes the mode of the file it replaces or, for a new
+    file, ``0666`` less the umask.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_process_umask()
+    os.chmod(tmp_name, mode)
+    os.replace(tmp_name, path)
+
+
+def atomic_write_text(path: Path, text: str, fsync: bool = False) -> None:
+    """Write *text* to *path* via a temp file and ``os.replace``.
+
+    The temp file lives in the destination directory so the final rename
+    never crosses a filesystem boundary.  The parent directory must exist.
+    The file gets the same permissions as with a plain ``open`` and write.
+
+    Args:
+        path: Destination file.
+        text: Content, written as UTF-8.
+        fsync: Flush the file to stable storage before renaming.
+    """
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as fh:
+            fh.write(text)
+            if fsync:
+                fh.flush()
+                os.fsync(fh.fileno())
+        _install(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class Unchanged(str):
+    """Location of a document left as it was, because its digest matched.
+
+    A ``str``, so callers that only test for success need not care.
+    """
+
+
+class OutputSink(ABC):
+    """Destination for converted documents.
+
+    Sinks are context managers; ``close`` must be called (or the ``with``
+    block exited) for bundled outputs to be finalised.
+    """
+
+    #: Whether each document is on disk once :meth:`write` returns, so a
+    #: crashed batch can be resumed from its checkpoint journal.
+    durable: bool = False
+    #: Whether documents are appended to an existing file, so writing one
+    #: again after a crash stores it twice instead of replacing it.
+    appends: bool = False
+
+    @abstractmethod
+    def write(self, relative_path: Path, content: str, **record) -> str:
+        """Store one document.
+
+        Args:
+            relative_path: Output path relative to the sink root
+                           (e.g. ``sub/report.md``).
+            content: The complete Markdown document.
+            **record: Extra information about the document (source path,
+                      parser key, metadata).  Sinks may ignore it.
+
+        Returns:
+            A string locating the stored document, used in batch results.
+        """
+
+    def alias(self, relative_path: Path, location: str) -> str:
+        """Store *relative_path* as a duplicate of the document at *location*.
+
+        *location* is a value returned by :meth:`write`.  By default nothing
+        is stored and *location* is returned, so batch results point the
+        duplicate at the original.
+        """
+        return location
+
+    def close(self) -> None:
+        """Flush and finalise the sink."""
+
+    def discard(self) -> None:
+        """Close the sink after a failure.
+
+        Sinks that only publish on close drop their unfinished output;
+        by default this is :meth:`close`, as documents are already stored.
+        """
+        self.close()
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class DirectorySink(OutputSink):
+    """Write one ``.md`` file per document beneath *root*.
+
+    Directories that have already been created are remembered, so deep
+    trees cost one ``mkdir`` per directory instead of one per file.  A
+    document whose metadata carries a ``Digest`` (deterministic mode) is
+    not rewritten when the file already there has exactly the same
+    content, compared by a digest of the whole file; :meth:`write` then
+    returns an :class:`Unchanged` location and the file keeps its
+    modification time.  A file edited or truncated since it was written
+    is replaced.
+    """
+
+    durable = True
+
+    def __init__(self, root: str | Path, fsync: bool = False) -> None:
+        self.root = Path(root)
+        self.fsync = fsync
+        self._created_dirs: set[Path] = set()
+
+    def write(self, relative_path: Path, content: str, **record) -> str:
+        dest = self.root / relative_path
+        if "Digest" in record.get("metadata", {}) and _has_content(dest, content):
+            return Unchanged(dest)
+        self.ensure_dir(dest.parent)
+        atomic_write_text(dest, content, fsync=self.fsync)
+        return str(dest)
+
+    def alias(self, relative_path: Path, location: str) -> str:
+        """Hard-link *relative_path* to the file at *location* (copy if links fail)."""
+        dest = self.root / relative_path
+        self.ensure_dir(dest.parent)
+        tmp = dest.with_name(f".{dest.name}.link")
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(location, tmp)
+        except OSError:  # e.g. another filesystem, or no hard links
+            shutil.copyfile(location, tmp)
+        os.replace(tmp, dest)
+        return str(dest)
+
+    def ensure_dir(self, directory: Path) -> None:
+        """Create *directory* (and parents) unless already known to exist."""
+        if directory in self._created_dirs:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        self._created_dirs.add(directory)
+
+
+class ZipSink(OutputSink):
+    """Bundle every document into a single ``.zip`` archive.
+
+    The archive is assembled under a temporary name and moved into place
+    on ``close``, so readers never observe a half-written archive.  If the
+    ``with`` block raises, the temporary archive is deleted instead.
+    """
+
+    def __init__(self, path: str | Path, compression: int = zipfile.ZIP_DEFLATED) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_name = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        os.close(fd)
+        self._zip = zipfile.ZipFile(self._tmp_name, "w", compression=compression)
+        self._closed = False
+
+    def write(self, relative_path: Path, content: str, **record) -> str:
+        arcname = Path(relative_path).as_posix()
+        self._zip.writestr(arcname, content.encode("utf-8"))
+        return f"{self.path}!/{arcname}"
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._zip.close()
+        _install(self._tmp_name, self.path)
+
+    def discard(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._zip.close()
+        os.unlink(self._tmp_name)
+
+
+class _RotatingSink(OutputSink):
+    """Shared shard naming for record sinks with size-based rotation.
+
+    Without *max_bytes* everything goes to *path*.  With it, records go to
+    ``<stem>-00000<suffix>``, ``<stem>-00001<suffix>``, ... and a new shard
+    is started once the current one would exceed *max_bytes*.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: Optional[int] = None) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._shard_index = 0
+
+    def _shard_path(self, index: int) -> Path:
+        if self.max_bytes is None:
+            return self.path
+        return self._numbered_path(index)
+
+    def _numbered_path(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}-{index:05d}{self.path.suffix}")
+
+    def _existing_shards(self) -> list[int]:
+        pattern = f"{self.path.stem}-[0-9][0-9][0-9][0-9][0-9]{self.path.suffix}"
+        return sorted(
+            int(p.name[len(self.path.stem) + 1 : len(self.path.stem) + 6])
+            for p in self.path.parent.glob(pattern)
+        )
+
+    def _should_rotate(self, current_size: int, incoming: int) -> bool:
+        return (
+            self.max_bytes is not None
+            and current_size > 0
+            and current_size + incoming > self.max_bytes
+        )
+
+
+class JSONLSink(_RotatingSink):
+    """Write one JSON object per document to a ``.jsonl`` corpus file.
+
+    Each line holds ``source``, ``parser``, ``path`` (the would-be relative
+    ``.md`` path), ``metadata`` and ``markdown``.  Lines are written whole.
+    The returned location is ``<file>@<byte offset>`` so readers can seek
+    straight to a record.
+
+    By default an existing corpus (and its shards) is replaced: shards are
+    written under temporary names and published together on ``close``,
+    when shards of the earlier run are deleted.  If the ``with`` block
+    raises, the temporary shards are deleted and the earlier corpus is
+    kept.  With *append*, as when resuming a batch, records are appended
+    to the corpus itself and each is on disk once :meth:`write` returns.
+    """
+
+    def __init__(
+        self, path: str | Path, max_bytes: Optional[int] = None, append: bool = False
+    ) -> None:
+        super().__init__(path, max_bytes)
+        self.durable = self.appends = append
+        existing = self._existing_shards()
+        # (temp name, destination) of the shards to publish on close.
+        self._pending: list[tuple[str, Path]] = []
+        self._stale: list[Path] = []
+        if append:
+            if max_bytes is not None and existing:
+                self._shard_index = existing[-1]
+        else:
+            self._stale = [self._numbered_path(index) for index in existing]
+        self._open_shard()
+
+    def _open_shard(self) -> None:
+        self._current = self._shard_path(self._shard_index)
+        if self.appends:
+            self._fh = self._current.open("ab")
+        else:
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self._current.parent, prefix=f".{self._current.name}.", suffix=".tmp"
+            )
+            self._fh = os.fdopen(fd, "wb")
+            self._pending.append((tmp_name, self._current))
+        self._size = self._fh.tell()
+
+    def write(self, relative_path: Path, content: str, **record) -> str:
+        line = _jsonl_line(relative_path, content, record)
+
+        if self._should_rotate(self._size, len(line)):
+            self._fh.close()
+            self._shard_index += 1
+            self._open_shard()
+
+        offset = self._size
+        self._fh.write(line)
+        self._fh.flush()
+        self._size += len(line)
+        return f"{self._current}@{offset}"
+
+    def close(self) -> None:
+        if self._fh.closed:
+            return
+        self._fh.close()
+        for tmp_name, dest in self._pending:
+            _install(tmp_name, dest)
+        published = {dest for _, dest in self._pending}
+        for shard in self._stale:
+            if shard not in published:
+                shard.unlink(missing_ok=True)
+        self._pending = []
+
+    def discard(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+        for tmp_name, _ in self._pending:
+            os.unlink(tmp_name)
+        self._pending = []
+
+
+class StreamSink(OutputSink):
+    """Write documents to an already-open binary stream such as stdout.
+
+    With ``fmt="md"`` documents are concatenated, separated by a blank
+    line; with ``fmt="jsonl"`` each becomes one JSON line as written by
+    :class:`JSONLSink`.  The stream is flushed after every document so a
+    downstream pipe sees records as soon as they are converted, and it is
+    never closed by the sink.
+    """
+
+    FORMATS = ("md", "jsonl")
+
+    def __init__(self, stream: BinaryIO, fmt: str = "md", name: str = "-") -> None:
+        if fmt not in self.FORMATS:
+            raise ValueError(
+                f"Unknown stream format: {fmt!r}. Supported: {', '.join(self.FORMATS)}"
+            )
+        self.stream = stream
+        self.fmt = fmt
+        self.name = name
+        self._count = 0
+
+    def write(self, relative_path: Path, content: str, **record) -> str:
+        if self.fmt == "jsonl":
+            data = _jsonl_line(relative_path, content, record)
+        else:
+            data = (("\n" if self._count else "") + content.rstrip("\n") + "\n").encode("utf-8")
+        self.stream.write(data)
+        self.stream.flush()
+        self._count += 1
+        return f"{self.name}#{self._count - 1}"
+
+
+class ParquetSink(_RotatingSink):
+    """Write documents as rows of a Parquet file (requires *pyarrow*).
+
+    Columns are ``source``, ``parser``, ``path``, ``title``, ``metadata``
+    (JSON-encoded, since field sets vary by parser) and ``markdown``.
+    Rows are buffered into row groups of *row_group_size*; rotation is
+    based on the uncompressed Markdown size.  Each shard is written under a
+    temporary name and published on rotation or ``close``; shards of an
+    earlier run are deleted when the first shard is published.
+    """
+
+    _COLUMNS = ("source", "parser", "path", "title", "metadata", "markdown")
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: Optional[int] = None,
+        row_group_size: int = 256,
+    ) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError(
+                "The parquet output format requires pyarrow "
+                "(pip install pyarrow); use 'jsonl' instead."
+            ) from exc
+
+        super().__init__(path, max_bytes)
+        self._pa = pa
+        self._pq = pq
+        self.row_group_size = row_group_size
+        self._schema = pa.schema(
+            [(name, pa.string()) for name in self._COLUMNS]
+        )
+        # Replaced once this run publishes its first shard.
+        self._stale = self._existing_shards() if max_bytes is not None else []
+        self._writer = None
+        self._buffer: dict[str, list[str]] = {name: [] for name in self._COLUMNS}
+        self._rows = 0
+        self._size = 0
+
+    def _open_shard(self) -> None:
+        self._current = self._shard_path(self._shard_index)
+        fd, self._tmp_name = tempfile.mkstemp(
+            dir=self._current.parent, prefix=f".{self._current.name}.", suffix=".tmp"
+        )
+        os.close(fd)
+        self._writer = self._pq.ParquetWriter(self._tmp_name, self._schema)
+        self._rows = 0
+        self._size = 0
+
+    def _flush(self) -> None:
+        if self._buffer["source"]:
+            table = self._pa.table(self._buffer, schema=self._schema)
+            self._writer.write_table(table)
+            self._buffer = {name: [] for name in self._COLUMNS}
+
+    def _publish(self) -> None:
+        self._flush()
+        self._writer.close()
+        _install(self._tmp_name, self._current)
+        self._writer = None
+        for index in self._stale:
+            if index != self._shard_index:
+                self._shard_path(index).unlink(missing_ok=True)
+        self._stale = []
+
+    def discard(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            os.unlink(self._tmp_name)
+            self._writer = None
+
+    def write(self, relative_path: Path, content: str, **record) -> str:
+        incoming = len(content.encode("utf-8"))
+        if self._writer is not None and self._should_rotate(self._size, incoming):
+            self._publish()
+            self._shard_index += 1
+        if self._writer is None:
+            self._open_shard()
+
+        metadata = record.get("metadata", {})
+        row = {
+            "source": record.get("source"),
+            "parser": record.get("parser"),
+            "path": Path(relative_path).as_posix(),
+            "title": metadata.get("Title"),
+            "metadata": json.dumps(metadata, ensure_ascii=False),
+            "markdown": content,
+        }
+        for name in self._COLUMNS:
+            self._buffer[name].append(row[name])
+
+        index = self._rows
+        self._rows += 1
+        self._size += incoming
+        if len(self._buffer["source"]) >= self.row_group_size:
+            self._flush()
+        return f"{self._current}#{index}"
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._publish()
+
+
+def _has_content(path: Path, text: str) -> bool:
+    """Whether *path* holds exactly *text*, encoded as UTF-8."""
+    data = text.encode("utf-8")
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        return file_digest(path) == text_digest(text)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return False
+
+
+def _jsonl_line(relative_path: Path, content: str, record: dict) -> bytes:
+    return json.dumps(
+        {
+            "source": record.get("source"),
+            "parser": record.get("parser"),
+            "path": Path(relative_path).as_posix(),
+            "metadata": record.get("metadata", {}),
+            "markdown": content,
+        },
+        ensure_ascii=False,
+    ).encode("utf-8") + b"\n"
+
+
+#: Output formats accepted by :func:`open_sink`.
+SINK_FORMATS: tuple[str, ...] = ("md", "zip", "jsonl", "parquet")
+
+_BUNDLE_SUFFIXES = {"zip": ".zip", "jsonl": ".jsonl", "parquet": ".parquet"}
+
+
+def open_sink(
+    output: str | Path,
+    fmt: str = "md",
+    max_bytes: Optional[int] = None,
+    append: bool = False,
+) -> OutputSink:
+    """Create the sink for *fmt* writing to *output*.
+
+    Args:
+        output: Destination directory for ``"md"``, or the bundle file for
+                other formats (the format's suffix is added if missing).
+        fmt: One of :data:`SINK_FORMATS`.
+        max_bytes: Rotate ``jsonl`` / ``parquet`` output into numbered
+                   shards of roughly this size.
+        append: Extend an existing ``jsonl`` corpus instead of replacing it
+                (for resumed and queued batches).
+
+    Raises:
+        ValueError: If *fmt* is unknown, or *max_bytes* is given for a
+                    format that does not rotate.
+        ImportError: If ``"parquet"`` is requested without pyarrow.
+    """
+    output = Path(output)
+    if max_bytes is not None and fmt in ("md", "zip"):
+        raise ValueError(f"The {fmt} output format cannot be rotated; use jsonl or parquet")
+    if fmt == "md":
+        return DirectorySink(output)
+    if fmt not in _BUNDLE_SUFFIXES:
+        raise ValueError(
+            f"Unknown output format: {fmt!r}. Supported: {', '.join(SINK_FORMATS)}"
+        )
+
+    suffix = _BUNDLE_SUFFIXES[fmt]
+    if output.suffix != suffix:
+        output = output.with_suffix(suffix)
+    if fmt == "zip":
+        return ZipSink(output)
+    if fmt == "jsonl":
+        return JSONLSink(output, max_bytes=max_bytes, append=append)
+    return ParquetSink(output, max_bytes=max_bytes)
@@ -0,0 +1,276 @@
+"""Shared SQLite work queue for batch conversion across processes and nodes.
+
+Every participant (``batch-convert --queue jobs.db`` on any node) enqueues
+the same directory scan, idempotently, then repeatedly *claims* a few
+files under a time-limited lease, converts them and records the outcome
+in the database.  A background heartbeat extends the leases of files
+still being converted; when a node dies its leases simply expire and the
+files are claimed again by someone else.  Failed files are retried until
+they have been attempted ``max_attempts`` times.
+
+Paths are stored relative to the input directory, so nodes may mount the
+shared corpus at different locations.
+
+The database uses WAL journaling by default, which is safe for any
+number of processes on one host.  SQLite's WAL mode relies on shared
+memory and must not be used on a network filesystem; for a queue file
+on NFS pass ``journal_mode="delete"`` (``--queue-journal delete``), which
+relies only on the filesystem's POSIX locks (NFSv4 or a working lockd).
+"""
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    path          TEXT PRIMARY KEY,
+    status        TEXT NOT NULL DEFAULT 'pending',
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    location      TEXT,
+    error         TEXT,
+    updated       REAL
+);
+CREATE INDEX IF NOT EXISTS items_status ON items (status, lease_expires);
+"""
+
+
+def default_worker_id() -> str:
+    """``host:pid``, unique per process across the nodes of a run."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """Leased work items in a SQLite database shared by all workers.
+
+    Item states: ``pending`` → ``leased`` → ``done`` or ``failed``; a failed
+    attempt returns the item to ``pending`` while attempts remain.
+
+    Args:
+        path: Database file; created on first use.
+        lease_seconds: How long a claim stays valid without a heartbeat.
+        max_attempts: Attempts (including expired leases) before an item
+                      is marked ``failed``.
+        journal_mode: SQLite journal mode, ``"wal"`` or ``"delete"`` (see
+                      the module notes on network filesystems).
+        busy_timeout: Seconds to wait for another writer's lock.
+    """
+
+    JOURNAL_MODES = ("wal", "delete")
+
+    def __init__(
+        self,
+        path: str | Path,
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+        journal_mode: str = "wal",
+        busy_timeout: float = 60.0,
+    ) -> None:
+        if journal_mode not in self.JOURNAL_MODES:
+            raise ValueError(
+                f"Unknown journal mode: {journal_mode!r}. "
+                f"Supported: {', '.join(self.JOURNAL_MODES)}"
+            )
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.journal_mode = journal_mode
+        self.busy_timeout = busy_timeout
+        # sqlite3 connections are per thread (the heartbeat runs in its own).
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def enqueue(self, paths: Iterable[str | Path]) -> int:
+        """Add relative *paths*; already-known paths are left untouched.
+
+        Returns:
+            The number of newly added items.
+        """
+        rows = [(Path(p).as_posix(), time.time()) for p in paths]
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO items (path, updated) VALUES (?, ?)", rows
+            )
+            return conn.total_changes - before
+
+    def claim(self, worker_id: str, limit: int = 1) -> list[str]:
+        """Lease up to *limit* claimable items to *worker_id*.
+
+        Claimable items are pending ones and leased ones whose lease has
+        expired, taken in enqueue order.  Each claim counts as an attempt.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            # Expired leases that have used up their attempts fail for good.
+            conn.execute(
+                "UPDATE items SET status = 'failed', lease_owner = NULL, updated = ?,"
+                " error = COALESCE(error, 'lease expired') "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            paths = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT path FROM items WHERE status = 'pending'"
+                    " OR (status = 'leased' AND lease_expires < ?) ORDER BY rowid LIMIT ?",
+                    (now, limit),
+                )
+            ]
+            conn.executemany(
+                "UPDATE items SET status = 'leased', lease_owner = ?, lease_expires = ?,"
+                " attempts = attempts + 1, updated = ? WHERE path = ?",
+                [(worker_id, now + self.lease_seconds, now, p) for p in paths],
+            )
+        return paths
+
+    def heartbeat(self, worker_id: str, paths: Iterable[str]) -> None:
+        """Extend *worker_id*'s leases on *paths*."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE items SET lease_expires = ?, updated = ?"
+                " WHERE path = ? AND status = 'leased' AND lease_owner = ?",
+                [(now + self.lease_seconds, now, p, worker_id) for p in paths],
+            )
+
+    def complete(self, worker_id: str, path: str, location: str) -> None:
+        """Record a successful conversion of *path*, stored at *location*."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE items SET status = 'done', location = ?, error = NULL,"
+                " lease_owner = NULL, updated = ? WHERE path = ? AND lease_owner = ?",
+                (location, time.time(), path, worker_id),
+            )
+
+    def fail(self, worker_id: str, path: str, error: str) -> None:
+        """Record a failed attempt; the item is retried while attempts remain."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE items SET error = ?, lease_owner = NULL, updated = ?,"
+                " status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END"
+                " WHERE path = ? AND lease_owner = ?",
+                (error, time.time(), self.max_attempts, path, worker_id),
+            )
+
+    def leased_by_others(self, worker_id: str) -> int:
+        """Items leased to other workers, which may yet fail or expire."""
+        row = self._conn().execute(
+            "SELECT COUNT(*) FROM items WHERE status = 'leased' AND lease_owner != ?",
+            (worker_id,),
+        ).fetchone()
+        return row[0]
+
+    def counts(self) -> dict[str, int]:
+        """Number of items per status."""
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM items GROUP BY status")
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows.fetchall()))
+        return counts
+
+    def results(self) -> dict[str, str]:
+        """Outcome per finished item: its output location or error message."""
+        rows = self._conn().execute(
+            "SELECT path, status, location, error FROM items"
+            " WHERE status IN ('done', 'failed') ORDER BY path"
+        )
+        return {p: loc if s == "done" else err for p, s, loc, err in rows}
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, isolation_level=None
+            )
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._conn())
+
+
+class _Transaction:
+    """``BEGIN IMMEDIATE`` … ``COMMIT`` so claims never race between readers."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+class LeaseKeeper:
+    """Background thread that heartbeats the leases a worker currently holds.
+
+    Use as a context manager around the work; :meth:`hold` items when they
+    are claimed and :meth:`release` them once their outcome is recorded.
+    """
+
+    def __init__(self, queue: WorkQueue, worker_id: str, interval: Optional[float] = None) -> None:
+        self.queue = queue
+        self.worker_id = worker_id
+        self.interval = interval or max(queue.lease_seconds / 3, 0.05)
+        self._held: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+
+    def hold(self, paths: Iterable[str]) -> None:
+        with self._lock:
+            self._held.update(paths)
+
+    def release(self, path: str) -> None:
+        with self._lock:
+            self._held.discard(path)
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.wait(self.interval):
+                with self._lock:
+                    held = list(self._held)
+                if held:
+                    try:
+                        self.queue.heartbeat(self.worker_id, held)
+                    except sqlite3.Error as exc:
+                        logger.warning("Lease heartbeat failed: %s", exc)
+        finally:
+            self.queue.close()
@@ -0,0 +1,90 @@
+"""Tests for converting archive members without extraction."""
+
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from src.archives import ArchiveLimitError, ArchiveReader, is_archive
+from src.converter import UniversalMarkdownConverter
+
+
+def _tar_gz(members):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tf:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+@pytest.fixture
+def share(tmp_path):
+    src = tmp_path / "in"
+    src.mkdir()
+    (src / "loose.txt").write_text("loose file", encoding="utf-8")
+    inner = _tar_gz({"notes/b.txt": b"inside the tarball", "skip.bin": b"\x00"})
+    with zipfile.ZipFile(src / "bundle.zip", "w") as zf:
+        zf.writestr("docs/a.csv", "x,y\n1,2\n")
+        zf.writestr("../escape.txt", "no way out")
+        zf.writestr("inner.tar.gz", inner)
+        zf.writestr("docs/", "")
+    return src
+
+
+class TestArchiveReader:
+    def test_members(self, share):
+        members = {
+            m.path.relative_to(share).as_posix(): m.data
+            for m in ArchiveReader().members(share / "bundle.zip")
+        }
+        assert members == {
+            "bundle.zip/docs/a.csv": b"x,y\n1,2\n",
+            "bundle.zip/escape.txt": b"no way out",
+            "bundle.zip/inner.tar.gz/notes/b.txt": b"inside the tarball",
+        }
+
+    def test_depth_limit(self, share):
+        paths = [m.path.name for m in ArchiveReader(max_depth=1).members(share / "bundle.zip")]
+        assert paths == ["a.csv", "escape.txt"]
+
+    def test_decompressed_size_cap(self, tmp_path):
+        path = tmp_path / "bomb.zip"
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("zeros.txt", b"\x00" * (4 << 20))
+        assert path.stat().st_size < 64 << 10
+        with pytest.raises(ArchiveLimitError, match="more than 1048576 bytes"):
+            list(ArchiveReader(max_bytes=1 << 20, chunk_size=1 << 16).members(path))
+
+    def test_is_archive(self):
+        assert is_archive("a.TAR.GZ") and is_archive("b.zip") and not is_archive("c.gz")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_converts_members(share, tmp_path, workers):
+    out = tmp_path / "out"
+    results = UniversalMarkdownConverter().batch_convert(share, out, workers=workers)
+
+    written = sorted(p.relative_to(out).as_posix() for p in out.rglob("*.md"))
+    assert written == [
+        "bundle.zip/docs/a.md",
+        "bundle.zip/escape.md",
+        "bundle.zip/inner.tar.gz/notes/b.md",
+        "loose.md",
+    ]
+    assert "inside the tarball" in (out / "bundle.zip/inner.tar.gz/notes/b.md").read_text()
+    assert str(share / "bundle.zip" / "docs" / "a.csv") in results
+
+
+def test_batch_reports_bad_archives(share, tmp_path):
+    (share / "broken.tar.gz").write_bytes(b"not gzip")
+    conv = UniversalMarkdownConverter()
+    results = conv.batch_convert(share, tmp_path / "out", archives=ArchiveReader(max_bytes=20))
+    assert isinstance(results[str(share / "bundle.zip")], ArchiveLimitError)
+    assert isinstance(results[str(share / "broken.tar.gz")], tarfile.TarError)
+    assert isinstance(results[str(share / "loose.txt")], str)
+
+    results = conv.batch_convert(share, tmp_path / "plain", archives=False)
+    assert list(results) == [str(share / "loose.txt")]
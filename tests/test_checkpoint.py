@@ -0,0 +1,115 @@
+"""Tests for resumable batch runs."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.checkpoint import CheckpointJournal, PriorFailure
+from src.cli import main
+from src.converter import UniversalMarkdownConverter
+from src.utils.output_sink import JSONLSink
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    src = tmp_path / "corpus"
+    src.mkdir()
+    for name in ("a", "b", "c"):
+        (src / f"{name}.txt").write_text(f"text {name}", encoding="utf-8")
+    (src / "bad.pdf").write_bytes(b"not a pdf")
+    return src
+
+
+class TestCheckpointJournal:
+    def test_roundtrip_and_partial_line(self, tmp_path):
+        path = tmp_path / "run.journal"
+        with CheckpointJournal(path, flush_interval=60) as journal:
+            journal.record("a.txt", "out/a.md")
+            journal.record("sub/b.txt", ValueError("boom"))
+        with path.open("ab") as fh:
+            fh.write(b'{"path": "c.t')  # killed mid-write
+
+        journal = CheckpointJournal(path, resume=True)
+        journal.record("d.txt", "out/d.md")
+        journal.close()
+
+        assert journal.completed["a.txt"] == "out/a.md"
+        assert isinstance(journal.completed["sub/b.txt"], PriorFailure)
+        assert "ValueError: boom" in str(journal.completed["sub/b.txt"])
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[-1])["path"] == "d.txt"
+
+    def test_without_resume_starts_over(self, tmp_path):
+        path = tmp_path / "run.journal"
+        path.write_text('{"path": "a.txt", "location": "x"}\n', encoding="utf-8")
+        with CheckpointJournal(path) as journal:
+            assert journal.completed == {}
+        assert path.read_bytes() == b""
+
+
+class TestResume:
+    def test_resume_skips_finished_and_replays_failures(self, corpus, tmp_path):
+        out = tmp_path / "out"
+        journal = tmp_path / "run.journal"
+        journal.write_text(
+            json.dumps({"path": "a.txt", "location": str(out / "a.md")}) + "\n"
+            + json.dumps({"path": "bad.pdf", "error": "RuntimeError: old"}) + "\n",
+            encoding="utf-8",
+        )
+
+        results = UniversalMarkdownConverter().batch_convert(
+            corpus, out, resume=True, journal=journal
+        )
+
+        assert not (out / "a.md").exists()  # not converted again
+        assert (out / "b.md").exists() and (out / "c.md").exists()
+        assert results[str(corpus / "a.txt")] == str(out / "a.md")
+        assert "old" in str(results[str(corpus / "bad.pdf")])
+        assert len(journal.read_text(encoding="utf-8").splitlines()) == 4
+
+    def test_rejects_non_durable_sink(self, corpus, tmp_path):
+        with pytest.raises(ValueError, match="checkpointing"):
+            UniversalMarkdownConverter().batch_convert(
+                corpus, tmp_path / "out.zip", output_format="zip", resume=True
+            )
+
+    def test_jsonl_resume_after_crash_has_no_duplicates(self, corpus, tmp_path, monkeypatch):
+        out = tmp_path / "out.jsonl"
+        journal = tmp_path / "out.jsonl.journal"
+        write = JSONLSink.write
+        calls = []
+
+        def crash_on_third(self, *args, **kwargs):
+            calls.append(1)
+            if len(calls) == 3:
+                # Every record already in the corpus is in the journal.
+                assert journal.read_text(encoding="utf-8").count('"location"') == 2
+                raise KeyboardInterrupt
+            return write(self, *args, **kwargs)
+
+        monkeypatch.setattr(JSONLSink, "write", crash_on_third)
+        conv = UniversalMarkdownConverter()
+        with pytest.raises(KeyboardInterrupt):
+            conv.batch_convert(corpus, out, output_format="jsonl", resume=True)
+        monkeypatch.setattr(JSONLSink, "write", write)
+
+        conv.batch_convert(corpus, out, output_format="jsonl", resume=True)
+        sources = [Path(json.loads(line)["source"]).name for line in out.read_text().splitlines()]
+        assert sorted(sources) == ["a.txt", "b.txt", "c.txt"]
+
+    def test_cli_resume(self, corpus, tmp_path, capsys):
+        out = tmp_path / "out"
+        argv = ["batch-convert", str(corpus), "-o", str(out)]
+        assert main(argv) == 1
+        assert not (tmp_path / "out.journal").exists()  # only kept with --resume
+
+        assert main(argv + ["--resume"]) == 1
+        assert (tmp_path / "out.journal").exists()
+        (out / "b.md").unlink()
+        assert main(argv + ["--resume"]) == 1
+        assert not (out / "b.md").exists()
+        assert "Done: 3 converted, 1 failed" in capsys.readouterr().out.splitlines()[-1]
+
+        assert main(argv) == 1  # starts over
+        assert not (tmp_path / "out.journal").exists()
@@ -0,0 +1,115 @@
+"""Tests for stable chunk IDs and chunk deltas."""
+
+import json
+import random
+
+import pytest
+
+from src.chunking import ChunkFeed, chunk_markdown, read_documents
+from src.cli import main
+
+_WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda".split()
+
+
+def _paragraph(rng):
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(10, 80))) + "."
+
+
+def _document(pages=40, seed=0):
+    rng = random.Random(seed)
+    body = "\n\n".join(
+        f"## Page {p}\n\n" + "\n\n".join(_paragraph(rng) for _ in range(rng.randint(3, 10)))
+        for p in range(1, pages + 1)
+    )
+    return "# Report\n\n*Source: report.pdf*\n*Converted: 2026-01-01 00:00 UTC*\n\n---\n\n" + body
+
+
+class TestChunkMarkdown:
+    def test_headings_and_header(self):
+        md = (
+            "# Guide\n\n*Source: g.md*\n\n---\n\nIntro.\n\n## Setup\n\n### Linux\n\n"
+            "Install it.\n\n```sh\n# not a heading\n\nmake\n```\n\n## Use\n\nRun it.\n"
+        )
+        chunks = chunk_markdown(md, "g.md")
+        assert [c.headings for c in chunks] == [
+            ("Guide",), ("Guide", "Setup", "Linux"), ("Guide", "Use")
+        ]
+        assert chunks[0].text == "Intro."
+        assert chunks[1].text.startswith("### Linux\n\nInstall it.")
+        assert "# not a heading\n\nmake\n```" in chunks[1].text
+
+    def test_size_limits(self):
+        chunks = chunk_markdown(_document(), "r", max_chars=600)
+        # Only a heading with one long paragraph may run over.
+        assert all(len(c.text) <= 600 or c.text.count("\n\n") <= 1 for c in chunks)
+        assert len({c.id for c in chunks}) == len(chunks)
+
+    def test_ids_ignore_header_and_position(self):
+        doc = _document()
+        restamped = doc.replace("2026-01-01", "2026-02-02")
+        assert chunk_markdown(doc, "r") == chunk_markdown(restamped, "r")
+        assert chunk_markdown(doc, "r")[0].id != chunk_markdown(doc, "other")[0].id
+
+    def test_local_edit_changes_few_chunks(self):
+        doc = _document(seed=1)
+        before = {c.id for c in chunk_markdown(doc, "r")}
+        paragraphs = doc.split("\n\n")
+        middle = len(paragraphs) // 2
+        paragraphs.insert(middle, "A paragraph added in the middle of a section.")
+        paragraphs[-1] += " And a change at the end."
+        after = {c.id for c in chunk_markdown("\n\n".join(paragraphs), "r")}
+        assert len(after - before) <= 4
+        assert len(before & after) >= len(before) - 4
+
+
+class TestChunkFeed:
+    def test_delta(self, tmp_path):
+        manifest = tmp_path / "chunks.json"
+        doc = "# A\n\n---\n\n## One\n\nFirst.\n\n## Two\n\nSecond.\n"
+        feed = ChunkFeed(manifest)
+        assert [e["op"] for e in feed.update("a", doc)] == ["add", "add"]
+        feed.update("gone", "Old text.")
+        feed.save()
+
+        feed = ChunkFeed(manifest)
+        changed = doc.replace("Second.", "Second, revised.") + "\n## Three\n\nThird.\n"
+        events = feed.update("a", changed) + feed.finish()
+        ops = [(e["op"], e["headings"]) for e in events]
+        assert ops == [
+            ("modify", ["A", "Two"]),
+            ("add", ["A", "Three"]),
+            ("remove", []),
+        ]
+        assert events[0]["text"] == "## Two\n\nSecond, revised."
+        assert events[0]["replaces"] == json.loads(manifest.read_text())["a"][1]["id"]
+        assert feed.counts == {"unchanged": 1, "modify": 1, "add": 1, "remove": 1}
+
+    def test_save_needs_manifest(self):
+        with pytest.raises(ValueError):
+            ChunkFeed().save()
+
+
+def test_read_documents(tmp_path):
+    (tmp_path / "md" / "sub").mkdir(parents=True)
+    (tmp_path / "md" / "sub" / "x.md").write_text("X", encoding="utf-8")
+    assert list(read_documents(tmp_path / "md")) == [("sub/x.md", "X")]
+    corpus = tmp_path / "c.jsonl"
+    corpus.write_text(json.dumps({"source": "in/y.txt", "markdown": "Y"}) + "\n")
+    assert list(read_documents(corpus)) == [("in/y.txt", "Y")]
+
+
+def test_cli(tmp_path, capsys):
+    src = tmp_path / "in"
+    src.mkdir()
+    (src / "a.txt").write_text("First paragraph.\n\nSecond paragraph.\n", encoding="utf-8")
+    out = tmp_path / "out"
+    assert main(["batch-convert", str(src), "-o", str(out)]) == 0
+    argv = ["chunk", str(out), "--manifest", str(tmp_path / "m.json"), "-o"]
+    assert main(argv + [str(tmp_path / "first.jsonl")]) == 0
+    assert main(["batch-convert", str(src), "-o", str(out)]) == 0  # header may change
+    assert main(argv + [str(tmp_path / "second.jsonl")]) == 0
+
+    first = [json.loads(line) for line in open(tmp_path / "first.jsonl")]
+    assert [(e["op"], e["source"]) for e in first] == [("add", "a.md")]
+    assert (tmp_path / "second.jsonl").read_text() == ""
+    assert "0 added, 0 modified, 0 removed, 1 unchanged" in capsys.readouterr().err
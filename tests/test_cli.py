@@ -0,0 +1,158 @@
+"""Tests for the command-line interface and the parallel executor."""
+
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.cli import main
+from src.converter import UniversalMarkdownConverter
+from src.executor import ConversionExecutor
+
+
+def _stdin(monkeypatch, data: bytes):
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+
+
+def _stdout():
+    """A stand-in for sys.stdout exposing a binary ``buffer``."""
+    return io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    (tmp_path / "a.csv").write_text("x,y\n1,2\n", encoding="utf-8")
+    (tmp_path / "b c.txt").write_text("spaced name", encoding="utf-8")
+    (tmp_path / "skip.xyz").write_text("nope", encoding="utf-8")
+    return tmp_path
+
+
+class TestFilesFrom:
+    def test_nul_delimited_list_to_jsonl(self, inputs, monkeypatch):
+        names = ["a.csv", "skip.xyz", "b c.txt"]
+        _stdin(monkeypatch, b"\0".join(str(inputs / n).encode() for n in names) + b"\0")
+        out = _stdout()
+        monkeypatch.setattr(sys, "stdout", out)
+
+        rc = main(["convert", "--files-from", "-", "-0", "-j", "2", "--format", "jsonl"])
+
+        out.flush()
+        records = [json.loads(line) for line in out.buffer.getvalue().splitlines()]
+        assert rc == 1  # skip.xyz failed
+        assert [r["parser"] for r in records] == ["csv", "text"]
+        assert "spaced name" in records[1]["markdown"]
+
+    def test_newline_list_to_markdown_file(self, inputs, tmp_path):
+        listing = tmp_path / "files.txt"
+        listing.write_text(f"{inputs / 'a.csv'}\r\n\n{inputs / 'b c.txt'}", encoding="utf-8")
+        out = tmp_path / "all.md"
+
+        assert main(["convert", "--files-from", str(listing), "-o", str(out)]) == 0
+
+        text = out.read_text(encoding="utf-8")
+        assert text.index("| x | y |") < text.index("spaced name")
+
+    def test_stdout_is_only_json_lines(self, inputs):
+        # Run in a fresh interpreter: a notice printed while the parsers are
+        # first imported would land in the stream.
+        fitz = pytest.importorskip("fitz")
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), "Streamed PDF")
+        doc.save(inputs / "d.pdf")
+        listing = "\n".join(str(inputs / n) for n in ("d.pdf", "a.csv"))
+        result = subprocess.run(
+            [sys.executable, "-m", "src", "convert", "--files-from", "-", "--format", "jsonl"],
+            input=listing.encode(),
+            capture_output=True,
+            cwd=Path(__file__).resolve().parents[1],
+            check=True,
+        )
+        records = [json.loads(line) for line in result.stdout.decode().splitlines()]
+        assert [r["parser"] for r in records] == ["pdf", "csv"]
+
+    def test_requires_input_or_list(self, capsys):
+        assert main(["convert"]) == 1
+        assert "either INPUT or --files-from" in capsys.readouterr().err
+
+
+class TestFileInput:
+    def test_file_to_jsonl(self, inputs, monkeypatch):
+        _stdin(monkeypatch, b"STDIN DATA")
+        out = _stdout()
+        monkeypatch.setattr(sys, "stdout", out)
+
+        assert main(["convert", str(inputs / "b c.txt"), "--format", "jsonl"]) == 0
+
+        out.flush()
+        (record,) = [json.loads(line) for line in out.buffer.getvalue().splitlines()]
+        assert record["source"] == str(inputs / "b c.txt")
+        assert "spaced name" in record["markdown"] and "STDIN" not in record["markdown"]
+
+    def test_type_needs_stdin(self, inputs, capsys):
+        assert main(["convert", str(inputs / "a.csv"), "--type", "text"]) == 1
+        assert "--type only applies" in capsys.readouterr().err
+
+
+class TestStdin:
+    def test_typed_stdin(self, monkeypatch):
+        _stdin(monkeypatch, b"k,v\n1,2\n")
+        out = _stdout()
+        monkeypatch.setattr(sys, "stdout", out)
+
+        assert main(["convert", "-", "--type", "csv"]) == 0
+
+        out.flush()
+        md = out.buffer.getvalue().decode()
+        assert "*Source: stdin.csv*" in md and "| k | v |" in md
+
+    def test_sniffed_stdin_jsonl(self, monkeypatch):
+        _stdin(monkeypatch, b'[{"a": 1}]')
+        out = _stdout()
+        monkeypatch.setattr(sys, "stdout", out)
+
+        assert main(["convert", "-", "--format", "jsonl"]) == 0
+
+        out.flush()
+        record = json.loads(out.buffer.getvalue())
+        assert record["parser"] == "json" and "| a |" in record["markdown"]
+
+    def test_unknown_type(self, monkeypatch, capsys):
+        _stdin(monkeypatch, b"x")
+        assert main(["convert", "-", "--type", "nope"]) == 1
+        assert "Unknown --type" in capsys.readouterr().err
+
+
+class TestConversionExecutor:
+    def test_results_in_input_order(self, inputs):
+        paths = [inputs / "b c.txt", inputs / "missing.txt", inputs / "a.csv"]
+        results = list(ConversionExecutor(workers=2, max_pending=1).map_records(paths))
+        assert [p for p, _ in results] == paths
+        assert isinstance(results[1][1], FileNotFoundError)
+        assert results[2][1]["parser"] == "csv"
+
+    def test_threads_take_cheap_parsers(self, inputs, monkeypatch):
+        import src.executor as executor_module
+
+        threaded = []
+        run = executor_module._run
+
+        def spy(converter, item, chunks):
+            threaded.append(item.name)
+            return run(converter, item, chunks)
+
+        monkeypatch.setattr(executor_module, "_run", spy)
+        paths = [inputs / "a.csv", inputs / "b c.txt", inputs / "a.csv"]
+        executor = ConversionExecutor(workers=1, threads=2)
+        assert not executor.in_process and executor.concurrency == 3
+        results = list(executor.map_records(paths, ordered=False))
+        assert sorted(r["parser"] for _, r in results) == ["csv", "csv", "text"]
+        assert threaded == ["b c.txt"]  # the CSV files went to the process
+
+    def test_parallel_batch_convert(self, inputs, tmp_path):
+        out = tmp_path / "out"
+        results = UniversalMarkdownConverter().batch_convert(inputs, out, workers=2)
+        assert sorted(p.name for p in out.iterdir()) == ["a.md", "b c.md"]
+        assert len(results) == 2
@@ -0,0 +1,50 @@
+"""Tests for streaming column statistics."""
+
+from src.utils.column_stats import ColumnStats, TableProfile
+
+
+class TestColumnStats:
+    def test_type_widens_across_chunks(self):
+        stats = ColumnStats("v")
+        stats.update(["1", "2", ""])
+        assert stats.kind == "integer"
+        stats.update(["2.5"])
+        assert stats.kind == "float"
+        cells = stats.summary_cells()
+        assert cells[2:6] == ["1", "1", "2.5", "1.83333"]
+        stats.update(["abc"])
+        assert stats.kind == "text"
+        assert stats.summary_cells()[3:6] == ["", "", ""]
+
+    def test_boolean_and_date(self):
+        flags = ColumnStats("f")
+        flags.update(["true", "False", "yes"])
+        assert flags.kind == "boolean"
+        dates = ColumnStats("d")
+        dates.update(["2024-01-02", "2023-12-31T10:00:00Z"])
+        assert dates.kind == "date"
+        assert dates.summary_cells()[3] == "2023-12-31T10:00:00Z"
+
+    def test_top_values_are_bounded(self):
+        stats = ColumnStats("id", max_tracked=100)
+        for start in range(0, 1000, 100):
+            stats.update([str(i) for i in range(start, start + 100)] + ["7"] * 5)
+        assert len(stats._counter) <= 100
+        assert stats.summary_cells()[6].startswith("7 (")
+
+
+class TestTableProfile:
+    def test_sample_is_uniform_and_ordered(self):
+        profile = TableProfile(["n"], sample_size=10)
+        profile.consume(([str(i)] for i in range(10_000)), chunk_size=777)
+        indices = [i for i, _ in profile._sample]
+        assert profile.rows == 10_000
+        assert len(indices) == 10 and len(set(indices)) == 10
+        assert max(indices) > 1000  # not just the head of the file
+        assert all(row == [str(i)] for i, row in profile._sample)
+
+    def test_ragged_rows_are_padded(self):
+        profile = TableProfile(["a", "b"], sample_size=5)
+        profile.update([["1"], ["2", "3", "4"]])
+        assert profile.columns[1].nulls == 1
+        assert "| 2 | 3 |" in profile.to_markdown()
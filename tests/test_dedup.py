@@ -0,0 +1,114 @@
+"""Tests for duplicate detection in batch runs."""
+
+import json
+import os
+import random
+
+import pytest
+
+from src.cli import main
+from src.converter import UniversalMarkdownConverter
+from src.dedup import Deduplicator, Duplicate, file_digest
+from src.utils.output_sink import Unchanged
+
+
+def _prose(seed, words=400):
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(500)]
+    return " ".join(rng.choice(vocab) for _ in range(words))
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    src = tmp_path / "share"
+    (src / "copies").mkdir(parents=True)
+    report = _prose(1)
+    (src / "report.txt").write_text(report, encoding="utf-8")
+    (src / "copies" / "report.txt").write_text(report, encoding="utf-8")
+    words = report.split()
+    words[100:103] = ["revised", "figures", "here"]
+    (src / "report-v2.txt").write_text(" ".join(words), encoding="utf-8")
+    (src / "other.txt").write_text(_prose(2), encoding="utf-8")
+    return src
+
+
+class TestDeduplicator:
+    def test_exact(self, tmp_path):
+        a, b, c = (tmp_path / n for n in ("a", "b", "c"))
+        a.write_bytes(b"same")
+        b.write_bytes(b"same")
+        c.write_bytes(b"diff")
+        dedup = Deduplicator("exact")
+        assert [dedup.check_file(p) for p in (a, b, c)] == [None, a, None]
+        assert file_digest(a) == file_digest(b) != file_digest(c)
+
+    def test_near(self, tmp_path):
+        text = _prose(3)
+        words = text.split()
+        words[10] = "changed"
+        dedup = Deduplicator()
+        assert dedup.check_text(tmp_path / "a", text) is None
+        assert dedup.check_text(tmp_path / "b", _prose(4)) is None
+        original, similarity = dedup.check_text(tmp_path / "c", " ".join(words))
+        assert original == tmp_path / "a" and 0.8 <= similarity < 1.0
+        assert Deduplicator("exact").check_text(tmp_path / "a", text) is None
+
+    def test_bad_arguments(self):
+        with pytest.raises(ValueError, match="Unknown dedup mode"):
+            Deduplicator("fuzzy")
+        with pytest.raises(ValueError, match="must divide"):
+            Deduplicator(num_perm=64, bands=10)
+
+
+def test_batch_aliases_copies(corpus, tmp_path):
+    out = tmp_path / "out"
+    dedup = Deduplicator()
+    conv = UniversalMarkdownConverter()
+    results = conv.batch_convert(corpus, out, dedup=dedup)
+
+    # Files go in path order, so copies/report.txt is converted first.
+    original, copy = out / "copies" / "report.md", out / "report.md"
+    assert results[str(corpus / "report.txt")] == str(copy)
+    assert os.path.samefile(copy, original)
+    assert dedup.exact == {corpus / "report.txt": corpus / "copies" / "report.txt"}
+    report = dedup.report(corpus)
+    assert [(e["path"], e["duplicate_of"]) for e in report["near"]] == [
+        ("report-v2.txt", "copies/report.txt")
+    ]
+
+
+def test_batch_results_mark_duplicates(corpus, tmp_path):
+    out = tmp_path / "out"
+    results = UniversalMarkdownConverter(deterministic=True).batch_convert(
+        corpus, out, dedup=Deduplicator()
+    )
+    marked = {p: v for p, v in results.items() if isinstance(v, Duplicate)}
+    assert sorted(marked) == [str(corpus / "report-v2.txt"), str(corpus / "report.txt")]
+    copy, near = marked[str(corpus / "report.txt")], marked[str(corpus / "report-v2.txt")]
+    assert copy.original == near.original == corpus / "copies" / "report.txt"
+    assert copy.similarity == 1.0 and 0.8 <= near.similarity < 1.0
+    assert near == str(out / "report-v2.md")
+
+    again = UniversalMarkdownConverter(deterministic=True).batch_convert(
+        corpus, out, dedup=Deduplicator()
+    )
+    near = again[str(corpus / "report-v2.txt")]
+    assert isinstance(near, Duplicate) and isinstance(near, Unchanged)
+
+
+def test_batch_jsonl_keeps_one_record(corpus, tmp_path):
+    out = tmp_path / "out.jsonl"
+    results = UniversalMarkdownConverter().batch_convert(
+        corpus, out, output_format="jsonl", dedup=Deduplicator("exact")
+    )
+    assert results[str(corpus / "copies" / "report.txt")] == results[str(corpus / "report.txt")]
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_cli_report(corpus, tmp_path, capsys):
+    out = tmp_path / "out"
+    assert main(["batch-convert", str(corpus), "-o", str(out), "--dedup", "near"]) == 0
+    assert "Duplicates: 1 exact, 1 near" in capsys.readouterr().out
+    report = json.loads((tmp_path / "out.duplicates.json").read_text(encoding="utf-8"))
+    assert report["exact"] == [{"path": "report.txt", "duplicate_of": "copies/report.txt"}]
+    assert report["near"][0]["similarity"] >= 0.8
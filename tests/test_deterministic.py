@@ -0,0 +1,100 @@
+"""Tests for reproducible output and unchanged-output detection."""
+
+import os
+
+import pytest
+
+from src.cli import main
+from src.converter import UniversalMarkdownConverter
+from src.utils.digest import file_digest, text_digest
+from src.utils.output_sink import DirectorySink, Unchanged
+
+
+@pytest.fixture
+def docs(tmp_path):
+    src = tmp_path / "in"
+    src.mkdir()
+    (src / "a.txt").write_text("Alpha notes.\n", encoding="utf-8")
+    (src / "b.csv").write_text("x,y\n1,2\n3,4\n", encoding="utf-8")
+    return src
+
+
+class TestDeterministicRecords:
+    def test_header(self, docs):
+        record = UniversalMarkdownConverter(deterministic=True).convert_record(docs / "a.txt")
+        meta = record["metadata"]
+        assert "Converted" not in meta
+        assert meta["Source digest"] == file_digest(docs / "a.txt")
+        assert list(meta)[-1] == "Digest"
+        without = record["markdown"].replace(f"*Digest: {meta['Digest']}*\n", "")
+        assert meta["Digest"] == text_digest(without)
+
+    def test_reproducible(self, docs):
+        first = UniversalMarkdownConverter(deterministic=True).convert(docs / "b.csv")
+        second = UniversalMarkdownConverter(deterministic=True).convert(docs / "b.csv")
+        assert first == second
+        assert "*Converted:" in UniversalMarkdownConverter().convert(docs / "b.csv")
+
+    def test_bytes_and_chunks(self, docs):
+        conv = UniversalMarkdownConverter(deterministic=True)
+        data = (docs / "b.csv").read_bytes()
+        from_bytes = conv.convert_bytes(data, "b.csv")
+        assert from_bytes == conv.convert(docs / "b.csv")
+        chunks = list(conv.convert_chunks(docs / "b.csv"))
+        assert chunks[0]["metadata"]["Source digest"] == file_digest(docs / "b.csv")
+
+
+class TestUnchangedOutput:
+    def test_sink_skips_identical_content(self, tmp_path):
+        sink = DirectorySink(tmp_path)
+        meta = {"Title": "T", "Digest": "abc"}
+        content = "# T\n\n*Digest: abc*  \n\n---\n\nbody\n"
+        assert not isinstance(sink.write("t.md", content, metadata=meta), Unchanged)
+        location = sink.write("t.md", content, metadata=meta)
+        assert isinstance(location, Unchanged) and location == str(tmp_path / "t.md")
+        sink.write("t.md", "new", metadata={"Digest": "def"})
+        assert (tmp_path / "t.md").read_text() == "new"
+
+    @pytest.mark.parametrize("damage", ["edit", "truncate"])
+    def test_sink_repairs_damaged_body(self, tmp_path, damage):
+        sink = DirectorySink(tmp_path)
+        meta = {"Title": "T", "Digest": "abc"}
+        content = "# T\n\n*Digest: abc*  \n\n---\n\nbody\n"
+        sink.write("t.md", content, metadata=meta)
+        damaged = content.replace("body", "bady") if damage == "edit" else content[:-3]
+        (tmp_path / "t.md").write_text(damaged)
+        assert not isinstance(sink.write("t.md", content, metadata=meta), Unchanged)
+        assert (tmp_path / "t.md").read_text() == content
+
+    def test_convert_to_file(self, docs, tmp_path):
+        out = tmp_path / "a.md"
+        conv = UniversalMarkdownConverter(deterministic=True)
+        md = conv.convert(docs / "a.txt", out)
+        os.utime(out, (0, 0))
+        assert conv.convert(docs / "a.txt", out) == md
+        assert out.stat().st_mtime == 0
+        (docs / "a.txt").write_text("Beta notes.\n", encoding="utf-8")
+        conv.convert(docs / "a.txt", out)
+        assert "Beta notes." in out.read_text()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_batch_reports_unchanged(self, docs, tmp_path, workers):
+        out = tmp_path / "out"
+        conv = UniversalMarkdownConverter(deterministic=True)
+        first = conv.batch_convert(docs, out, workers=workers)
+        assert not any(isinstance(v, Unchanged) for v in first.values())
+        os.utime(out / "a.md", (0, 0))
+
+        (docs / "b.csv").write_text("x,y\n1,2\n5,6\n", encoding="utf-8")
+        second = conv.batch_convert(docs, out, workers=workers)
+        assert isinstance(second[str(docs / "a.txt")], Unchanged)
+        assert not isinstance(second[str(docs / "b.csv")], Unchanged)
+        assert (out / "a.md").stat().st_mtime == 0
+        assert "5 | 6" in (out / "b.md").read_text()
+
+    def test_cli(self, docs, tmp_path, capsys):
+        out = tmp_path / "out"
+        argv = ["batch-convert", str(docs), "-o", str(out), "--deterministic"]
+        assert main(argv) == 0
+        assert main(argv) == 0
+        assert "Done: 0 converted, 2 unchanged, 0 failed" in capsys.readouterr().out
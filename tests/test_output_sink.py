@@ -0,0 +1,216 @@
+"""Tests for the output sinks."""
+
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from src.converter import UniversalMarkdownConverter
+from src.utils.output_sink import (
+    DirectorySink,
+    JSONLSink,
+    ParquetSink,
+    ZipSink,
+    atomic_write_text,
+    open_sink,
+)
+
+
+class TestAtomicWrite:
+    def test_writes_content_and_leaves_no_temp_files(self, tmp_path):
+        dest = tmp_path / "doc.md"
+        atomic_write_text(dest, "hello")
+        assert dest.read_text(encoding="utf-8") == "hello"
+        assert [p.name for p in tmp_path.iterdir()] == ["doc.md"]
+
+    def test_failed_write_keeps_previous_file(self, tmp_path):
+        dest = tmp_path / "doc.md"
+        dest.write_text("old", encoding="utf-8")
+
+        class Boom:
+            def __str__(self):
+                raise RuntimeError("boom")
+
+        with pytest.raises(TypeError):
+            atomic_write_text(dest, Boom())  # type: ignore[arg-type]
+        assert dest.read_text(encoding="utf-8") == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["doc.md"]
+
+
+    def test_permissions_match_a_plain_write(self, tmp_path):
+        plain = tmp_path / "plain"
+        plain.write_text("x")
+        dest = tmp_path / "doc.md"
+        atomic_write_text(dest, "new")
+        assert dest.stat().st_mode & 0o777 == plain.stat().st_mode & 0o777
+        dest.chmod(0o640)
+        atomic_write_text(dest, "again")
+        assert dest.stat().st_mode & 0o777 == 0o640
+
+    def test_zip_permissions(self, tmp_path):
+        with ZipSink(tmp_path / "out.zip") as sink:
+            sink.write(Path("a.md"), "a")
+        plain = tmp_path / "plain"
+        plain.write_text("x")
+        assert (tmp_path / "out.zip").stat().st_mode & 0o777 == plain.stat().st_mode & 0o777
+
+
+class TestDirectorySink:
+    def test_reuses_created_directories(self, tmp_path, monkeypatch):
+        sink = DirectorySink(tmp_path / "out")
+        calls = []
+        original = Path.mkdir
+
+        def counting_mkdir(self, *args, **kwargs):
+            calls.append(self)
+            return original(self, *args, **kwargs)
+
+        sink.write(Path("deep/tree/a.md"), "a.md")
+        monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+        for name in ("b.md", "c.md"):
+            sink.write(Path("deep/tree") / name, name)
+
+        assert calls == []
+        assert (tmp_path / "out" / "deep" / "tree" / "b.md").read_text() == "b.md"
+
+
+class TestZipSink:
+    def test_bundles_documents(self, tmp_path):
+        archive = tmp_path / "corpus.zip"
+        with ZipSink(archive) as sink:
+            loc = sink.write(Path("sub/a.md"), "# A\n")
+            sink.write(Path("b.md"), "# B\n")
+            assert not archive.exists()  # only published on close
+
+        assert loc == f"{archive}!/sub/a.md"
+        with zipfile.ZipFile(archive) as zf:
+            assert sorted(zf.namelist()) == ["b.md", "sub/a.md"]
+            assert zf.read("sub/a.md").decode() == "# A\n"
+
+    def test_failed_run_is_not_published(self, tmp_path):
+        archive = tmp_path / "corpus.zip"
+        with pytest.raises(RuntimeError):
+            with ZipSink(archive) as sink:
+                sink.write(Path("a.md"), "# A\n")
+                raise RuntimeError("interrupted")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_rotation_needs_a_record_format(self, tmp_path):
+        for fmt in ("md", "zip"):
+            with pytest.raises(ValueError, match="cannot be rotated"):
+                open_sink(tmp_path / "out", fmt, max_bytes=1 << 20)
+
+    def test_open_sink_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown output format"):
+            open_sink(tmp_path, "tar")
+
+
+class TestBatchConvertSinks:
+    def test_batch_convert_to_zip(self, tmp_path):
+        src = tmp_path / "input"
+        (src / "nested").mkdir(parents=True)
+        (src / "a.txt").write_text("File A", encoding="utf-8")
+        (src / "nested" / "b.csv").write_text("x,y\n1,2\n", encoding="utf-8")
+
+        results = UniversalMarkdownConverter().batch_convert(
+            src, tmp_path / "bundle", output_format="zip"
+        )
+
+        assert all(isinstance(v, str) for v in results.values())
+        with zipfile.ZipFile(tmp_path / "bundle.zip") as zf:
+            assert sorted(zf.namelist()) == ["a.md", "nested/b.md"]
+
+
+class TestJSONLSink:
+    def test_appends_one_record_per_document(self, tmp_path):
+        corpus = tmp_path / "corpus.jsonl"
+        with JSONLSink(corpus) as sink:
+            sink.write(Path("a.md"), "# A\n", source="in/a.txt", parser="text",
+                       metadata={"Title": "A"})
+        with JSONLSink(corpus, append=True) as sink:
+            loc = sink.write(Path("b.md"), "# B\n", source="in/b.txt", parser="text")
+
+        lines = corpus.read_text(encoding="utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [r["path"] for r in records] == ["a.md", "b.md"]
+        assert records[0]["metadata"] == {"Title": "A"}
+        offset = int(loc.rsplit("@", 1)[1])
+        with corpus.open("rb") as fh:
+            fh.seek(offset)
+            assert json.loads(fh.readline())["source"] == "in/b.txt"
+
+    def test_replaces_earlier_corpus_unless_appending(self, tmp_path):
+        corpus = tmp_path / "corpus.jsonl"
+        for _ in range(2):
+            with JSONLSink(corpus, max_bytes=150) as sink:
+                for i in range(4):
+                    sink.write(Path(f"{i}.md"), "x" * 100, source=str(i))
+        shards = sorted(tmp_path.glob("corpus-*.jsonl"))
+        assert sum(len(s.read_text().splitlines()) for s in shards) == 4
+
+    def test_failed_run_keeps_earlier_corpus(self, tmp_path):
+        corpus = tmp_path / "corpus.jsonl"
+        with JSONLSink(corpus) as sink:
+            sink.write(Path("a.md"), "old", source="a")
+        before = corpus.read_bytes()
+        with pytest.raises(RuntimeError):
+            with JSONLSink(corpus) as sink:
+                sink.write(Path("a.md"), "new", source="a")
+                assert corpus.read_bytes() == before
+                raise RuntimeError("boom")
+        assert corpus.read_bytes() == before
+        assert [p.name for p in tmp_path.iterdir()] == ["corpus.jsonl"]
+
+    def test_size_based_rotation(self, tmp_path):
+        corpus = tmp_path / "corpus.jsonl"
+        with JSONLSink(corpus, max_bytes=300) as sink:
+            for i in range(6):
+                sink.write(Path(f"{i}.md"), "x" * 100, source=str(i), parser="text")
+
+        shards = sorted(tmp_path.glob("corpus-*.jsonl"))
+        assert len(shards) > 1
+        assert not corpus.exists()
+        total = sum(len(s.read_text().splitlines()) for s in shards)
+        assert total == 6
+
+
+class TestParquetSink:
+    def test_writes_rows(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        out = tmp_path / "corpus.parquet"
+        with ParquetSink(out, row_group_size=2) as sink:
+            for i in range(3):
+                sink.write(Path(f"{i}.md"), f"# Doc {i}\n", source=str(i),
+                           parser="text", metadata={"Title": f"Doc {i}"})
+
+        table = pq.read_table(out)
+        assert table.column("title").to_pylist() == ["Doc 0", "Doc 1", "Doc 2"]
+        assert table.num_rows == 3
+
+
+class TestBatchConvertJSONL:
+    def test_batch_convert_to_jsonl(self, tmp_path):
+        src = tmp_path / "input"
+        src.mkdir()
+        (src / "a.txt").write_text("File A", encoding="utf-8")
+        (src / "b.py").write_text("x = 1\n", encoding="utf-8")
+
+        UniversalMarkdownConverter().batch_convert(
+            src, tmp_path / "corpus", output_format="jsonl"
+        )
+
+        lines = (tmp_path / "corpus.jsonl").read_text(encoding="utf-8").splitlines()
+        records = {json.loads(line)["parser"]: json.loads(line) for line in lines}
+        assert set(records) == {"text", "code"}
+        assert records["code"]["metadata"]["Language"] == "Python"
+        assert "File A" in records["text"]["markdown"]
+
+    def test_rerun_replaces_corpus(self, tmp_path):
+        src = tmp_path / "input"
+        src.mkdir()
+        (src / "a.txt").write_text("File A", encoding="utf-8")
+        conv = UniversalMarkdownConverter()
+        for _ in range(2):
+            conv.batch_convert(src, tmp_path / "corpus", output_format="jsonl")
+        assert len((tmp_path / "corpus.jsonl").read_text().splitlines()) == 1
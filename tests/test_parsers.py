@@ -1,6 +1,7 @@
 """Unit tests for all parsers and the main converter."""
 
 import csv
+import io
 import json
 import textwrap
 from pathlib import Path
@@ -9,7 +10,8 @@ import pytest
 
 from src.converter import UniversalMarkdownConverter
 from src.parsers.csv_parser import CSVParser
-from src.parsers.json_parser import JSONParser
+from src.parsers.docx_parser import DOCXParser
+from src.parsers.json_parser import JSONParser, _ArrayStream
 from src.parsers.code_parser import CodeParser
 from src.parsers.text_parser import TextParser
 from src.parsers.html_parser import HTMLParser
@@ -62,6 +64,17 @@ class TestFileDetector:
         assert FileDetector.language_hint(Path("app.ts")) == "typescript"
         assert FileDetector.language_hint(Path("unknown.xyz")) == ""
 
+    def test_sniff_needs_utf8(self):
+        from src.utils.file_detector import _SNIFF_BYTES
+
+        assert FileDetector.sniff(io.BytesIO("Grüße".encode("utf-8"))) == "text"
+        assert FileDetector.sniff(io.BytesIO("Grüße".encode("latin-1"))) is None
+        # A character split by the end of the sample is not an error...
+        cut = ("x" * (_SNIFF_BYTES - 1) + "é").encode("utf-8")
+        assert FileDetector.sniff(io.BytesIO(cut)) == "text"
+        # ...but one cut off at the end of the data is.
+        assert FileDetector.sniff(io.BytesIO("é".encode("utf-8")[:1])) is None
+
     def test_supported_extensions_is_sorted(self):
         exts = FileDetector.supported_extensions()
         assert exts == sorted(exts)
@@ -86,6 +99,37 @@ class TestMarkdownFormatter:
     def test_make_table_empty_headers(self):
         assert MarkdownFormatter.make_table([], []) == ""
 
+    def test_make_table_pads_trims_and_escapes(self):
+        table = MarkdownFormatter.make_table(
+            ["a", "b|c", "d"],
+            [["1"], [], [" x| ", None, 3, "extra"]],
+        )
+        assert table.splitlines() == [
+            "| a | b\\|c | d |",
+            "| --- | --- | --- |",
+            "| 1 |  |  |",
+            "|  |  |  |",
+            "| x\\| |  | 3 |",
+        ]
+
+    def test_make_table_no_rows(self):
+        assert MarkdownFormatter.make_table(["a"], []) == "| a |\n| --- |"
+
+    def test_pdf_table_to_markdown_uses_shared_renderer(self):
+        from src.parsers.pdf_parser import table_to_markdown
+
+        md = table_to_markdown([["A", None], ["1|2", "x", "extra"], [None]])
+        assert md == "\n| A |  |\n| --- | --- |\n| 1\\|2 | x |\n|  |  |\n\n"
+        assert table_to_markdown([["only header"]]) == ""
+
+    def test_make_table_align(self):
+        table = MarkdownFormatter.make_table(["name", "b"], [["1", "long"]], align=True)
+        assert table.splitlines() == [
+            "| name | b    |",
+            "| ---- | ---- |",
+            "| 1    | long |",
+        ]
+
     def test_wrap_code_block(self):
         block = MarkdownFormatter.wrap_code_block("print('hi')", "python")
         assert block.startswith("```python\n")
@@ -96,6 +140,10 @@ class TestMarkdownFormatter:
         # Should use a longer fence
         assert block.startswith("````")
 
+    def test_code_fence_outlasts_longest_run(self):
+        assert MarkdownFormatter.code_fence("plain") == "```"
+        assert MarkdownFormatter.code_fence("a ``` b ````` c `` d") == "``````"
+
     def test_heading(self):
         assert MarkdownFormatter.heading("Title", 1) == "# Title"
         assert MarkdownFormatter.heading("Sub", 3) == "### Sub"
@@ -126,6 +174,63 @@ class TestCSVParser:
         assert "| Name | Age |" in md
         assert "| Alice | 30 |" in md
 
+    def test_parse_ragged_csv_with_pipes(self, tmp_file):
+        path = tmp_file("ragged.csv", "a,b,c\n1,x|y\n2,3,4,5\n")
+        md = CSVParser().parse(path)
+        assert "| 1 | x\\|y |  |" in md
+        assert "| 2 | 3 | 4 |" in md
+
+    def test_parse_truncated_csv(self, tmp_file, monkeypatch):
+        monkeypatch.setattr(CSVParser, "MAX_ROWS", 3)
+        path = tmp_file("big.csv", "n\n" + "\n".join(str(i) for i in range(10)) + "\n")
+        md = CSVParser().parse(path)
+        assert "| 2 |" in md and "| 3 |" not in md
+        assert "showing 3 of 10 rows" in md
+
+    def test_summary_mode(self, tmp_file):
+        rows = "\n".join(f"{i},{i * 0.5},{'x' if i % 2 else ''}" for i in range(100))
+        path = tmp_file("nums.csv", "id,half,tag\n" + rows + "\n")
+        md = CSVParser(mode="summary").parse(path)
+        assert "## Schema" in md and "## Sample rows" in md
+        assert "| id | integer | 0 | 0 | 99 | 49.5 |  |" in md
+        assert "| half | float | 0 | 0 | 49.5 | 24.75 |  |" in md
+        assert "| tag | text | 50 |  |  |  | x (50) |" in md
+        assert "20 rows sampled uniformly from 100" in md
+
+    def test_auto_mode_switches_on_size(self, tmp_file, monkeypatch):
+        monkeypatch.setattr(CSVParser, "MAX_ROWS", 5)
+        small = tmp_file("small.csv", "n\n1\n2\n")
+        big = tmp_file("big.csv", "n\n" + "\n".join(map(str, range(50))) + "\n")
+        assert "## Schema" not in CSVParser(mode="auto").parse(small)
+        md = CSVParser(mode="auto").parse(big)
+        assert "*Rows: 50 · Columns: 1*" in md
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError, match="Unknown CSV mode"):
+            CSVParser(mode="fancy")
+
+    def test_chunks_mode_repeats_header(self, tmp_file):
+        path = tmp_file("rows.csv", "k,v\n" + "\n".join(f"{i},{i * i}" for i in range(7)) + "\n")
+        md = CSVParser(mode="chunks", chunk_rows=3).parse(path)
+        assert md.count("| k | v |") == 3
+        assert "## Rows 1–3" in md and "## Rows 7–7" in md
+        assert "| 6 | 36 |" in md
+
+    def test_iter_chunks_row_ranges(self, tmp_file):
+        path = tmp_file("rows.csv", "n\n" + "\n".join(map(str, range(6))) + "\n")
+        chunks = list(CSVParser(chunk_rows=3).iter_chunks(path))
+        assert [(c["first_row"], c["last_row"]) for c in chunks] == [(1, 3), (4, 6)]
+
+    def test_iter_chunks_header_only(self, tmp_file):
+        path = tmp_file("head.csv", "a,b\n")
+        chunks = list(CSVParser(chunk_rows=3).iter_chunks(path))
+        assert len(chunks) == 1
+        assert "| a | b |" in chunks[0]["markdown"]
+
+    def test_invalid_chunk_rows(self):
+        with pytest.raises(ValueError, match="chunk_rows"):
+            CSVParser(mode="chunks", chunk_rows=0)
+
     def test_parse_empty_csv(self, tmp_file):
         path = tmp_file("empty.csv", "")
         md = CSVParser().parse(path)
@@ -150,11 +255,97 @@ class TestJSONParser:
         md = JSONParser().parse(path)
         assert "| name | age |" in md
 
+    def test_parse_truncated_table_with_pipes(self, tmp_file, monkeypatch):
+        monkeypatch.setattr(JSONParser, "MAX_TABLE_ROWS", 2)
+        data = [{"k": f"v|{i}", "n": i} for i in range(5)]
+        path = tmp_file("rows.json", json.dumps(data))
+        md = JSONParser().parse(path)
+        assert "| v\\|1 | 1 |" in md
+        assert "v\\|2" not in md
+        assert "showing 2 of 5 rows" in md
+
+    def test_in_memory_table_checks_every_item(self, tmp_file, monkeypatch):
+        monkeypatch.setattr(JSONParser, "MAX_TABLE_ROWS", 2)
+        data = [{"k": i} for i in range(4)] + [{"k": 4, "extra": "kept"}]
+        md = JSONParser().parse(tmp_file("rows.json", json.dumps(data)))
+        assert "```json" in md and '"extra": "kept"' in md
+
     def test_parse_invalid_json(self, tmp_file):
         path = tmp_file("bad.json", "{not json!!")
         md = JSONParser().parse(path)
         assert "Failed to parse" in md
 
+    def test_union_mode_flattens_heterogeneous_records(self, tmp_file):
+        data = [
+            {"id": 1, "user": {"name": "a", "geo": {"cc": "DE"}}},
+            {"id": 2, "tags": ["x", "y"]},
+            {"id": 3, "user": {"name": "c"}, "ok": True},
+        ]
+        path = tmp_file("events.json", json.dumps(data))
+        md = JSONParser(mode="union", max_depth=1).parse(path)
+        assert "| id | user.name | user.geo | tags | ok |" in md
+        assert '| 1 | a | {"cc":"DE"} |  |  |' in md
+        assert '| 2 |  |  | ["x","y"] |  |' in md
+        assert "| 3 | c |  |  | true |" in md
+        assert "```json" not in md
+
+    def test_union_mode_drops_sparse_keys(self, tmp_file):
+        lines = [json.dumps({"n": i, **({"rare": 1} if i == 0 else {})}) for i in range(10)]
+        path = tmp_file("log.jsonl", "\n".join(lines))
+        md = JSONParser(mode="union", min_key_frequency=0.2).parse(path)
+        assert "| n |" in md and "| n | rare |" not in md
+        assert "Sparse keys omitted (in fewer than 20% of rows): rare" in md
+
+    def test_jsonl_of_objects(self, tmp_file):
+        path = tmp_file("log.jsonl", '{"a": 1}\n{"a": 2}\n')
+        assert "| a |" in JSONParser().parse(path)
+
+    def test_unknown_json_mode(self):
+        with pytest.raises(ValueError, match="Unknown JSON mode"):
+            JSONParser(mode="loose")
+
+    def test_streamed_array_matches_in_memory(self, tmp_file, monkeypatch):
+        monkeypatch.setattr(JSONParser, "MAX_TABLE_ROWS", 3)
+        data = [{"k": f"v{i}", "n": i * 1.5e10} for i in range(10)]
+        path = tmp_file("rows.json", json.dumps(data, indent=1))
+        expected = JSONParser().parse(path)
+        monkeypatch.setattr(JSONParser, "STREAM_THRESHOLD", 0)
+        assert JSONParser().parse(path) == expected
+        assert "showing 3 of 10 rows" in expected
+
+    def test_streamed_array_small_chunks(self):
+        data = [1, -2.5e3, "a,]\\\"", {"x": [1, {"y": None}]}, [], True]
+        stream = _ArrayStream(io.StringIO(json.dumps(data)), chunk_size=3)
+        assert next(stream.items()) == 1
+        assert list(stream.items()) == data[1:]
+        assert stream.count_remaining() == 0
+
+    def test_streamed_heterogeneous_array(self, tmp_file, monkeypatch):
+        monkeypatch.setattr(JSONParser, "STREAM_THRESHOLD", 0)
+        monkeypatch.setattr(JSONParser, "MAX_TABLE_ROWS", 2)
+        path = tmp_file("mixed.json", json.dumps([{"a": 1}, {"b": 2}, 3, 4]))
+        md = JSONParser().parse(path)
+        assert "```json" in md and '"b": 2' in md and "4" not in md.split("```")[1]
+        assert "showing 2 of 4 items" in md
+
+    def test_streamed_array_followed_by_more_data(self, tmp_file, monkeypatch):
+        lines = "\n".join(json.dumps([i, i + 1]) for i in range(5)) + "\n"
+        path = tmp_file("arrays.jsonl", lines)
+        expected = JSONParser().parse(path)
+        monkeypatch.setattr(JSONParser, "STREAM_THRESHOLD", 0)
+        assert JSONParser().parse(path) == expected
+        assert "[\n    4,\n    5\n  ]" in expected
+
+    @pytest.mark.parametrize("text", ["[,1]", "[1,,2]", "[1,]", "[1 2]"])
+    def test_streamed_array_rejects_stray_commas(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            list(_ArrayStream(io.StringIO(text)).items())
+
+    def test_streamed_truncated_array(self, tmp_file, monkeypatch):
+        monkeypatch.setattr(JSONParser, "STREAM_THRESHOLD", 0)
+        path = tmp_file("cut.json", '[{"a": 1}, {"a": 2')
+        assert "Failed to parse" in JSONParser().parse(path)
+
 
 # ======================================================================
 # Code Parser
@@ -168,6 +359,40 @@ class TestCodeParser:
         assert "```python" in md
         assert "def hello():" in md
 
+    def test_symbols_python(self, tmp_file):
+        code = (
+            'import os\n\n\n# helper\n@cache\ndef f():\n    return "```"\n\n\n'
+            "class C:\n    x = 1\n\n    def m(self):\n        pass\n\n"
+            "    async def n(self):\n        pass\n\n\nmain()\n"
+        )
+        md = CodeParser(mode="symbols", max_lines=5).parse(tmp_file("mod.py", code))
+        headings = [line for line in md.splitlines() if line.startswith("## ")]
+        assert headings == [
+            "## <module> (line 1)",
+            "## f (lines 4–7)",
+            "## C (lines 10–11)",
+            "## C.m (lines 13–14)",
+            "## C.n (lines 16–17)",
+            "## <module> (line 20)",
+        ]
+        # One fence for the whole file, long enough for the backticks in f.
+        assert md.count("````python") == 6
+
+    def test_symbols_regex_scan(self, tmp_file):
+        code = (
+            "#include <stdio.h>\n\n/* entry */\nstatic int helper(int x)\n{\n    return x;\n}\n\n"
+            "int main(void) {\n    return helper(1);\n}\n"
+        )
+        md = CodeParser(mode="symbols").parse(tmp_file("main.c", code))
+        assert "## helper (lines 3–7)\n\n```c\n/* entry */" in md
+        assert "## main (lines 9–11)" in md
+
+    def test_auto_keeps_small_files_whole(self, tmp_file):
+        code = "def a():\n    pass\n\ndef b():\n    pass\n"
+        assert "## " not in CodeParser().parse(tmp_file("small.py", code))
+        with pytest.raises(ValueError, match="Unknown code mode"):
+            CodeParser(mode="ast")
+
     def test_metadata_includes_language(self, tmp_file):
         path = tmp_file("app.ts", "const x = 1;")
         parser = CodeParser()
@@ -224,6 +449,281 @@ class TestHTMLParser:
         assert isinstance(md, str)
 
 
+# ======================================================================
+# DOCX Parser
+# ======================================================================
+
+@pytest.fixture
+def sample_docx(tmp_path):
+    docx = pytest.importorskip("docx")
+    doc = docx.Document()
+    doc.add_heading("Contract", level=0)
+    doc.add_heading("Scope", level=1)
+    doc.add_paragraph("First | paragraph\twith a tab.")
+    doc.add_paragraph("")
+    run = doc.add_paragraph("Line one").add_run()
+    run.add_break()
+    run.add_text("line two")
+    doc.add_paragraph("Alpha", style="List Bullet")
+    doc.add_paragraph("Beta", style="List Bullet 2")
+    doc.add_paragraph("Step", style="List Number")
+    doc.add_heading("Terms", level=3)
+
+    table = doc.add_table(rows=3, cols=3)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"r{r}c{c}"
+    table.cell(0, 0).merge(table.cell(0, 1))  # horizontal span
+    table.cell(1, 2).merge(table.cell(2, 2))  # vertical span
+    table.cell(2, 0).add_paragraph("second para")
+
+    doc.add_paragraph("Closing words.")
+    path = tmp_path / "sample.docx"
+    doc.save(str(path))
+    return path
+
+
+@pytest.fixture
+def rich_docx(tmp_path):
+    """A document with explicit multi-level numbering, a link and an image."""
+    docx = pytest.importorskip("docx")
+    from docx.opc.constants import RELATIONSHIP_TYPE
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls
+
+    doc = docx.Document()
+    numbering = doc.part.numbering_part.element
+    numbering.insert(0, parse_xml(
+        f'<w:abstractNum {nsdecls("w")} w:abstractNumId="90">'
+        '<w:lvl w:ilvl="0"><w:numFmt w:val="decimal"/></w:lvl>'
+        '<w:lvl w:ilvl="1"><w:numFmt w:val="bullet"/></w:lvl>'
+        '<w:lvl w:ilvl="2"><w:numFmt w:val="lowerLetter"/></w:lvl>'
+        '</w:abstractNum>'
+    ))
+    numbering.append(parse_xml(
+        f'<w:num {nsdecls("w")} w:numId="90"><w:abstractNumId w:val="90"/></w:num>'
+    ))
+
+    def item(text, ilvl):
+        para = doc.add_paragraph(text)
+        para._p.get_or_add_pPr().append(parse_xml(
+            f'<w:numPr {nsdecls("w")}><w:ilvl w:val="{ilvl}"/>'
+            '<w:numId w:val="90"/></w:numPr>'
+        ))
+
+    item("One", 0)
+    item("Dot", 1)
+    item("Deep", 2)
+    item("Deeper", 2)
+    item("Two", 0)
+    item("Deep again", 2)
+
+    para = doc.add_paragraph("See ")
+    r_id = doc.part.relate_to(
+        "https://example.com", RELATIONSHIP_TYPE.HYPERLINK, is_external=True
+    )
+    para._p.append(parse_xml(
+        f'<w:hyperlink {nsdecls("w", "r")} r:id="{r_id}">'
+        '<w:r><w:rPr><w:b/></w:rPr><w:t>the site</w:t></w:r></w:hyperlink>'
+    ))
+    para.add_run(" now.")
+
+    from PIL import Image
+    img = tmp_path / "pixel.png"
+    Image.new("RGB", (4, 4)).save(img)
+    doc.add_picture(str(img))
+    doc.inline_shapes[0]._inline.docPr.set("descr", "Org chart")
+
+    path = tmp_path / "rich.docx"
+    doc.save(str(path))
+    return path
+
+
+class TestDOCXParser:
+    @pytest.mark.parametrize("rich", [True, False])
+    def test_xml_engine_matches_python_docx(self, sample_docx, rich_docx, rich):
+        for path in (sample_docx, rich_docx):
+            expected = DOCXParser(rich=rich).parse(path)
+            assert DOCXParser(engine="xml", rich=rich).parse(path) == expected
+
+    def test_rich_numbering_links_and_images(self, rich_docx):
+        md = DOCXParser(engine="xml").parse(rich_docx)
+        assert md.splitlines()[::2] == [
+            "1. One",
+            "    - Dot",
+            "        1. Deep",
+            "        2. Deeper",
+            "2. Two",
+            "        1. Deep again",
+            "See [**the site**](https://example.com) now.",
+            "[Image: Org chart]",
+        ]
+
+    def test_plain_mode_flattens_lists(self, sample_docx):
+        md = DOCXParser(rich=False).parse(sample_docx)
+        assert "\n- Beta" in md
+
+    def test_structure(self, sample_docx):
+        md = DOCXParser(engine="xml").parse(sample_docx)
+        assert md.startswith("# Contract\n\n# Scope")
+        assert "- Alpha" in md and "- Beta" in md and "1. Step" in md
+        assert "### Terms" in md
+        assert "| r0c0\nr0c1 | r0c0\nr0c1 | r0c2 |" in md  # horizontal span repeats
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError, match="Unknown DOCX engine"):
+            DOCXParser(engine="fast")
+
+    def test_converter_parser_options(self, sample_docx):
+        conv = UniversalMarkdownConverter({"docx": {"engine": "xml"}})
+        assert conv.parsers["docx"].engine == "xml"
+        assert "# Scope" in conv.convert(sample_docx)
+        with pytest.raises(ValueError, match="Unknown parser key"):
+            UniversalMarkdownConverter({"doc": {}})
+
+
+# ======================================================================
+# PDFParser
+# ======================================================================
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """Two pages: prose only, then a ruled 3x3 table between two lines."""
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Plain first page")
+    page = doc.new_page()
+    page.insert_text((72, 72), "Quarterly figures")
+    for i in range(4):
+        page.draw_line((72, 100 + i * 20), (372, 100 + i * 20))
+        page.draw_line((72 + i * 100, 100), (72 + i * 100, 160))
+    for r, row in enumerate((["Region", "Q1", "Q2"], ["North", "10", "12"], ["South", "7", "9"])):
+        for c, cell in enumerate(row):
+            page.insert_text((76 + c * 100, 114 + r * 20), cell)
+    page.insert_text((72, 200), "Source: internal")
+    path = tmp_path / "report.pdf"
+    doc.save(path)
+    return path
+
+
+class TestPDFParser:
+    def test_engines_agree(self, sample_pdf):
+        from src.parsers.pdf_parser import PDFParser
+
+        plumber = PDFParser().parse(sample_pdf)
+        mupdf = PDFParser(engine="pymupdf").parse(sample_pdf)
+        assert "| Region | Q1 | Q2 |" in mupdf and "| South | 7 | 9 |" in mupdf
+        assert "Plain first page" in mupdf
+        assert mupdf == plumber
+
+    @pytest.mark.parametrize("engine", ["pdfplumber", "pymupdf"])
+    def test_table_text_not_duplicated(self, sample_pdf, engine):
+        from src.parsers.pdf_parser import PDFParser
+
+        page = PDFParser(engine=engine).parse(sample_pdf).split("## Page 2")[1]
+        assert "North" in page and "North 10" not in page
+        # The table sits between the text above and below it.
+        assert page.index("Quarterly") < page.index("| Region") < page.index("Source: internal")
+
+    def test_outline_headings(self, sample_pdf, tmp_path):
+        fitz = pytest.importorskip("fitz")
+        from src.parsers.pdf_parser import PDFParser
+
+        doc = fitz.open(sample_pdf)
+        doc.set_toc([[1, "Overview", 1, 0], [1, "Figures", 2, 50], [2, "By region", 2, 95]])
+        path = tmp_path / "outlined.pdf"
+        doc.save(path)
+
+        plumber = PDFParser().parse(path)
+        mupdf = PDFParser(engine="pymupdf").parse(path)
+        assert "## Page" not in mupdf
+        order = ["## Overview", "Plain first page", "## Figures", "Quarterly",
+                 "### By region", "| Region", "Source: internal"]
+        assert [mupdf.index(s) for s in order] == sorted(mupdf.index(s) for s in order)
+        assert mupdf == plumber
+
+        pages = PDFParser(headings="pages").parse(path)
+        assert "## Page 2" in pages and "## Figures" not in pages
+
+    def test_pages_metadata(self, sample_pdf):
+        record = UniversalMarkdownConverter().convert_record(sample_pdf)
+        assert record["metadata"]["Pages"] == "2"
+        assert "*Pages: 2*" in record["markdown"]
+
+    def test_pages_metadata_comes_from_the_parse(self, sample_pdf):
+        from src.parsers.pdf_parser import PDFParser
+
+        parser = PDFParser()
+        _, _, extra = parser.parse_with_metadata(sample_pdf)
+        assert extra == {"Pages": 2}
+        # No page count is left behind for a later, unrelated call.
+        assert "Pages" not in parser.metadata_fields("", sample_pdf)
+
+    def test_strip_boilerplate(self):
+        from src.parsers.pdf_parser import strip_boilerplate
+
+        body = ["Revenue 2021: 12", "Revenue 2022: 17", "Revenue 2023: 9", "Revenue 2024: 30"]
+        pages = [
+            [f"ACME  Corp\n{line}\nnote {line[-2:]}\nPage {n} of 4\n"]
+            for n, line in enumerate(body, 1)
+        ]
+        pages[2] = [pages[2][0], [["h"], ["v"]]]  # footer below a table is kept
+        lines, removed = strip_boilerplate(pages, k=2)
+        assert pages[0] == ["Revenue 2021: 12\nnote 12\n"]
+        assert pages[2][0] == "Revenue 2023: 9\nnote  9\nPage 3 of 4\n"
+        assert lines == 7 and removed == 4 * len("ACME  Corp\n") + 3 * len("Page 1 of 4\n")
+
+    def test_short_documents_untouched(self):
+        from src.parsers.pdf_parser import strip_boilerplate
+
+        pages = [["Header\nbody"], ["Header\nother"]]
+        assert strip_boilerplate(pages) == (0, 0)
+
+    @pytest.mark.parametrize("engine", ["pdfplumber", "pymupdf"])
+    def test_running_headers_removed(self, tmp_path, engine):
+        fitz = pytest.importorskip("fitz")
+        from src.parsers.pdf_parser import PDFParser
+
+        doc = fitz.open()
+        for n in range(1, 6):
+            page = doc.new_page()
+            page.insert_text((72, 40), "ACME Corp - Confidential")
+            page.insert_text((72, 200), f"Findings for region {n * 7 % 5}")
+            page.insert_text((280, 800), f"Page {n} of 5")
+        path = tmp_path / "annual.pdf"
+        doc.save(path)
+
+        md, stats = PDFParser(engine=engine).parse_with_stats(path)
+        assert "Confidential" not in md and "of 5" not in md
+        assert md.count("Findings for region") == 5
+        assert stats["boilerplate_lines"] == 10 and stats["boilerplate_bytes"] > 0
+
+        kept = PDFParser(engine=engine, boilerplate=False).parse(path)
+        assert kept.count("Confidential") == 5
+
+    def test_stats_in_record(self, sample_pdf, tmp_path):
+        conv = UniversalMarkdownConverter()
+        assert conv.convert_record(sample_pdf)["stats"] == {
+            "boilerplate_lines": 0, "boilerplate_bytes": 0,
+        }
+        text = tmp_path / "a.txt"
+        text.write_text("hi", encoding="utf-8")
+        assert conv.convert_record(text)["stats"] == {}
+
+    def test_unknown_engine(self):
+        from src.parsers.pdf_parser import PDFParser
+
+        with pytest.raises(ValueError, match="Unknown PDF engine"):
+            PDFParser(engine="poppler")
+        with pytest.raises(ValueError, match="Unknown PDF headings mode"):
+            PDFParser(headings="toc")
+
+    def test_converter_parser_options(self, sample_pdf, capsys):
+        conv = UniversalMarkdownConverter({"pdf": {"engine": "pymupdf"}})
+        assert "| North | 10 | 12 |" in conv.convert(sample_pdf)
+        assert capsys.readouterr().out == ""
+
+
 # ======================================================================
 # Converter integration
 # ======================================================================
@@ -271,6 +771,87 @@ class TestUniversalMarkdownConverter:
         assert (out / "a.md").exists()
         assert (out / "b.md").exists()
 
+    def test_convert_chunks_csv(self, tmp_file):
+        path = tmp_file("rows.csv", "a,b\n" + "\n".join(f"{i},x" for i in range(5)) + "\n")
+        conv = UniversalMarkdownConverter({"csv": {"chunk_rows": 2}})
+        records = list(conv.convert_chunks(path))
+        assert [r["metadata"]["Rows"] for r in records] == ["1–2", "3–4", "5–5"]
+        for r in records:
+            assert r["parser"] == "csv"
+            assert "*Source: rows.csv*" in r["markdown"]
+            assert "| a | b |" in r["markdown"]
+
+    def test_convert_chunks_header_only_csv(self, converter, tmp_file):
+        path = tmp_file("head.csv", "a,b\n")
+        (record,) = converter.convert_chunks(path)
+        assert record["metadata"]["Rows"] == "none"
+        assert "*Rows: none*" in record["markdown"] and "1–0" not in record["markdown"]
+        assert "| a | b |" in record["markdown"]
+
+    def test_convert_chunks_single_record(self, converter, tmp_file):
+        path = tmp_file("hello.txt", "Hello")
+        records = list(converter.convert_chunks(path))
+        assert len(records) == 1 and "Hello" in records[0]["markdown"]
+
+    @pytest.mark.parametrize(
+        "name, content",
+        [
+            ("data.csv", "a,b\r\n1,x|y\r\n"),
+            ("rows.json", '[{"k": 1}, {"k": 2}]'),
+            ("page.html", "<h1>Title</h1><p>Body</p>"),
+            ("notes.txt", "caf\u00e9 au lait\n"),
+            ("app.py", "print('hi')\n"),
+            ("readme.md", "# Readme\n\nText\n"),
+        ],
+    )
+    def test_convert_bytes_matches_path(self, converter, tmp_file, name, content):
+        path = tmp_file(name, content)
+        data = path.read_bytes()
+        from_path = converter.convert_record(path)
+        from_bytes = converter.convert_record(name, stream=io.BytesIO(data))
+        body = from_bytes["markdown"].split("\n---\n", 1)[1]
+        assert body == from_path["markdown"].split("\n---\n", 1)[1]
+        assert from_bytes["parser"] == from_path["parser"]
+        assert from_bytes["metadata"]["Source"] == name
+        assert body in converter.convert_bytes(memoryview(data), name)
+
+    def test_convert_bytes_docx(self, converter, sample_docx):
+        with sample_docx.open("rb") as fh:
+            md = converter.convert_stream(fh, "contract.docx")
+        assert "*Source: contract.docx*" in md
+        body = md.split("\n---\n", 1)[1]
+        assert body == converter.convert(sample_docx).split("\n---\n", 1)[1]
+
+    def test_convert_bytes_pdf_sniffed(self, converter):
+        fitz = pytest.importorskip("fitz")
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), "Hello from memory")
+        data = doc.tobytes()
+        record = converter.convert_record(None, stream=data)
+        assert record["parser"] == "pdf"
+        assert record["metadata"]["Source"] == "document.pdf"
+        assert "Hello from memory" in record["markdown"]
+
+    def test_convert_stream_non_seekable(self, converter):
+        class Pipe(io.RawIOBase):
+            def __init__(self, data):
+                self._src = io.BytesIO(data)
+
+            def readable(self):
+                return True
+
+            def readinto(self, buf):
+                chunk = self._src.read(len(buf))
+                buf[: len(chunk)] = chunk
+                return len(chunk)
+
+        md = converter.convert_stream(io.BufferedReader(Pipe(b'{"a": [1, 2]}')))
+        assert "```json" in md and "*Source: document.json*" in md
+
+    def test_convert_bytes_unknown_binary(self, converter):
+        with pytest.raises(ValueError, match="Unsupported"):
+            converter.convert_bytes(b"\x00\x01\x02")
+
     def test_supported_formats(self, converter):
         fmts = converter.supported_formats()
         assert ".pdf" in fmts
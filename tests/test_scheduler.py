@@ -0,0 +1,82 @@
+"""Tests for cost-based batch scheduling."""
+
+import json
+import os
+
+import fitz
+import pytest
+
+from src.converter import UniversalMarkdownConverter
+from src.executor import ConversionExecutor
+from src.scheduler import Scheduler, estimate_cost, pdf_page_count
+
+
+def _pdf(path, pages, **save_options):
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page()
+    doc.save(path, **save_options)
+    doc.close()
+    return path
+
+
+class TestEstimates:
+    def test_pdf_page_count(self, tmp_path):
+        assert pdf_page_count(_pdf(tmp_path / "a.pdf", 7)) == 7
+
+    def test_compressed_page_tree_falls_back_to_size(self, tmp_path):
+        path = _pdf(tmp_path / "a.pdf", 3, garbage=4, deflate=True, use_objstms=1)
+        assert pdf_page_count(path) is None
+        assert estimate_cost(path) == path.stat().st_size
+
+    def test_pages_outweigh_bytes(self, tmp_path):
+        long_pdf = _pdf(tmp_path / "long.pdf", 50)
+        text = tmp_path / "big.txt"
+        text.write_text("x" * 200_000, encoding="utf-8")
+        assert estimate_cost(long_pdf) > estimate_cost(text)
+
+
+class TestScheduler:
+    @pytest.fixture
+    def files(self, tmp_path):
+        paths = []
+        for name, size in (("a.txt", 10), ("b.csv", 5000), ("c/d.txt", 2000)):
+            path = tmp_path / name
+            path.parent.mkdir(exist_ok=True)
+            path.write_text("x" * size, encoding="utf-8")
+            paths.append(path)
+        return paths
+
+    def test_largest_first(self, files):
+        assert [p.name for p in Scheduler().order(files)] == ["b.csv", "d.txt", "a.txt"]
+
+    def test_newest_first(self, files):
+        for age, path in enumerate(files):
+            os.utime(path, (1_000_000 - age, 1_000_000 - age))
+        assert Scheduler("newest-first").order(files) == files
+
+    def test_priority_globs(self, files, tmp_path):
+        order = Scheduler("sorted", priority=["c/*", "*.txt"]).order(files, tmp_path)
+        assert [p.name for p in order] == ["d.txt", "a.txt", "b.csv"]
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError, match="Unknown schedule policy"):
+            Scheduler("smallest-first")
+
+
+def test_unordered_executor_and_scheduled_batch(tmp_path):
+    src = tmp_path / "in"
+    src.mkdir()
+    for i in range(5):
+        (src / f"f{i}.txt").write_text("y" * (i + 1) * 100, encoding="utf-8")
+
+    paths = sorted(src.iterdir())
+    results = list(ConversionExecutor(workers=2).map_records(paths, ordered=False))
+    assert sorted(p for p, _ in results) == paths
+
+    out = tmp_path / "out.jsonl"
+    UniversalMarkdownConverter().batch_convert(
+        src, out, output_format="jsonl", schedule=Scheduler("largest-first")
+    )
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["path"] for r in records] == [f"f{i}.md" for i in range(4, -1, -1)]
@@ -0,0 +1,186 @@
+"""Tests for the conversion service."""
+
+import http.client
+import json
+import os
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.server import ConversionService, ServiceBusy, WorkerPool, make_server
+
+
+@pytest.fixture
+def service():
+    pool = WorkerPool(workers=2, queue_size=4)
+    yield ConversionService(pool, timeout=30)
+    pool.shutdown()
+
+
+@pytest.fixture
+def base_url(service):
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://%s:%d" % server.server_address[:2]
+    server.shutdown()
+    server.server_close()
+
+
+def _post(url, data=b""):
+    req = urllib.request.Request(url, data=data, method="POST")
+    with urllib.request.urlopen(req) as resp:
+        return resp.status, resp.headers.get("Content-Type"), resp.read()
+
+
+def _pid(converter):
+    return os.getpid()
+
+
+class TestWorkerPool:
+    def test_rejects_when_queue_full(self):
+        pool = WorkerPool(workers=1, queue_size=1)
+        gate = threading.Event()
+        started = threading.Event()
+
+        def blocker(converter):
+            started.set()
+            gate.wait()
+
+        try:
+            pool.submit(blocker)
+            started.wait(5)
+            pool.submit(lambda c: None)  # fills the queue
+            with pytest.raises(ServiceBusy):
+                pool.submit(lambda c: None)
+        finally:
+            gate.set()
+            pool.shutdown()
+
+    def test_job_exception_is_returned(self):
+        pool = WorkerPool(workers=1, queue_size=1)
+        try:
+            future = pool.submit(lambda c: c.convert_record("/nonexistent.txt"))
+            with pytest.raises(FileNotFoundError):
+                future.result(5)
+        finally:
+            pool.shutdown()
+
+
+    def test_routes_heavy_keys_to_processes(self):
+        pool = WorkerPool(workers=1, queue_size=2)
+        try:
+            assert pool.submit_conversion("text", _pid).result(30) == os.getpid()
+            assert pool.submit_conversion("pdf", _pid).result(30) != os.getpid()
+            assert pool.submit_conversion(None, _pid).result(30) != os.getpid()
+        finally:
+            pool.shutdown()
+
+
+class TestHTTPService:
+    def test_health_and_metrics(self, base_url):
+        with urllib.request.urlopen(base_url + "/health") as resp:
+            health = json.loads(resp.read())
+        assert health["status"] == "ok" and health["workers"] == 2
+
+        with urllib.request.urlopen(base_url + "/metrics") as resp:
+            text = resp.read().decode()
+        assert "ragmd_queue_capacity 4" in text
+        assert 'ragmd_http_responses_total{code="200"} 1' in text
+
+    def test_convert_path(self, base_url, tmp_path):
+        src = tmp_path / "notes.txt"
+        src.write_text("Hello service", encoding="utf-8")
+        status, ctype, body = _post(f"{base_url}/convert?path={src}")
+        record = json.loads(body)
+        assert status == 200 and ctype == "application/json"
+        assert record["parser"] == "text"
+        assert "Hello service" in record["markdown"]
+
+    def test_convert_upload_as_markdown(self, base_url):
+        status, ctype, body = _post(
+            f"{base_url}/convert?filename=data.csv&format=markdown", b"a,b\n1,2\n"
+        )
+        assert ctype.startswith("text/markdown")
+        md = body.decode()
+        assert "*Source: data.csv*" in md and "| a | b |" in md
+
+    def test_convert_upload_chunks(self, base_url):
+        rows = "\n".join(f"{i},x" for i in range(250))
+        _, _, body = _post(f"{base_url}/convert?filename=big.csv&chunks=1", b"n,v\n" + rows.encode())
+        chunks = json.loads(body)["chunks"]
+        assert [c["metadata"]["Rows"] for c in chunks] == ["1–100", "101–200", "201–250"]
+        assert all(c["source"] == "big.csv" for c in chunks)
+
+    def test_convert_upload_sniffed(self, base_url):
+        _, _, body = _post(f"{base_url}/convert", b"<!DOCTYPE html><h1>Hi</h1>")
+        record = json.loads(body)
+        assert record["parser"] == "html" and record["source"] == "document.html"
+
+    def test_concurrent_pdfs(self, base_url, tmp_path):
+        fitz = pytest.importorskip("fitz")
+        words = ("Opening remarks", "Quarterly revenue grew", "Outlook for spring")
+        paths = []
+        for n in range(6):
+            doc = fitz.open()
+            for p in range(n % 3 + 1):
+                doc.new_page().insert_text((72, 72), f"{words[p]} in report {n}")
+            paths.append(tmp_path / f"doc{n}.pdf")
+            doc.save(paths[-1])
+        results: dict[int, dict] = {}
+
+        def fetch(n):
+            if n % 2:
+                _, _, body = _post(f"{base_url}/convert?filename=doc{n}.pdf", paths[n].read_bytes())
+            else:
+                _, _, body = _post(f"{base_url}/convert?path={paths[n]}")
+            results[n] = json.loads(body)
+
+        # Stay within workers + queue_size so nothing is rejected.
+        threads = [threading.Thread(target=fetch, args=(n,)) for n in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+        assert sorted(results) == list(range(6))
+        for n, record in results.items():
+            assert record["parser"] == "pdf"
+            assert record["metadata"]["Pages"] == str(n % 3 + 1)
+            assert f"Opening remarks in report {n}" in record["markdown"]
+
+    @pytest.mark.parametrize(
+        "query, data, code",
+        [
+            ("path=/nonexistent/file.txt", b"", 404),
+            ("filename=x.bin", b"\x00\x01binary", 415),
+            ("", b"", 400),
+        ],
+    )
+    def test_errors(self, base_url, query, data, code):
+        with pytest.raises(urllib.error.HTTPError) as info:
+            _post(f"{base_url}/convert?{query}", data)
+        assert info.value.code == code
+        assert "error" in json.loads(info.value.read())
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_unix_socket(service, tmp_path):
+    path = tmp_path / "ragmd.sock"
+    server = make_server(service, socket_path=path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(path))
+        conn = http.client.HTTPConnection("localhost")
+        conn.sock = sock
+        conn.request("GET", "/health")
+        assert json.loads(conn.getresponse().read())["status"] == "ok"
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not path.exists()
@@ -0,0 +1,137 @@
+"""Tests for the shared SQLite work queue."""
+
+import threading
+import time
+import zipfile
+
+import pytest
+
+from src.cli import main
+from src.converter import UniversalMarkdownConverter
+from src.utils.output_sink import DirectorySink
+from src.work_queue import LeaseKeeper, WorkQueue
+
+
+@pytest.fixture
+def db(tmp_path):
+    return tmp_path / "queue.db"
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    src = tmp_path / "corpus"
+    (src / "sub").mkdir(parents=True)
+    for i in range(6):
+        (src / f"doc{i}.txt").write_text(f"document {i}", encoding="utf-8")
+    (src / "sub" / "t.csv").write_text("a,b\n1,2\n", encoding="utf-8")
+    return src
+
+
+class TestWorkQueue:
+    def test_enqueue_is_idempotent(self, db):
+        queue = WorkQueue(db)
+        assert queue.enqueue(["a.txt", "b.txt"]) == 2
+        assert queue.enqueue(["b.txt", "c.txt"]) == 1
+        assert queue.counts()["pending"] == 3
+
+    def test_claims_are_exclusive(self, db):
+        queue = WorkQueue(db)
+        queue.enqueue(["a", "b", "c"])
+        first = queue.claim("w1", 2)
+        second = WorkQueue(db).claim("w2", 5)
+        assert len(first) == 2 and len(second) == 1
+        assert not set(first) & set(second)
+        assert queue.claim("w3", 5) == []
+
+    def test_expired_lease_is_reclaimed(self, db):
+        queue = WorkQueue(db, lease_seconds=0.05)
+        queue.enqueue(["a"])
+        assert queue.claim("dead") == ["a"]
+        time.sleep(0.1)
+        assert queue.claim("alive") == ["a"]
+        queue.complete("dead", "a", "late.md")  # stale owner is ignored
+        queue.complete("alive", "a", "a.md")
+        assert queue.results() == {"a": "a.md"}
+
+    def test_heartbeat_keeps_lease(self, db):
+        queue = WorkQueue(db, lease_seconds=0.2)
+        queue.enqueue(["a"])
+        queue.claim("w1")
+        with LeaseKeeper(queue, "w1", interval=0.05) as keeper:
+            keeper.hold(["a"])
+            time.sleep(0.4)
+            assert queue.claim("w2") == []
+
+    def test_retry_then_failed(self, db):
+        queue = WorkQueue(db, max_attempts=2)
+        queue.enqueue(["bad"])
+        for _ in range(2):
+            assert queue.claim("w1") == ["bad"]
+            queue.fail("w1", "bad", "boom")
+        assert queue.claim("w1") == []
+        assert queue.counts()["failed"] == 1
+        assert queue.results() == {"bad": "boom"}
+
+    def test_unknown_journal_mode(self, db):
+        with pytest.raises(ValueError, match="Unknown journal mode"):
+            WorkQueue(db, journal_mode="memory")
+
+
+class TestQueuedBatch:
+    def test_two_workers_share_the_work(self, corpus, tmp_path, db):
+        out = tmp_path / "out"
+        results = {}
+
+        def work(name):
+            converter = UniversalMarkdownConverter()
+            with DirectorySink(out) as sink:
+                results[name] = converter.batch_convert(
+                    corpus, out, sink=sink, work_queue=WorkQueue(db, lease_seconds=1), worker_id=name
+                )
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in ("w1", "w2")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        converted = set(results["w1"]) | set(results["w2"])
+        assert len(converted) == 7
+        assert not set(results["w1"]) & set(results["w2"])
+        assert WorkQueue(db).counts()["done"] == 7
+        assert (out / "sub" / "t.md").exists()
+
+    def test_waits_for_and_reclaims_dead_lease(self, corpus, tmp_path, db):
+        queue = WorkQueue(db, lease_seconds=0.2)
+        queue.enqueue(p.relative_to(corpus) for p in sorted(corpus.rglob("*")) if p.is_file())
+        assert queue.claim("crashed", 1) == ["doc0.txt"]
+
+        results = UniversalMarkdownConverter().batch_convert(
+            corpus, tmp_path / "out", work_queue=queue, worker_id="survivor"
+        )
+
+        assert str(corpus / "doc0.txt") in results
+        assert queue.counts() == {"pending": 0, "leased": 0, "done": 7, "failed": 0}
+
+    def test_warns_about_skipped_archives(self, corpus, tmp_path, db, caplog):
+        with zipfile.ZipFile(corpus / "bundle.zip", "w") as zf:
+            zf.writestr("inner.txt", "inside")
+        results = UniversalMarkdownConverter().batch_convert(
+            corpus, tmp_path / "out", work_queue=WorkQueue(db)
+        )
+        assert str(corpus / "bundle.zip") not in results
+        assert "Skipping archive" in caplog.text and "bundle.zip" in caplog.text
+
+        caplog.clear()
+        UniversalMarkdownConverter().batch_convert(
+            corpus, tmp_path / "out2", work_queue=WorkQueue(tmp_path / "q2.db"), archives=False
+        )
+        assert "Skipping archive" not in caplog.text
+
+    def test_cli_queue(self, corpus, tmp_path, db, capsys):
+        rc = main([
+            "batch-convert", str(corpus), "-o", str(tmp_path / "out"),
+            "--queue", str(db), "--queue-journal", "delete",
+        ])
+        assert rc == 0
+        assert "Queue: 7 done, 0 failed, 0 outstanding" in capsys.readouterr().out